@@ -2,29 +2,75 @@ import os
 
 from flask import Flask
 from flask_cors import CORS
-from flask_mysqldb import MySQL
 
-mysql = MySQL()
+from app.utils.database import PooledMySQL, get_pool, init_pool, init_request_session
+
+mysql = PooledMySQL()
 
 from app.config import config_by_name
+from app.routes.audit_routes import audit_bp
 from app.routes.auth_routes import auth_bp
 from app.routes.category import category_bp
 from app.routes.content import content_bp
 from app.routes.cooperation import cooperation_bp
 from app.routes.user_routes import user_bp
+from app.search.service import content_search, init_search
+from app.utils.audit import audit_writer, init_audit
+from app.utils.category_cache import category_cache
+from app.utils.compression import init_compression, response_compressor
+from app.utils.decorators import role_required, token_required
+from app.utils.email_outbox import init_email_outbox
+from app.utils.email_templates import email_templates
+from app.utils.json_provider import init_json
+from app.utils.password_pool import init_password_hasher, password_hasher
+from app.utils.principal_cache import principal_cache
+from app.utils.rate_limit import get_rate_limiter
+from app.utils.revocation import init_revocations, revocation_list
+from app.utils.sessions import init_session_sweeper, session_sweeper
+from app.utils.smtp_pool import get_smtp_pool
 
 
-def create_app():
-    app = Flask(__name__)
-
+def _load_config(app):
     env = os.getenv('FLASK_ENV', 'default')
     app.config.from_object(config_by_name.get(env, config_by_name['default']))
 
+
+def create_script_app():
+    """
+    App for maintenance scripts: config and the database pool only
+
+    Unlike create_app it starts no hasher processes, outbox workers,
+    search indexer, sweeper or revocation poller.
+    """
+    app = Flask(__name__)
+    _load_config(app)
+    init_pool(app)
+    return app
+
+
+def create_app():
+    app = Flask(__name__)
+    _load_config(app)
+
+    # Fork the hasher workers before any background thread is started
+    init_password_hasher(app)
+    init_json(app)
     CORS(app)
+    # Registered before the request session hook so it compresses the final response
+    init_compression(app)
+    init_pool(app)
+    init_request_session(app)
     mysql.init_app(app)
+    init_audit(app)
+    init_search(app)
+    email_templates.load()
+    init_email_outbox(app)
+    init_session_sweeper(app)
+    init_revocations(app)
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(user_bp)
+    app.register_blueprint(audit_bp)
     app.register_blueprint(category_bp, url_prefix='/api/categories')
     app.register_blueprint(content_bp, url_prefix='/api/contents')
     app.register_blueprint(cooperation_bp, url_prefix='/api/cooperations')
@@ -33,4 +79,76 @@ def create_app():
     def health():
         return {'status': 'success', 'message': 'Backend ready!', 'data': None}, 200
 
+    # Internal counters and queue depths: administrators only
+    @app.route('/health/db-pool')
+    @token_required
+    @role_required('Kasubbag Jashumas')
+    def db_pool_stats():
+        return {'status': 'success', 'message': 'Database pool stats', 'data': get_pool().stats()}, 200
+
+    @app.route('/health/auth-cache')
+    @token_required
+    @role_required('Kasubbag Jashumas')
+    def auth_cache_stats():
+        return {'status': 'success', 'message': 'Auth cache stats', 'data': principal_cache.stats()}, 200
+
+    @app.route('/health/category-cache')
+    @token_required
+    @role_required('Kasubbag Jashumas')
+    def category_cache_stats():
+        return {'status': 'success', 'message': 'Category cache stats', 'data': category_cache.stats()}, 200
+
+    @app.route('/health/compression')
+    @token_required
+    @role_required('Kasubbag Jashumas')
+    def compression_stats():
+        return {'status': 'success', 'message': 'Compression stats', 'data': response_compressor.stats()}, 200
+
+    @app.route('/health/password-hasher')
+    @token_required
+    @role_required('Kasubbag Jashumas')
+    def password_hasher_stats():
+        return {'status': 'success', 'message': 'Password hasher stats', 'data': password_hasher.stats()}, 200
+
+    @app.route('/health/audit-writer')
+    @token_required
+    @role_required('Kasubbag Jashumas')
+    def audit_writer_stats():
+        return {'status': 'success', 'message': 'Audit writer stats', 'data': audit_writer.stats()}, 200
+
+    @app.route('/health/session-sweeper')
+    @token_required
+    @role_required('Kasubbag Jashumas')
+    def session_sweeper_stats():
+        return {'status': 'success', 'message': 'Session sweeper stats', 'data': session_sweeper.stats()}, 200
+
+    @app.route('/health/revocations')
+    @token_required
+    @role_required('Kasubbag Jashumas')
+    def revocation_stats():
+        return {'status': 'success', 'message': 'Token revocation stats', 'data': revocation_list.stats()}, 200
+
+    @app.route('/health/rate-limit')
+    @token_required
+    @role_required('Kasubbag Jashumas')
+    def rate_limit_stats():
+        return {'status': 'success', 'message': 'Rate limit stats', 'data': get_rate_limiter().stats()}, 200
+
+    @app.route('/health/smtp-pool')
+    @token_required
+    @role_required('Kasubbag Jashumas')
+    def smtp_pool_stats():
+        return {'status': 'success', 'message': 'SMTP pool stats', 'data': get_smtp_pool().stats()}, 200
+
+    @app.route('/health/search-index')
+    @token_required
+    @role_required('Kasubbag Jashumas')
+    def search_index_stats():
+        data = {
+            'ready': content_search.ready,
+            'documents': len(content_search.index),
+            'terms': len(content_search.index.postings)
+        }
+        return {'status': 'success', 'message': 'Search index stats', 'data': data}, 200
+
     return app
@@ -20,12 +20,78 @@ class Config:
     MYSQL_PASSWORD = os.getenv('DB_PASSWORD', '')
     MYSQL_DB = os.getenv('DB_NAME', 'sistem_humas_poltek')
     MYSQL_CURSORCLASS = 'DictCursor'
+    MYSQL_CHARSET = 'utf8mb4'
+    
+    # Database connection pool
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 10))
+    DB_POOL_MAX_LIFETIME = int(os.getenv('DB_POOL_MAX_LIFETIME', 1800))
+    DB_POOL_IDLE_TIMEOUT = int(os.getenv('DB_POOL_IDLE_TIMEOUT', 300))
+    DB_POOL_PING_INTERVAL = int(os.getenv('DB_POOL_PING_INTERVAL', 30))
+    DB_REQUEST_SESSION = os.getenv('DB_REQUEST_SESSION', 'True') == 'True'
+    
+    # Content search (match innodb_ft_min_token_size on the server)
+    FULLTEXT_MIN_TOKEN_SIZE = int(os.getenv('FULLTEXT_MIN_TOKEN_SIZE', 3))
+    
+    # In-process search index (segment file defaults to instance/search/contents.seg)
+    SEARCH_INDEX_ENABLED = os.getenv('SEARCH_INDEX_ENABLED', 'True') == 'True'
+    SEARCH_INDEX_PATH = os.getenv('SEARCH_INDEX_PATH')
+    SEARCH_INDEX_REFRESH_INTERVAL = int(os.getenv('SEARCH_INDEX_REFRESH_INTERVAL', 60))
+    # Each refresh re-reads rows updated this many seconds before the watermark (late commits)
+    SEARCH_INDEX_REFRESH_OVERLAP = int(os.getenv('SEARCH_INDEX_REFRESH_OVERLAP', 30))
+    SEARCH_INDEX_BATCH_SIZE = int(os.getenv('SEARCH_INDEX_BATCH_SIZE', 500))
+    
+    # Cooperation documents (upload spool defaults to instance/uploads)
+    DOCUMENT_STREAM_CHUNK_SIZE = int(os.getenv('DOCUMENT_STREAM_CHUNK_SIZE', 262144))
+    DOCUMENT_DB_CHUNK_SIZE = int(os.getenv('DOCUMENT_DB_CHUNK_SIZE', 1048576))
+    DOCUMENT_MAX_SIZE = int(os.getenv('DOCUMENT_MAX_SIZE', 20971520))
+    DOCUMENT_ALLOWED_MIME = os.getenv(
+        'DOCUMENT_ALLOWED_MIME',
+        'application/pdf,application/msword,'
+        'application/vnd.openxmlformats-officedocument.wordprocessingml.document,'
+        'image/png,image/jpeg'
+    ).split(',')
+    UPLOAD_TMP_DIR = os.getenv('UPLOAD_TMP_DIR')
+    UPLOAD_CHUNK_SIZE = int(os.getenv('UPLOAD_CHUNK_SIZE', 262144))
+    UPLOAD_SESSION_TTL = int(os.getenv('UPLOAD_SESSION_TTL', 86400))
+    
+    # Document blob store: 'local' (BLOB_STORE_PATH, defaults to instance/blobs) or 's3'
+    BLOB_STORE_BACKEND = os.getenv('BLOB_STORE_BACKEND', 'local')
+    BLOB_STORE_PATH = os.getenv('BLOB_STORE_PATH')
+    BLOB_STORE_S3_BUCKET = os.getenv('BLOB_STORE_S3_BUCKET')
+    BLOB_STORE_S3_PREFIX = os.getenv('BLOB_STORE_S3_PREFIX', 'cooperation-documents/')
+    BLOB_STORE_S3_ENDPOINT = os.getenv('BLOB_STORE_S3_ENDPOINT')
+    BLOB_STORE_S3_REGION = os.getenv('BLOB_STORE_S3_REGION')
+    BLOB_STORE_S3_ACCESS_KEY = os.getenv('BLOB_STORE_S3_ACCESS_KEY')
+    BLOB_STORE_S3_SECRET_KEY = os.getenv('BLOB_STORE_S3_SECRET_KEY')
     
     # JWT
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'jwt-secret-change-this')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(seconds=int(os.getenv('JWT_ACCESS_TOKEN_EXPIRES', 3600)))
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(seconds=int(os.getenv('JWT_REFRESH_TOKEN_EXPIRES', 2592000)))
     
+    # Expired sessions are deleted every SESSION_SWEEP_INTERVAL seconds (0 disables)
+    SESSION_SWEEP_INTERVAL = int(os.getenv('SESSION_SWEEP_INTERVAL', 300))
+    SESSION_SWEEP_BATCH_SIZE = int(os.getenv('SESSION_SWEEP_BATCH_SIZE', 500))
+    # Seconds between polls of token_revocations (logout/password change in other workers)
+    REVOCATION_POLL_INTERVAL = float(os.getenv('REVOCATION_POLL_INTERVAL', 1))
+    # Each poll re-reads revocations created this many seconds back (out-of-order commits)
+    REVOCATION_POLL_OVERLAP = int(os.getenv('REVOCATION_POLL_OVERLAP', 30))
+    
+    # JSON responses: 'orjson' (falls back to 'stdlib' if not installed) or 'stdlib'.
+    # Datetimes as 'http' dates (Flask's format) or 'iso' 8601 strings.
+    JSON_PROVIDER = os.getenv('JSON_PROVIDER', 'orjson')
+    JSON_DATETIME_FORMAT = os.getenv('JSON_DATETIME_FORMAT', 'http')
+    
+    # Response compression (zstd/br when installed, gzip always); ETagged bodies
+    # are kept compressed in a COMPRESS_CACHE_BYTES LRU per process
+    COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', 'True') == 'True'
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', 6))
+    COMPRESS_BROTLI_LEVEL = int(os.getenv('COMPRESS_BROTLI_LEVEL', 5))
+    COMPRESS_ZSTD_LEVEL = int(os.getenv('COMPRESS_ZSTD_LEVEL', 3))
+    COMPRESS_CACHE_BYTES = int(os.getenv('COMPRESS_CACHE_BYTES', 16 * 1024 * 1024))
+    
     # Email
     MAIL_SERVER = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
     MAIL_PORT = int(os.getenv('MAIL_PORT', 587))
@@ -34,9 +100,65 @@ class Config:
     MAIL_PASSWORD = os.getenv('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.getenv('MAIL_DEFAULT_SENDER', 'noreply@poltek-ssn.ac.id')
     
+    # SMTP connection pool
+    SMTP_POOL_SIZE = int(os.getenv('SMTP_POOL_SIZE', 4))
+    SMTP_POOL_MAX_IDLE = int(os.getenv('SMTP_POOL_MAX_IDLE', 60))
+    SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.getenv('SMTP_MAX_MESSAGES_PER_CONNECTION', 100))
+    SMTP_TIMEOUT = int(os.getenv('SMTP_TIMEOUT', 30))
+    SMTP_BATCH_CONCURRENCY = int(os.getenv('SMTP_BATCH_CONCURRENCY', 2))
+    
+    # Email outbox delivery workers (0 disables delivery in this process)
+    EMAIL_OUTBOX_WORKERS = int(os.getenv('EMAIL_OUTBOX_WORKERS', 2))
+    EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', 20))
+    EMAIL_OUTBOX_POLL_INTERVAL = int(os.getenv('EMAIL_OUTBOX_POLL_INTERVAL', 5))
+    EMAIL_OUTBOX_LEASE = int(os.getenv('EMAIL_OUTBOX_LEASE', 300))
+    EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', 8))
+    EMAIL_OUTBOX_BACKOFF_BASE = int(os.getenv('EMAIL_OUTBOX_BACKOFF_BASE', 30))
+    EMAIL_OUTBOX_BACKOFF_MAX = int(os.getenv('EMAIL_OUTBOX_BACKOFF_MAX', 3600))
+    
+    # Audit log writer (buffered, flushed in batches by a background thread)
+    AUDIT_BUFFER_SIZE = int(os.getenv('AUDIT_BUFFER_SIZE', 10000))
+    AUDIT_FLUSH_EVENTS = int(os.getenv('AUDIT_FLUSH_EVENTS', 200))
+    AUDIT_FLUSH_INTERVAL_MS = int(os.getenv('AUDIT_FLUSH_INTERVAL_MS', 200))
+    AUDIT_BLOCK_TIMEOUT_MS = int(os.getenv('AUDIT_BLOCK_TIMEOUT_MS', 50))
+    
+    # Audit log queries and monthly partition retention
+    AUDIT_LOG_DEFAULT_DAYS = int(os.getenv('AUDIT_LOG_DEFAULT_DAYS', 7))
+    AUDIT_LOG_MAX_RANGE_DAYS = int(os.getenv('AUDIT_LOG_MAX_RANGE_DAYS', 366))
+    AUDIT_LOG_RETENTION_MONTHS = int(os.getenv('AUDIT_LOG_RETENTION_MONTHS', 12))
+    AUDIT_LOG_PARTITIONS_AHEAD = int(os.getenv('AUDIT_LOG_PARTITIONS_AHEAD', 3))
+    
     # Security
+    # Login limits: failed attempts per RATE_LIMIT_WINDOW seconds, per username and per IP
     RATE_LIMIT_LOGIN = int(os.getenv('RATE_LIMIT_LOGIN', 5))
+    RATE_LIMIT_LOGIN_IP = int(os.getenv('RATE_LIMIT_LOGIN_IP', 20))
     RATE_LIMIT_WINDOW = int(os.getenv('RATE_LIMIT_WINDOW', 300))
+    # Registrations per RATE_LIMIT_WINDOW seconds per IP
+    RATE_LIMIT_REGISTER = int(os.getenv('RATE_LIMIT_REGISTER', 10))
+    # Rate limit counters: 'memory' (per process), 'sqlite' (shared by the workers
+    # on one host, RATE_LIMIT_STORAGE_PATH defaults to instance/rate_limits.sqlite3)
+    # or 'redis' (shared across hosts, needs the redis package)
+    RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', 'sqlite')
+    RATE_LIMIT_MAX_KEYS = int(os.getenv('RATE_LIMIT_MAX_KEYS', 10000))
+    RATE_LIMIT_STORAGE_PATH = os.getenv('RATE_LIMIT_STORAGE_PATH')
+    RATE_LIMIT_REDIS_URL = os.getenv('RATE_LIMIT_REDIS_URL', 'redis://localhost:6379/0')
+    PERMISSION_CACHE_TTL = int(os.getenv('PERMISSION_CACHE_TTL', 300))
+    # Argon2id profile for new hashes; older hashes are upgraded on login
+    # (tune for the host with tune_argon2.py)
+    ARGON2_TIME_COST = int(os.getenv('ARGON2_TIME_COST', 3))
+    ARGON2_MEMORY_COST = int(os.getenv('ARGON2_MEMORY_COST', 65536))
+    ARGON2_PARALLELISM = int(os.getenv('ARGON2_PARALLELISM', 4))
+    ARGON2_HASH_LEN = int(os.getenv('ARGON2_HASH_LEN', 32))
+    ARGON2_SALT_LEN = int(os.getenv('ARGON2_SALT_LEN', 16))
+    # Argon2 runs in PASSWORD_HASH_WORKERS processes (0 = inline); beyond
+    # PASSWORD_HASH_MAX_PENDING queued jobs per process requests get 503
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', 32))
+    PASSWORD_HASH_TIMEOUT = int(os.getenv('PASSWORD_HASH_TIMEOUT', 10))
+    PRINCIPAL_CACHE_SIZE = int(os.getenv('PRINCIPAL_CACHE_SIZE', 1024))
+    PRINCIPAL_CACHE_TTL = int(os.getenv('PRINCIPAL_CACHE_TTL', 60))
+    # Categories are cached per process; writes in other workers show up within the TTL
+    CATEGORY_CACHE_TTL = int(os.getenv('CATEGORY_CACHE_TTL', 300))
     
     # App
     APP_NAME = os.getenv('APP_NAME', 'Sistem HUMAS Poltek SSN')
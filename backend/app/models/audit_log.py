@@ -0,0 +1,198 @@
+import json
+import re
+from datetime import datetime
+
+import MySQLdb
+from app.utils.database import get_connection, release_connection
+from app.utils.pagination import encode_keyset_cursor
+
+_PARTITION_NAME_RE = re.compile(r'^p(\d{4})(\d{2})$')
+
+
+def _add_months(value, months):
+    """First day of the month ``months`` away from ``value``'s month"""
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+class AuditLog:
+    """Audit log model: filtered keyset queries and monthly partition maintenance"""
+
+    JSON_COLUMNS = ('details', 'old_values', 'new_values')
+
+    def __init__(self):
+        self.conn = None
+        self.cursor = None
+
+    def _get_db_connection(self):
+        """Get database connection"""
+        try:
+            self.conn = get_connection()
+            self.cursor = self.conn.cursor(MySQLdb.cursors.DictCursor)
+        except Exception as e:
+            raise Exception(f"Database connection failed: {str(e)}")
+
+    def _close_db_connection(self):
+        """Close database connection"""
+        if self.cursor:
+            self.cursor.close()
+            self.cursor = None
+        if self.conn:
+            release_connection(self.conn)
+            self.conn = None
+
+    def get_audit_logs(self, date_from, date_to, filters=None, per_page=50, cursor=None):
+        """
+        Get audit logs in ``[date_from, date_to)``, newest first
+
+        The time range is always part of the WHERE clause so MySQL only
+        reads the monthly partitions it covers; user_id/module/action
+        filters use the matching (column, timestamp, id) index. Paging is
+        keyset on (timestamp, id): pass ``cursor`` from a previous
+        ``next_cursor``.
+        """
+        try:
+            self._get_db_connection()
+
+            where = " WHERE a.timestamp >= %s AND a.timestamp < %s"
+            params = [date_from, date_to]
+
+            filters = filters or {}
+            for column in ('user_id', 'module', 'action'):
+                if filters.get(column) is not None:
+                    where += f" AND a.{column} = %s"
+                    params.append(filters[column])
+
+            if cursor:
+                cursor_timestamp, cursor_id = cursor
+                where += " AND (a.timestamp < %s OR (a.timestamp = %s AND a.id < %s))"
+                params.extend([cursor_timestamp, cursor_timestamp, cursor_id])
+
+            query = """
+                SELECT a.id, a.user_id, u.username, u.full_name, a.action, a.module,
+                       a.table_name, a.record_id, a.ip_address, a.user_agent,
+                       a.details, a.old_values, a.new_values, a.timestamp
+                FROM audit_logs a
+                LEFT JOIN users u ON a.user_id = u.id
+            """ + where + " ORDER BY a.timestamp DESC, a.id DESC LIMIT %s"
+            params.append(per_page + 1)
+
+            self.cursor.execute(query, params)
+            logs = list(self.cursor.fetchall())
+
+            has_next = len(logs) > per_page
+            logs = logs[:per_page]
+            for row in logs:
+                for column in self.JSON_COLUMNS:
+                    if isinstance(row[column], (str, bytes)):
+                        row[column] = json.loads(row[column])
+
+            next_cursor = None
+            if has_next:
+                last = logs[-1]
+                next_cursor = encode_keyset_cursor(last['timestamp'], last['id'])
+
+            return {
+                'success': True,
+                'logs': logs,
+                'pagination': {
+                    'per_page': per_page,
+                    'has_next': has_next,
+                    'next_cursor': next_cursor,
+                    'from': date_from,
+                    'to': date_to
+                }
+            }
+
+        except Exception as e:
+            print(f"[GET AUDIT LOGS ERROR] {str(e)}")
+            return {
+                'success': False,
+                'message': f'Failed to get audit logs: {str(e)}'
+            }
+        finally:
+            self._close_db_connection()
+
+    def _get_partitions(self):
+        """Partitions of audit_logs in order as (name, upper bound as UNIX time or None for MAXVALUE)"""
+        self.cursor.execute(
+            """
+            SELECT PARTITION_NAME as name, PARTITION_DESCRIPTION as bound
+            FROM information_schema.PARTITIONS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'audit_logs'
+              AND PARTITION_NAME IS NOT NULL
+            ORDER BY PARTITION_ORDINAL_POSITION
+            """
+        )
+        return [
+            (row['name'], None if row['bound'] == 'MAXVALUE' else int(row['bound']))
+            for row in self.cursor.fetchall()
+        ]
+
+    def maintain_partitions(self, retention_months, months_ahead, dry_run=False):
+        """
+        Keep monthly partitions ``pYYYYMM`` ahead of time and drop expired ones
+
+        New months are split out of the ``pmax`` catch-all partition (cheap
+        while it is empty). Every partition whose upper bound is on or
+        before the first day of the month ``retention_months`` ago is
+        dropped, which discards its rows without a DELETE.
+        """
+        try:
+            self._get_db_connection()
+
+            partitions = self._get_partitions()
+            if not partitions:
+                return {
+                    'success': False,
+                    'message': 'audit_logs is not partitioned (run migration 010 first)'
+                }
+
+            this_month = _add_months(datetime.now(), 0)
+
+            # Months to add after the newest pYYYYMM partition
+            months = [
+                datetime(int(match.group(1)), int(match.group(2)), 1)
+                for match in (_PARTITION_NAME_RE.match(name) for name, _ in partitions) if match
+            ]
+            next_month = _add_months(max(months), 1) if months else this_month
+            last_month = _add_months(this_month, months_ahead)
+            added = []
+            while next_month <= last_month:
+                added.append(next_month)
+                next_month = _add_months(next_month, 1)
+
+            if added and not dry_run:
+                definitions = ', '.join(
+                    f"PARTITION p{month:%Y%m} VALUES LESS THAN "
+                    f"(UNIX_TIMESTAMP('{_add_months(month, 1):%Y-%m-%d %H:%M:%S}'))"
+                    for month in added
+                )
+                self.cursor.execute(
+                    f"ALTER TABLE audit_logs REORGANIZE PARTITION pmax INTO "
+                    f"({definitions}, PARTITION pmax VALUES LESS THAN MAXVALUE)"
+                )
+
+            cutoff = _add_months(this_month, -retention_months)
+            self.cursor.execute("SELECT UNIX_TIMESTAMP(%s) as ts", (cutoff,))
+            cutoff_ts = int(self.cursor.fetchone()['ts'])
+            dropped = [name for name, bound in partitions if bound is not None and bound <= cutoff_ts]
+
+            if dropped and not dry_run:
+                self.cursor.execute(f"ALTER TABLE audit_logs DROP PARTITION {', '.join(dropped)}")
+
+            return {
+                'success': True,
+                'added': [f"p{month:%Y%m}" for month in added],
+                'dropped': dropped,
+                'cutoff': cutoff
+            }
+
+        except Exception as e:
+            print(f"[AUDIT PARTITION ERROR] {str(e)}")
+            return {
+                'success': False,
+                'message': f'Failed to maintain audit log partitions: {str(e)}'
+            }
+        finally:
+            self._close_db_connection()
@@ -1,5 +1,6 @@
 import MySQLdb
-from flask import current_app
+from app.utils.category_cache import get_category_snapshot, invalidate_categories
+from app.utils.database import get_connection, get_pool, release_connection
 import re
 
 class Category:
@@ -12,13 +13,7 @@ class Category:
     def _get_db_connection(self):
         """Get database connection"""
         try:
-            self.conn = MySQLdb.connect(
-                host=current_app.config['MYSQL_HOST'],
-                port=current_app.config['MYSQL_PORT'],
-                user=current_app.config['MYSQL_USER'],
-                password=current_app.config['MYSQL_PASSWORD'],
-                database=current_app.config['MYSQL_DB']
-            )
+            self.conn = get_connection()
             self.cursor = self.conn.cursor(MySQLdb.cursors.DictCursor)
         except Exception as e:
             raise Exception(f"Database connection failed: {str(e)}")
@@ -27,8 +22,10 @@ class Category:
         """Close database connection"""
         if self.cursor:
             self.cursor.close()
+            self.cursor = None
         if self.conn:
-            self.conn.close()
+            release_connection(self.conn)
+            self.conn = None
     
     def _generate_slug(self, name):
         """Generate slug from name"""
@@ -55,6 +52,7 @@ class Category:
             """
             self.cursor.execute(query, (name, slug, description, icon, color, created_by))
             self.conn.commit()
+            invalidate_categories()
             
             category_id = self.cursor.lastrowid
             
@@ -67,44 +65,49 @@ class Category:
         finally:
             self._close_db_connection()
     
+    def _load_categories(self):
+        """
+        Load every category (active or not) ordered by name; the category cache loader
+
+        Uses its own pool connection rather than the request session, so
+        the process-wide snapshot only ever holds committed rows.
+        """
+        pool = get_pool()
+        conn = pool.acquire()
+        try:
+            cursor = conn.cursor(MySQLdb.cursors.DictCursor)
+            cursor.execute("SELECT * FROM content_categories ORDER BY name ASC")
+            rows = cursor.fetchall()
+            cursor.close()
+            conn.commit()
+            return rows
+        finally:
+            pool.release(conn)
+    
     def get_all_categories(self, active_only=True):
-        """Get all categories"""
+        """Get all categories (served from the category cache)"""
         try:
-            self._get_db_connection()
-            
-            query = "SELECT * FROM content_categories"
-            if active_only:
-                query += " WHERE is_active = TRUE"
-            query += " ORDER BY name ASC"
-            
-            self.cursor.execute(query)
-            categories = self.cursor.fetchall()
+            snapshot = get_category_snapshot(self._load_categories)
+            categories = snapshot.active if active_only else snapshot.all
             
-            return {'success': True, 'categories': categories}
+            return {'success': True, 'categories': categories, 'validators': snapshot.list_validators[active_only]}
             
         except Exception as e:
             return {'success': False, 'message': str(e)}
-        finally:
-            self._close_db_connection()
     
     def get_category_by_id(self, category_id):
-        """Get category by ID"""
+        """Get category by ID (served from the category cache)"""
         try:
-            self._get_db_connection()
-            
-            query = "SELECT * FROM content_categories WHERE id = %s"
-            self.cursor.execute(query, (category_id,))
-            category = self.cursor.fetchone()
+            snapshot = get_category_snapshot(self._load_categories)
+            category = snapshot.by_id.get(category_id)
             
             if not category:
                 return {'success': False, 'message': 'Category not found'}
             
-            return {'success': True, 'category': category}
+            return {'success': True, 'category': category, 'validators': snapshot.row_validators[category_id]}
             
         except Exception as e:
             return {'success': False, 'message': str(e)}
-        finally:
-            self._close_db_connection()
     
     def update_category(self, category_id, name, description, icon, color):
         """Update category"""
@@ -128,6 +131,7 @@ class Category:
             """
             self.cursor.execute(query, (name, slug, description, icon, color, category_id))
             self.conn.commit()
+            invalidate_categories()
             
             if self.cursor.rowcount == 0:
                 return {'success': False, 'message': 'Category not found'}
@@ -160,6 +164,7 @@ class Category:
             query = "UPDATE content_categories SET is_active = FALSE WHERE id = %s"
             self.cursor.execute(query, (category_id,))
             self.conn.commit()
+            invalidate_categories()
             
             if self.cursor.rowcount == 0:
                 return {'success': False, 'message': 'Category not found'}
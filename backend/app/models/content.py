@@ -1,11 +1,37 @@
 import MySQLdb
 from flask import current_app
+from app.utils.audit import log_audit
+from app.utils.database import call_after_commit, get_connection, release_connection
+from app.utils.pagination import encode_keyset_cursor
+from app.search.analyzer import STOPWORDS, normalize
+from app.search.service import content_search
 import re
 from datetime import datetime
 
 class Content:
     """Content model for managing articles/posts"""
     
+    # Columns a content list may return (?fields=); the detail endpoint always returns everything
+    LIST_FIELDS = {
+        'id': 'c.id',
+        'title': 'c.title',
+        'slug': 'c.slug',
+        'excerpt': 'c.excerpt',
+        'body': 'c.body',
+        'featured_image': 'c.featured_image',
+        'category_id': 'c.category_id',
+        'author_id': 'c.author_id',
+        'status': 'c.status',
+        'views': 'c.views',
+        'published_at': 'c.published_at',
+        'created_at': 'c.created_at',
+        'updated_at': 'c.updated_at',
+        'category_name': 'cc.name',
+        'author_name': 'u.full_name',
+    }
+    # Default list representation: everything but the LONGTEXT body
+    SUMMARY_FIELDS = tuple(field for field in LIST_FIELDS if field != 'body')
+    
     def __init__(self):
         self.conn = None
         self.cursor = None
@@ -13,13 +39,7 @@ class Content:
     def _get_db_connection(self):
         """Get database connection"""
         try:
-            self.conn = MySQLdb.connect(
-                host=current_app.config['MYSQL_HOST'],
-                port=current_app.config['MYSQL_PORT'],
-                user=current_app.config['MYSQL_USER'],
-                password=current_app.config['MYSQL_PASSWORD'],
-                database=current_app.config['MYSQL_DB']
-            )
+            self.conn = get_connection()
             self.cursor = self.conn.cursor(MySQLdb.cursors.DictCursor)
         except Exception as e:
             raise Exception(f"Database connection failed: {str(e)}")
@@ -28,8 +48,32 @@ class Content:
         """Close database connection"""
         if self.cursor:
             self.cursor.close()
+            self.cursor = None
         if self.conn:
-            self.conn.close()
+            release_connection(self.conn)
+            self.conn = None
+    
+    @staticmethod
+    def _audit(user_id, action, content_id, new_values=None, old_values=None):
+        """Log a content change once the transaction commits (replaces the DB triggers)"""
+        details = {'table': 'contents', 'record_id': content_id}
+        if old_values is not None:
+            details['old_values'] = old_values
+        if new_values is not None:
+            details['new_values'] = new_values
+        call_after_commit(lambda: log_audit(
+            user_id, action, 'content', details,
+            table_name='contents', record_id=content_id,
+            old_values=old_values, new_values=new_values
+        ))
+    
+    def _audit_old_values(self, content_id):
+        """Title and status before a write (what the old triggers logged as old_values), or None"""
+        self.cursor.execute(
+            "SELECT title, status FROM contents WHERE id = %s FOR UPDATE",
+            (content_id,)
+        )
+        return self.cursor.fetchone()
     
     def _generate_slug(self, title):
         """Generate slug from title"""
@@ -58,6 +102,15 @@ class Content:
             self.conn.commit()
             
             content_id = self.cursor.lastrowid
+            content_search.content_saved(content_id, title, excerpt, body, {
+                'category_id': category_id,
+                'author_id': author_id,
+                'status': 'draft',
+                'updated_at': datetime.now()
+            })
+            self._audit(author_id, 'INSERT', content_id, new_values={
+                'title': title, 'category_id': category_id, 'status': 'draft'
+            })
             
             print(f"[CONTENT] Created content ID: {content_id} by user: {author_id}")
             
@@ -71,70 +124,369 @@ class Content:
         finally:
             self._close_db_connection()
     
-    def get_contents(self, filters=None, page=1, per_page=10):
-        """Get contents with filters and pagination"""
+    @classmethod
+    def parse_fields(cls, value):
+        """
+        Parse a ``?fields=title,status,...`` projection
+
+        Returns:
+            list: Requested fields, or SUMMARY_FIELDS when ``value`` is empty
+
+        Raises:
+            ValueError: Unknown field names
+        """
+        if not value or not value.strip():
+            return list(cls.SUMMARY_FIELDS)
+        fields = list(dict.fromkeys(field.strip() for field in value.split(',') if field.strip()))
+        unknown = [field for field in fields if field not in cls.LIST_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return fields
+    
+    def _list_query(self, fields, extra=()):
+        """
+        SELECT list and FROM clause for a projected content list
+
+        ``id`` and ``created_at`` are always selected (keyset cursors need
+        them); the category/user joins are only added when their names are
+        requested. ``extra`` are fields needed internally, returned as well.
+        """
+        selected = list(dict.fromkeys(['id', 'created_at', *fields, *extra]))
+        columns = ', '.join(f"{self.LIST_FIELDS[field]} as {field}" for field in selected)
+        tables = "contents c"
+        if 'category_name' in selected:
+            tables += " JOIN content_categories cc ON c.category_id = cc.id"
+        if 'author_name' in selected:
+            tables += " JOIN users u ON c.author_id = u.id"
+        return columns, tables
+    
+    def _filter_where(self, filters):
+        """WHERE clause and params for the status/category/author filters"""
+        where = " WHERE 1=1"
+        params = []
+        
+        if filters:
+            if filters.get('status'):
+                where += " AND c.status = %s"
+                params.append(filters['status'])
+            
+            if filters.get('category_id'):
+                where += " AND c.category_id = %s"
+                params.append(filters['category_id'])
+            
+            if filters.get('author_id'):
+                where += " AND c.author_id = %s"
+                params.append(filters['author_id'])
+        
+        return where, params
+    
+    def get_contents_version(self, filters=None):
+        """
+        Count and newest updated_at of the contents matching ``filters``,
+        for conditional GETs of content lists
+
+        Search terms are ignored: a row can only enter or leave a MySQL
+        search result by being updated, which moves max(updated_at) of the
+        wider set as well. This does not hold for searches answered by the
+        in-process index, which lags other workers' commits; callers add
+        ``content_search.state()`` to their validators when
+        :meth:`uses_search_index` is true.
+        """
         try:
             self._get_db_connection()
             
-            # Build query
-            query = """
-                SELECT c.*, cc.name as category_name, u.full_name as author_name
-                FROM contents c
-                JOIN content_categories cc ON c.category_id = cc.id
-                JOIN users u ON c.author_id = u.id
-                WHERE 1=1
-            """
-            params = []
-            
-            # Apply filters
-            if filters:
-                if filters.get('status'):
-                    query += " AND c.status = %s"
-                    params.append(filters['status'])
-                
-                if filters.get('category_id'):
-                    query += " AND c.category_id = %s"
-                    params.append(filters['category_id'])
-                
-                if filters.get('author_id'):
-                    query += " AND c.author_id = %s"
-                    params.append(filters['author_id'])
-                
-                if filters.get('search'):
-                    query += " AND (c.title LIKE %s OR c.excerpt LIKE %s OR c.body LIKE %s)"
-                    search_term = f"%{filters['search']}%"
-                    params.extend([search_term, search_term, search_term])
-            
-            # Count total
-            count_query = f"SELECT COUNT(*) as total FROM ({query}) as count_table"
-            self.cursor.execute(count_query, params)
-            total = self.cursor.fetchone()['total']
-            
-            # Add pagination
-            query += " ORDER BY c.created_at DESC LIMIT %s OFFSET %s"
-            offset = (page - 1) * per_page
-            params.extend([per_page, offset])
+            where, params = self._filter_where(filters)
+            self.cursor.execute(
+                f"SELECT COUNT(*) as total, MAX(c.updated_at) as last_modified FROM contents c{where}",
+                params
+            )
+            row = self.cursor.fetchone()
+            
+            return {'success': True, 'total': row['total'], 'last_modified': row['last_modified']}
+            
+        except Exception as e:
+            return {'success': False, 'message': str(e)}
+        finally:
+            self._close_db_connection()
+    
+    def get_content_version(self, content_id):
+        """updated_at and author of one content (primary key lookup), for conditional GETs"""
+        try:
+            self._get_db_connection()
+            
+            self.cursor.execute(
+                "SELECT author_id, updated_at FROM contents WHERE id = %s",
+                (content_id,)
+            )
+            row = self.cursor.fetchone()
+            
+            if not row:
+                return {'success': False, 'message': 'Content not found'}
+            
+            return {'success': True, 'author_id': row['author_id'], 'last_modified': row['updated_at']}
+            
+        except Exception as e:
+            return {'success': False, 'message': str(e)}
+        finally:
+            self._close_db_connection()
+    
+    @staticmethod
+    def uses_search_index(filters, cursor=None):
+        """True when get_contents will answer ``filters`` from the search index"""
+        return bool(filters and filters.get('search') and not cursor
+                    and filters.get('search_mode') != 'boolean' and content_search.ready)
+    
+    def get_contents(self, filters=None, page=1, per_page=10, cursor=None, total_mode='exact', fields=None):
+        """
+        Get contents with filters and pagination
+
+        ``fields`` projects the columns of each row (see LIST_FIELDS);
+        by default the summary representation without ``body`` is returned.
+
+        Two pagination modes are supported:
+        - offset (default): ``page``/``per_page``, newest first
+        - keyset: pass ``cursor`` (from a previous ``next_cursor``) to fetch
+          the rows strictly older than it; cost stays flat however deep the
+          page is. Relevance-ranked pages have no ``next_cursor``; they are
+          paged by ``page``
+
+        ``total_mode`` is 'exact' (COUNT query), 'approx' (optimizer
+        estimate) or 'none' (skip counting).
+        
+        Natural-language searches without a cursor are answered by the
+        in-process search index once it is built (BM25, prefix and typo
+        tolerant, with facet counts); everything else goes to MySQL.
+        """
+        if self.uses_search_index(filters, cursor):
+            return self._search_index(filters, page, per_page, fields)
+        
+        if fields is None:
+            fields = self.SUMMARY_FIELDS
+        
+        try:
+            self._get_db_connection()
+            
+            # Build filters
+            where, params = self._filter_where(filters)
+            
+            # Search: FULLTEXT (idx_search) when possible, LIKE for short terms
+            select_extra = ""
+            select_params = []
+            order_by = "c.created_at DESC, c.id DESC"
+            search = self._build_search(filters.get('search'), filters.get('search_mode')) if filters else None
+            if search:
+                where += search['where']
+                params.extend(search['where_params'])
+                select_extra = search['select']
+                select_params = search['select_params']
+                if search['ranked'] and not cursor:
+                    order_by = "relevance DESC, " + order_by
+            
+            # Count total (category/author joins are 1:1 via FKs, so count contents only)
+            total = None
+            if total_mode == 'exact':
+                self.cursor.execute(f"SELECT COUNT(*) as total FROM contents c{where}", params)
+                total = self.cursor.fetchone()['total']
+            elif total_mode == 'approx':
+                self.cursor.execute(f"EXPLAIN SELECT c.id FROM contents c{where}", params)
+                plan = self.cursor.fetchone()
+                total = int(plan['rows'] or 0) if plan else 0
+            
+            columns, tables = self._list_query(fields)
+            query = f"SELECT {columns}{select_extra} FROM {tables}" + where
+            params = select_params + params
+            
+            # Add pagination (keyset paging is always chronological)
+            if cursor:
+                cursor_created_at, cursor_id = cursor
+                query += " AND (c.created_at < %s OR (c.created_at = %s AND c.id < %s))"
+                params.extend([cursor_created_at, cursor_created_at, cursor_id])
+                query += f" ORDER BY {order_by} LIMIT %s"
+                params.append(per_page + 1)
+            else:
+                query += f" ORDER BY {order_by} LIMIT %s OFFSET %s"
+                offset = (page - 1) * per_page
+                params.extend([per_page + 1, offset])
             
             self.cursor.execute(query, params)
-            contents = self.cursor.fetchall()
+            contents = list(self.cursor.fetchall())
+            if search:
+                for row in contents:
+                    row['snippet'] = self._clean_snippet(row.get('snippet'))
+            
+            has_next = len(contents) > per_page
+            contents = contents[:per_page]
+            next_cursor = None
+            if has_next and not order_by.startswith('relevance'):
+                # A (created_at, id) cursor only continues a chronological page
+                last = contents[-1]
+                next_cursor = encode_keyset_cursor(last['created_at'], last['id'])
+            
+            pagination = {
+                'per_page': per_page,
+                'has_next': has_next,
+                'next_cursor': next_cursor,
+                'total': total,
+                'total_is_estimate': total_mode == 'approx'
+            }
+            if not cursor:
+                pagination['page'] = page
+            if total is not None:
+                pagination['total_pages'] = (total + per_page - 1) // per_page
             
             return {
                 'success': True,
                 'contents': contents,
+                'pagination': pagination
+            }
+            
+        except Exception as e:
+            print(f"[GET CONTENTS ERROR] {str(e)}")
+            return {'success': False, 'message': str(e)}
+        finally:
+            self._close_db_connection()
+    
+    def _search_index(self, filters, page, per_page, fields=None):
+        """Rank with the search index, then load the page rows by id"""
+        if fields is None:
+            fields = self.SUMMARY_FIELDS
+        try:
+            index_filters = {
+                'status': filters.get('status'),
+                'category_id': filters.get('category_id'),
+                'author_id': filters.get('author_id')
+            }
+            offset = (page - 1) * per_page
+            hits = content_search.search(filters['search'], index_filters, offset, per_page)
+            
+            contents = []
+            if hits['ids']:
+                self._get_db_connection()
+                placeholders = ', '.join(['%s'] * len(hits['ids']))
+                # The body is read for the snippet even when it is not returned
+                columns, tables = self._list_query(fields, extra=('body',))
+                query = f"SELECT {columns} FROM {tables} WHERE c.id IN ({placeholders})"
+                self.cursor.execute(query, hits['ids'])
+                rows = {row['id']: row for row in self.cursor.fetchall()}
+                terms = [t for t in normalize(filters['search']) if t not in STOPWORDS]
+                keep_body = 'body' in fields
+                for content_id in hits['ids']:
+                    row = rows.get(content_id)
+                    if row:
+                        row['snippet'] = self._index_snippet(row['body'] if keep_body else row.pop('body'), terms)
+                        contents.append(row)
+            
+            total = hits['total']
+            has_next = offset + per_page < total
+            # BM25 order: continue with ?page=, a chronological cursor would
+            # send the next request to MySQL and page a different result set
+            next_cursor = None
+            
+            return {
+                'success': True,
+                'contents': contents,
+                'facets': {
+                    field: {str(value): count for value, count in counts.items()}
+                    for field, counts in hits['facets'].items()
+                },
                 'pagination': {
                     'page': page,
                     'per_page': per_page,
+                    'has_next': has_next,
+                    'next_cursor': next_cursor,
                     'total': total,
+                    'total_is_estimate': False,
                     'total_pages': (total + per_page - 1) // per_page
                 }
             }
             
         except Exception as e:
-            print(f"[GET CONTENTS ERROR] {str(e)}")
+            print(f"[SEARCH INDEX ERROR] {str(e)}")
             return {'success': False, 'message': str(e)}
         finally:
             self._close_db_connection()
     
+    @classmethod
+    def _index_snippet(cls, body, terms):
+        """Cut a snippet window around the first query term found in the body"""
+        if not body:
+            return None
+        lowered = body.lower()
+        position = -1
+        for term in terms:
+            position = lowered.find(term)
+            if position >= 0:
+                break
+        start = max(position - 80, 0)
+        return cls._clean_snippet(body[start:start + 240])
+    
+    def _build_search(self, text, mode=None):
+        """
+        Build the SQL fragments for a content search
+
+        Terms at least FULLTEXT_MIN_TOKEN_SIZE long go through
+        ``MATCH(title, excerpt, body) AGAINST(...)`` in natural language
+        (default) or boolean mode, ranked by relevance. If every term is
+        shorter than the FULLTEXT minimum (so MATCH would ignore it), fall
+        back to LIKE.
+
+        Returns:
+            dict or None: where/select fragments and their params
+        """
+        if not text or not text.strip():
+            return None
+        
+        text = text.strip()
+        min_len = current_app.config['FULLTEXT_MIN_TOKEN_SIZE']
+        terms = re.findall(r'\w+', text)
+        long_terms = [term for term in terms if len(term) >= min_len]
+        snippet_term = long_terms[0] if long_terms else (terms[0] if terms else text)
+        snippet_sql = (
+            ", SUBSTRING(c.body, GREATEST(LOCATE(%s, c.body) - 80, 1), 240) as snippet"
+        )
+        
+        if not long_terms:
+            like = f"%{text}%"
+            return {
+                'where': " AND (c.title LIKE %s OR c.excerpt LIKE %s OR c.body LIKE %s)",
+                'where_params': [like, like, like],
+                'select': snippet_sql,
+                'select_params': [snippet_term],
+                'ranked': False
+            }
+        
+        if mode == 'boolean':
+            if re.search(r'[+\-<>()~*"]', text):
+                # Caller wrote an explicit boolean expression
+                against = text
+            else:
+                # Require every term, matching word prefixes like LIKE did
+                against = ' '.join(f'+{term}*' for term in long_terms)
+            match_sql = "MATCH(c.title, c.excerpt, c.body) AGAINST(%s IN BOOLEAN MODE)"
+        else:
+            against = text
+            match_sql = "MATCH(c.title, c.excerpt, c.body) AGAINST(%s IN NATURAL LANGUAGE MODE)"
+        
+        return {
+            'where': f" AND {match_sql}",
+            'where_params': [against],
+            'select': f", {match_sql} as relevance" + snippet_sql,
+            'select_params': [against, snippet_term],
+            'ranked': True
+        }
+    
+    @staticmethod
+    def _clean_snippet(snippet):
+        """Collapse whitespace and trim a raw snippet window to word boundaries"""
+        if not snippet:
+            return None
+        text = re.sub(r'<[^>]+>', ' ', snippet)
+        text = re.sub(r'\s+', ' ', text).strip()
+        parts = text.split(' ')
+        if len(parts) > 2:
+            text = ' '.join(parts[1:-1])
+        return f"...{text}..."
+    
     def get_content_by_id(self, content_id):
         """Get content by ID"""
         try:
@@ -161,11 +513,15 @@ class Content:
         finally:
             self._close_db_connection()
     
-    def update_content(self, content_id, title, excerpt, body, category_id, featured_image=None):
-        """Update content"""
+    def update_content(self, content_id, title, excerpt, body, category_id, featured_image=None, actor_id=None):
+        """Update content (``actor_id`` is recorded in the audit log)"""
         try:
             self._get_db_connection()
             
+            old_values = self._audit_old_values(content_id)
+            if not old_values:
+                return {'success': False, 'message': 'Content not found'}
+            
             query = """
                 UPDATE contents
                 SET title = %s, excerpt = %s, body = %s, category_id = %s, featured_image = %s
@@ -177,6 +533,14 @@ class Content:
             if self.cursor.rowcount == 0:
                 return {'success': False, 'message': 'Content not found'}
             
+            content_search.content_updated(content_id, title, excerpt, body, {
+                'category_id': category_id,
+                'updated_at': datetime.now()
+            })
+            self._audit(actor_id, 'UPDATE', content_id, new_values={
+                'title': title, 'category_id': category_id
+            }, old_values=dict(old_values))
+            
             print(f"[CONTENT] Updated content ID: {content_id}")
             
             return {'success': True, 'message': 'Content updated successfully'}
@@ -188,11 +552,15 @@ class Content:
         finally:
             self._close_db_connection()
     
-    def delete_content(self, content_id):
-        """Delete content"""
+    def delete_content(self, content_id, actor_id=None):
+        """Delete content (``actor_id`` is recorded in the audit log)"""
         try:
             self._get_db_connection()
             
+            old_values = self._audit_old_values(content_id)
+            if not old_values:
+                return {'success': False, 'message': 'Content not found'}
+            
             query = "DELETE FROM contents WHERE id = %s"
             self.cursor.execute(query, (content_id,))
             self.conn.commit()
@@ -200,6 +568,9 @@ class Content:
             if self.cursor.rowcount == 0:
                 return {'success': False, 'message': 'Content not found'}
             
+            content_search.content_deleted(content_id)
+            self._audit(actor_id, 'DELETE', content_id, old_values=dict(old_values))
+            
             print(f"[CONTENT] Deleted content ID: {content_id}")
             
             return {'success': True, 'message': 'Content deleted successfully'}
@@ -246,6 +617,8 @@ class Content:
             self.cursor.execute(approval_query, (content_id, approver_id, approver_role, action, notes))
             
             self.conn.commit()
+            content_search.status_changed(content_id, new_status)
+            self._audit(approver_id, 'UPDATE', content_id, new_values={'status': new_status})
             
             print(f"[CONTENT] Status changed to '{new_status}' for content ID: {content_id}")
             
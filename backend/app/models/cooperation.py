@@ -1,5 +1,6 @@
 import MySQLdb
-from flask import current_app
+from app.utils.blob_store import get_blob_store
+from app.utils.database import get_connection, get_pool, release_connection
 
 
 class Cooperation:
@@ -11,13 +12,7 @@ class Cooperation:
 
     def _get_db_connection(self):
         try:
-            self.conn = MySQLdb.connect(
-                host=current_app.config['MYSQL_HOST'],
-                port=current_app.config['MYSQL_PORT'],
-                user=current_app.config['MYSQL_USER'],
-                password=current_app.config['MYSQL_PASSWORD'],
-                database=current_app.config['MYSQL_DB'],
-            )
+            self.conn = get_connection()
             self.cursor = self.conn.cursor(MySQLdb.cursors.DictCursor)
         except Exception as e:
             raise Exception(f"Database connection failed: {str(e)}")
@@ -25,8 +20,10 @@ class Cooperation:
     def _close_db_connection(self):
         if self.cursor:
             self.cursor.close()
+            self.cursor = None
         if self.conn:
-            self.conn.close()
+            release_connection(self.conn)
+            self.conn = None
 
     def create_cooperation(
         self,
@@ -38,18 +35,36 @@ class Cooperation:
         event_date,
         document_name,
         document_mime,
-        document_data,
         created_by,
+        document_data=None,
+        document_file=None,
     ):
-        """Create new cooperation application (status: pending)"""
+        """
+        Create new cooperation application (status: pending)
+
+        The document is either ``document_data`` (bytes) or ``document_file``
+        (a spooled upload from app.utils.uploads). It goes to the blob store
+        (deduplicated by SHA-256); the row only keeps ``document_ref`` plus
+        size and hash. The caller still owns and cleans up ``document_file``.
+        """
         try:
+            store = get_blob_store()
+            document_ref = document_size = None
+            if document_file is not None:
+                document_ref = store.put_file(document_file.path, document_file.sha256)
+                document_size = document_file.size
+            elif document_data is not None:
+                document_ref = store.put_bytes(document_data)
+                document_size = len(document_data)
+
             self._get_db_connection()
 
             query = """
                 INSERT INTO cooperations
                 (institution_name, contact_name, email, phone, purpose, event_date,
-                 document_name, document_mime, document_data, status, created_by)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, 'pending', %s)
+                 document_name, document_mime, document_size, document_sha256,
+                 document_ref, status, created_by)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 'pending', %s)
             """
             self.cursor.execute(
                 query,
@@ -62,7 +77,9 @@ class Cooperation:
                     event_date,
                     document_name,
                     document_mime,
-                    document_data,
+                    document_size,
+                    document_ref,
+                    document_ref,
                     created_by,
                 ),
             )
@@ -77,6 +94,31 @@ class Cooperation:
         finally:
             self._close_db_connection()
 
+    def get_cooperations_version(self, created_by=None, status=None):
+        """Count and newest updated_at of the matching cooperations, for conditional GETs"""
+        try:
+            self._get_db_connection()
+
+            query = "SELECT COUNT(*) as total, MAX(c.updated_at) as last_modified FROM cooperations c WHERE 1=1"
+            params = []
+
+            if created_by:
+                query += " AND c.created_by = %s"
+                params.append(created_by)
+
+            if status:
+                query += " AND c.status = %s"
+                params.append(status)
+
+            self.cursor.execute(query, params)
+            row = self.cursor.fetchone()
+
+            return {'success': True, 'total': row['total'], 'last_modified': row['last_modified']}
+        except Exception as e:
+            return {'success': False, 'message': str(e)}
+        finally:
+            self._close_db_connection()
+
     def get_cooperations(self, created_by=None, status=None):
         """Get cooperation applications (all or by creator)"""
         try:
@@ -138,11 +180,13 @@ class Cooperation:
             self._close_db_connection()
 
     def get_document_by_id(self, cooperation_id):
-        """Get cooperation document by ID"""
+        """Get cooperation document by ID (whole document in memory)"""
         try:
             self._get_db_connection()
             query = """
-                SELECT document_name, document_mime, document_data, created_by
+                SELECT document_name, document_mime, document_ref, document_size,
+                       IF(document_ref IS NULL, document_data, NULL) as document_data,
+                       created_by
                 FROM cooperations
                 WHERE id = %s
             """
@@ -150,12 +194,79 @@ class Cooperation:
             row = self.cursor.fetchone()
             if not row:
                 return {'success': False, 'message': 'Cooperation not found'}
+            if row['document_ref']:
+                row['document_data'] = get_blob_store().read(row['document_ref'], row['document_size'])
             return {'success': True, 'document': row}
         except Exception as e:
             return {'success': False, 'message': str(e)}
         finally:
             self._close_db_connection()
 
+    def get_document_meta(self, cooperation_id):
+        """
+        Get document name, type, size, hash and blob reference without reading it
+
+        Rows written before document_size/document_sha256 existed fall back
+        to computing them in MySQL.
+        """
+        try:
+            self._get_db_connection()
+            query = """
+                SELECT document_name, document_mime, document_ref, created_by,
+                       COALESCE(document_size, LENGTH(document_data)) as document_size,
+                       COALESCE(document_sha256, SHA2(document_data, 256)) as document_sha256
+                FROM cooperations
+                WHERE id = %s
+            """
+            self.cursor.execute(query, (cooperation_id,))
+            row = self.cursor.fetchone()
+            if not row:
+                return {'success': False, 'message': 'Cooperation not found'}
+            return {'success': True, 'document': row}
+        except Exception as e:
+            return {'success': False, 'message': str(e)}
+        finally:
+            self._close_db_connection()
+
+    @staticmethod
+    def iter_document_chunks(cooperation_id, start, end, chunk_size, document_ref=None):
+        """
+        Yield document bytes [start, end] (inclusive) in chunks
+
+        Documents with a ``document_ref`` are read from the blob store. Rows
+        not yet moved out by migrate_documents.py are read with
+        ``SUBSTRING(document_data, ...)``, one chunk per query, on a
+        dedicated pooled connection: the generator runs while the response
+        streams, after the request's connection has been returned.
+        """
+        if document_ref:
+            yield from get_blob_store().iter_range(document_ref, start, end, chunk_size)
+            return
+
+        pool = get_pool()
+        conn = pool.acquire()
+        cursor = None
+        try:
+            cursor = conn.cursor(MySQLdb.cursors.DictCursor)
+            position = start
+            while position <= end:
+                length = min(chunk_size, end - position + 1)
+                # SUBSTRING is 1-based
+                cursor.execute(
+                    "SELECT SUBSTRING(document_data, %s, %s) as chunk FROM cooperations WHERE id = %s",
+                    (position + 1, length, cooperation_id),
+                )
+                row = cursor.fetchone()
+                chunk = row['chunk'] if row else None
+                if not chunk:
+                    break
+                yield bytes(chunk)
+                position += len(chunk)
+        finally:
+            if cursor:
+                cursor.close()
+            pool.release(conn)
+
     def change_status(self, cooperation_id, new_status):
         """Change cooperation status"""
         try:
@@ -1,19 +1,10 @@
 import MySQLdb
 from flask import current_app
-from argon2 import PasswordHasher
-from argon2.exceptions import VerifyMismatchError
+from app.utils.database import get_connection, release_connection
+from app.utils.security import hash_password, verify_password
 import jwt
 import datetime
 
-# Initialize Argon2 password hasher
-ph = PasswordHasher(
-    time_cost=3,
-    memory_cost=65536,
-    parallelism=4,
-    hash_len=32,
-    salt_len=16
-)
-
 class User:
     """User model for authentication and user management"""
     
@@ -24,15 +15,9 @@ class User:
     def _get_db_connection(self):
         """Get database connection"""
         try:
-            self.conn = MySQLdb.connect(
-                host=current_app.config['MYSQL_HOST'],
-                port=current_app.config['MYSQL_PORT'],
-                user=current_app.config['MYSQL_USER'],
-                password=current_app.config['MYSQL_PASSWORD'],
-                database=current_app.config['MYSQL_DB']
-            )
+            self.conn = get_connection()
             self.cursor = self.conn.cursor(MySQLdb.cursors.DictCursor)
-            print(f"[DB] Connection established to {current_app.config['MYSQL_DB']}")
+            print(f"[DB] Connection acquired from pool for {current_app.config['MYSQL_DB']}")
         except Exception as e:
             print(f"[DB ERROR] Connection failed: {str(e)}")
             raise Exception(f"Database connection failed: {str(e)}")
@@ -41,9 +26,11 @@ class User:
         """Close database connection"""
         if self.cursor:
             self.cursor.close()
+            self.cursor = None
         if self.conn:
-            self.conn.close()
-        print("[DB] Connection closed")
+            release_connection(self.conn)
+            self.conn = None
+        print("[DB] Connection released to pool")
     
     def create_user(self, username, email, password, full_name, nip=None, role_id=1):
         """Create a new user"""
@@ -65,7 +52,7 @@ class User:
                 return {'success': False, 'message': 'Email already exists'}
             
             # Hash password
-            password_hash = ph.hash(password)
+            password_hash = hash_password(password)
             print(f"[CREATE USER] Password hashed successfully")
             
             # Insert user
@@ -114,12 +101,10 @@ class User:
             print(f"[AUTH] Verifying password...")
             
             # Verify password
-            try:
-                ph.verify(user['password_hash'], password)
-                print(f"[AUTH] Password verified successfully")
-            except VerifyMismatchError:
+            if not verify_password(user['password_hash'], password):
                 print(f"[AUTH] Password verification failed")
                 return {'success': False, 'message': 'Invalid username or password'}
+            print(f"[AUTH] Password verified successfully")
             
             # Update last login
             self.cursor.execute("UPDATE users SET last_login = NOW() WHERE id = %s", (user['id'],))
@@ -236,6 +221,7 @@ class User:
                 'email': str(user['email']),
                 'full_name': str(user['full_name']),
                 'nip': str(user['nip']) if user['nip'] else None,
+                'role_id': int(user['role_id']),
                 'role': str(user['role_name']),
                 'is_active': bool(user['is_active']),
                 'email_verified': bool(user['email_verified']),
@@ -0,0 +1,80 @@
+# File: backend/app/routes/audit_routes.py
+
+from datetime import datetime, timedelta
+
+from flask import Blueprint, current_app, request
+
+from app.models.audit_log import AuditLog
+from app.utils.decorators import permission_required, token_required
+from app.utils.pagination import decode_keyset_cursor
+from app.utils.response import error_response, success_response
+
+audit_bp = Blueprint('audit', __name__, url_prefix='/api/audit-logs')
+
+
+def _parse_datetime(value, end_of_day=False):
+    """Parse an ISO date or datetime; a bare date as ``to`` includes that whole day"""
+    parsed = datetime.fromisoformat(value)
+    if end_of_day and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+
+@audit_bp.route('/', methods=['GET'])
+@token_required
+@permission_required('view_audit_log')
+def get_audit_logs():
+    """
+    Get audit logs, newest first
+
+    Query Parameters:
+        - from, to: ISO date/datetime range, ``to`` exclusive
+          (default: the last AUDIT_LOG_DEFAULT_DAYS days)
+        - user_id: int (optional filter)
+        - module: string (optional filter)
+        - action: string (optional filter)
+        - per_page: int (default: 50, max: 200)
+        - cursor: next_cursor of the previous page
+    """
+    try:
+        config = current_app.config
+        per_page = request.args.get('per_page', 50, type=int)
+        if per_page < 1 or per_page > 200:
+            per_page = 50
+
+        try:
+            date_to = _parse_datetime(request.args['to'], end_of_day=True) if request.args.get('to') else datetime.now()
+            date_from = (_parse_datetime(request.args['from']) if request.args.get('from')
+                         else date_to - timedelta(days=config['AUDIT_LOG_DEFAULT_DAYS']))
+        except ValueError:
+            return error_response('from and to must be ISO dates (YYYY-MM-DD) or datetimes', 400)
+
+        if date_from >= date_to:
+            return error_response('from must be before to', 400)
+
+        # Bounded ranges keep every query to a handful of monthly partitions
+        if date_to - date_from > timedelta(days=config['AUDIT_LOG_MAX_RANGE_DAYS']):
+            return error_response(f"Time range cannot exceed {config['AUDIT_LOG_MAX_RANGE_DAYS']} days", 400)
+
+        cursor = None
+        if request.args.get('cursor'):
+            try:
+                cursor = decode_keyset_cursor(request.args['cursor'])
+            except ValueError:
+                return error_response('Invalid cursor', 400)
+
+        filters = {
+            'user_id': request.args.get('user_id', type=int),
+            'module': request.args.get('module') or None,
+            'action': request.args.get('action') or None
+        }
+
+        result = AuditLog().get_audit_logs(date_from, date_to, filters, per_page, cursor=cursor)
+
+        if result['success']:
+            return success_response('Audit logs retrieved successfully', result, 200)
+        else:
+            return error_response(result['message'], 500)
+
+    except Exception as e:
+        return error_response(f'Failed to get audit logs: {str(e)}', 500)
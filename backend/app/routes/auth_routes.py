@@ -4,84 +4,69 @@ from flask import Blueprint, request, jsonify, current_app
 from app import mysql
 from app.utils.security import (
     hash_password, verify_password, validate_password_strength,
-    generate_jwt_token, decode_jwt_token, token_required, sanitize_input
+    decode_jwt_token, token_required, sanitize_input,
+    PasswordHasherBusy, password_hasher_busy_response, schedule_password_rehash
 )
 from app.utils.validators import (
     validate_username, validate_email_format, validate_nip, 
     validate_full_name, validate_role_id
 )
-from app.utils.email_service import EmailService
+from app.utils.email_service import EmailService, email_locale
+from app.utils.audit import log_audit
+from app.utils.principal_cache import invalidate_principal
+from app.utils.rate_limit import get_rate_limiter, rate_limit
+from app.utils.revocation import revoke_token, revoke_user_tokens
+from app.utils.sessions import create_session, delete_session, delete_user_sessions, rotate_session
 import MySQLdb.cursors
 from datetime import datetime, timedelta
-import json
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
-# Rate limiting storage (simple in-memory, use Redis in production)
-login_attempts = {}
+def _login_limits():
+    config = current_app.config
+    return (
+        ('login:ip', config['RATE_LIMIT_LOGIN_IP']),
+        ('login:user', config['RATE_LIMIT_LOGIN']),
+    )
 
 
-def check_rate_limit(identifier: str) -> tuple:
+def check_rate_limit(ip_address: str, username: str):
     """
-    Check if identifier (IP or username) has exceeded rate limit
-    
+    Check the failed-login limits for a client IP and a username
+
+    Does not count as an attempt. Limits are sliding windows of
+    RATE_LIMIT_WINDOW seconds in the shared rate limit backend.
+
     Returns:
-        tuple: (is_allowed: bool, remaining_attempts: int, reset_time: datetime)
+        RateLimitResult: The stricter of the two limits
     """
-    now = datetime.now()
-    max_attempts = current_app.config['RATE_LIMIT_LOGIN']
-    window_seconds = current_app.config['RATE_LIMIT_WINDOW']
-    
-    if identifier not in login_attempts:
-        login_attempts[identifier] = {
-            'attempts': 0,
-            'reset_time': now + timedelta(seconds=window_seconds)
-        }
-    
-    attempt_data = login_attempts[identifier]
-    
-    # Reset if window has passed
-    if now > attempt_data['reset_time']:
-        login_attempts[identifier] = {
-            'attempts': 0,
-            'reset_time': now + timedelta(seconds=window_seconds)
-        }
-        attempt_data = login_attempts[identifier]
-    
-    # Check limit
-    if attempt_data['attempts'] >= max_attempts:
-        return False, 0, attempt_data['reset_time']
-    
-    remaining = max_attempts - attempt_data['attempts']
-    return True, remaining, attempt_data['reset_time']
-
+    limiter = get_rate_limiter()
+    window = current_app.config['RATE_LIMIT_WINDOW']
+    results = [
+        limiter.check(scope, identifier, limit, window)
+        for (scope, limit), identifier in zip(_login_limits(), (ip_address, username))
+    ]
+    return min(results, key=lambda result: (result.allowed, result.remaining))
 
-def record_login_attempt(identifier: str):
-    """Record a failed login attempt"""
-    if identifier in login_attempts:
-        login_attempts[identifier]['attempts'] += 1
-    else:
-        login_attempts[identifier] = {
-            'attempts': 1,
-            'reset_time': datetime.now() + timedelta(seconds=current_app.config['RATE_LIMIT_WINDOW'])
-        }
 
+def record_login_attempt(ip_address: str, username: str):
+    """
+    Record a failed login attempt against both the IP and the username
 
-def log_audit(user_id, action, module, details, ip_address, user_agent):
-    """Log activity to audit_logs table"""
-    try:
-        cursor = mysql.connection.cursor()
-        cursor.execute('''
-            INSERT INTO audit_logs (user_id, action, module, ip_address, user_agent, details)
-            VALUES (%s, %s, %s, %s, %s, %s)
-        ''', (user_id, action, module, ip_address, user_agent, json.dumps(details)))
-        mysql.connection.commit()
-        cursor.close()
-    except Exception as e:
-        print(f"Error logging audit: {str(e)}")
+    Returns:
+        RateLimitResult: The stricter of the two limits after this attempt
+    """
+    limiter = get_rate_limiter()
+    window = current_app.config['RATE_LIMIT_WINDOW']
+    results = [
+        limiter.hit(scope, identifier, limit, window)
+        for (scope, limit), identifier in zip(_login_limits(), (ip_address, username))
+    ]
+    return min(results, key=lambda result: (result.allowed, result.remaining))
 
 
 @auth_bp.route('/register', methods=['POST'])
+@rate_limit('register', 'RATE_LIMIT_REGISTER', 'RATE_LIMIT_WINDOW')
 def register():
     """
     Register new user
@@ -191,9 +176,9 @@ def register():
             request.headers.get('User-Agent', 'Unknown')
         )
         
-        # Send welcome email (async in production)
+        # Queue welcome email (delivered by the outbox workers)
         try:
-            EmailService.send_welcome_email(email, full_name, username)
+            EmailService.send_welcome_email(email, full_name, username, email_locale())
         except Exception as e:
             print(f"Failed to send welcome email: {str(e)}")
         
@@ -207,6 +192,8 @@ def register():
             }
         }), 201
         
+    except PasswordHasherBusy:
+        return password_hasher_busy_response()
     except Exception as e:
         print(f"Registration error: {str(e)}")
         return jsonify({
@@ -239,13 +226,16 @@ def login():
         
         # Check rate limit
         ip_address = request.remote_addr
-        is_allowed, remaining, reset_time = check_rate_limit(ip_address)
+        rate_limit = check_rate_limit(ip_address, identifier)
         
-        if not is_allowed:
-            return jsonify({
+        if not rate_limit.allowed:
+            reset_time = datetime.now() + timedelta(seconds=rate_limit.retry_after)
+            response = jsonify({
                 'status': 'error',
                 'message': f'Terlalu banyak percobaan login. Coba lagi pada {reset_time.strftime("%H:%M:%S")}'
-            }), 429
+            })
+            response.headers['Retry-After'] = str(rate_limit.retry_after)
+            return response, 429
         
         # Find user by username or email
         cursor = mysql.connection.cursor(MySQLdb.cursors.DictCursor)
@@ -259,51 +249,41 @@ def login():
         user = cursor.fetchone()
         
         if not user:
-            record_login_attempt(ip_address)
+            attempt = record_login_attempt(ip_address, identifier)
             cursor.close()
             return jsonify({
                 'status': 'error',
                 'message': 'Username/email atau password salah',
-                'remaining_attempts': remaining - 1
+                'remaining_attempts': attempt.remaining
             }), 401
         
         # Verify password
         is_valid = verify_password(user['password_hash'], password)
         
         if not is_valid:
-            record_login_attempt(ip_address)
+            attempt = record_login_attempt(ip_address, identifier)
             cursor.close()
             return jsonify({
                 'status': 'error',
                 'message': 'Username/email atau password salah',
-                'remaining_attempts': remaining - 1
+                'remaining_attempts': attempt.remaining
             }), 401
         
-        # Generate tokens
-        tokens = generate_jwt_token(user['id'], user['username'], user['role_name'])
+        # Stored hash uses an older Argon2 profile: upgrade it in the background
+        if is_valid == 'rehash_needed':
+            schedule_password_rehash(user['id'], user['password_hash'], password)
         
-        # Save session
+        # Generate tokens and save the session (token digests only)
         user_agent = request.headers.get('User-Agent', 'Unknown')
-        cursor.execute('''
-            INSERT INTO sessions (user_id, token, refresh_token, ip_address, user_agent, expires_at)
-            VALUES (%s, %s, %s, %s, %s, %s)
-        ''', (
-            user['id'],
-            tokens['access_token'],
-            tokens['refresh_token'],
-            ip_address,
-            user_agent,
-            datetime.now() + current_app.config['JWT_ACCESS_TOKEN_EXPIRES']
-        ))
+        tokens = create_session(cursor, user, ip_address, user_agent)
         
         # Update last login
         cursor.execute('UPDATE users SET last_login = %s WHERE id = %s', (datetime.now(), user['id']))
         mysql.connection.commit()
         cursor.close()
         
-        # Clear rate limit on successful login
-        if ip_address in login_attempts:
-            del login_attempts[ip_address]
+        # Clear the username's failed attempts (the IP limit keeps counting)
+        get_rate_limiter().reset('login:user', identifier)
         
         # Log audit
         log_audit(
@@ -315,13 +295,14 @@ def login():
             user_agent
         )
         
-        # Send login notification email (async in production)
+        # Queue login notification email (delivered by the outbox workers)
         try:
             EmailService.send_login_notification(
                 user['email'], 
                 user['full_name'],
                 ip_address,
-                user_agent
+                user_agent,
+                email_locale()
             )
         except Exception as e:
             print(f"Failed to send login notification: {str(e)}")
@@ -342,6 +323,8 @@ def login():
             }
         }), 200
         
+    except PasswordHasherBusy:
+        return password_hasher_busy_response()
     except Exception as e:
         print(f"Login error: {str(e)}")
         return jsonify({
@@ -360,11 +343,13 @@ def logout(current_user):
         
         # Delete session
         cursor = mysql.connection.cursor()
-        cursor.execute('DELETE FROM sessions WHERE user_id = %s AND token = %s', 
-                      (current_user['id'], token))
+        delete_session(cursor, current_user['id'], token)
         mysql.connection.commit()
         cursor.close()
         
+        # Reject the access token itself until it expires
+        revoke_token(decode_jwt_token(token))
+        
         # Log audit
         log_audit(
             current_user['id'],
@@ -426,16 +411,24 @@ def refresh_token():
         ''', (payload['user_id'],))
         
         user = cursor.fetchone()
-        cursor.close()
         
         if not user:
+            cursor.close()
             return jsonify({
                 'status': 'error',
                 'message': 'User tidak ditemukan'
             }), 401
         
-        # Generate new tokens
-        new_tokens = generate_jwt_token(user['id'], user['username'], user['role_name'])
+        # Generate new tokens on the session holding this refresh token
+        new_tokens = rotate_session(cursor, refresh_token, user)
+        mysql.connection.commit()
+        cursor.close()
+        
+        if new_tokens is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'Sesi tidak ditemukan atau telah berakhir'
+            }), 401
         
         return jsonify({
             'status': 'success',
@@ -538,6 +531,7 @@ def update_profile(current_user):
         
         mysql.connection.commit()
         cursor.close()
+        invalidate_principal(current_user['id'])
         
         # Log audit
         log_audit(
@@ -620,10 +614,12 @@ def change_password(current_user):
         ''', (new_password_hash, datetime.now(), current_user['id']))
         
         # Invalidate all existing sessions for security
-        cursor.execute('DELETE FROM sessions WHERE user_id = %s', (current_user['id'],))
+        delete_user_sessions(cursor, current_user['id'])
         
         mysql.connection.commit()
         cursor.close()
+        revoke_user_tokens(current_user['id'], current_app.config['JWT_ACCESS_TOKEN_EXPIRES'])
+        invalidate_principal(current_user['id'])
         
         # Log audit
         log_audit(
@@ -639,7 +635,8 @@ def change_password(current_user):
         try:
             EmailService.send_password_changed_notification(
                 current_user['email'],
-                current_user['full_name']
+                current_user['full_name'],
+                email_locale()
             )
         except Exception as e:
             print(f"Failed to send password change notification: {str(e)}")
@@ -649,6 +646,8 @@ def change_password(current_user):
             'message': 'Password berhasil diubah. Silakan login kembali.'
         }), 200
         
+    except PasswordHasherBusy:
+        return password_hasher_busy_response()
     except Exception as e:
         return jsonify({
             'status': 'error',
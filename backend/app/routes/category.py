@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app.models.category import Category
 from app.utils.decorators import token_required, permission_required
+from app.utils.conditional import is_fresh, not_modified, with_validators
 from app.utils.response import success_response, error_response
 
 category_bp = Blueprint('category', __name__)
@@ -16,7 +17,9 @@ def get_categories():
         result = category.get_all_categories(active_only=active_only)
         
         if result['success']:
-            return success_response('Categories retrieved successfully', result['categories'], 200)
+            if is_fresh(result['validators']):
+                return not_modified(result['validators'])
+            return with_validators(success_response('Categories retrieved successfully', result['categories'], 200), result['validators'])
         else:
             return error_response(result['message'], 500)
             
@@ -33,7 +36,9 @@ def get_category(category_id):
         result = category.get_category_by_id(category_id)
         
         if result['success']:
-            return success_response('Category retrieved successfully', result['category'], 200)
+            if is_fresh(result['validators']):
+                return not_modified(result['validators'])
+            return with_validators(success_response('Category retrieved successfully', result['category'], 200), result['validators'])
         else:
             return error_response(result['message'], 404)
             
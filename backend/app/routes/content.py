@@ -1,14 +1,42 @@
 from flask import Blueprint, request, jsonify
+from app.models.category import Category
 from app.models.content import Content
+from app.search.service import content_search
+from app.utils.conditional import build_validators, is_fresh, not_modified, request_params, with_validators
 from app.utils.decorators import token_required, permission_required, role_required
 from app.utils.response import success_response, error_response
+from app.utils.pagination import decode_keyset_cursor
 
 content_bp = Blueprint('content', __name__)
 
+
+def _categories_etag():
+    """Rows carry category names/icons; renaming a category must change content ETags too"""
+    result = Category().get_all_categories(active_only=False)
+    return result['validators'].etag if result['success'] else None
+
+
 @content_bp.route('/', methods=['GET'])
 @token_required
 def get_contents():
-    """Get all contents with filters"""
+    """
+    Get all contents with filters
+    
+    Pagination: either ?page=&per_page= or ?cursor=<next_cursor>&per_page=
+    for keyset paging. ?total=exact|approx|none controls the total count.
+    Search: ?search=<text>&search_mode=natural|boolean, ranked by relevance
+    (chronological when combined with a cursor), each row gets a snippet.
+    Natural searches are served by the in-process index when it is ready,
+    which also returns facet counts by category_id/status/author_id.
+    
+    Rows are the summary representation (no ``body``) unless
+    ?fields=title,status,... selects columns (see Content.LIST_FIELDS);
+    GET /<id> returns the full content.
+    
+    Conditional: answers If-None-Match/If-Modified-Since with 304 after one
+    COUNT/MAX(updated_at) query, before the rows are fetched. Searches served
+    by the index also carry its generation, since it lags other workers.
+    """
     try:
         # Get query parameters
         page = int(request.args.get('page', 1))
@@ -17,6 +45,27 @@ def get_contents():
         category_id = request.args.get('category_id')
         author_id = request.args.get('author_id')
         search = request.args.get('search')
+        search_mode = request.args.get('search_mode', 'natural')
+        cursor_token = request.args.get('cursor')
+        total_mode = request.args.get('total', 'exact')
+        
+        if search_mode not in ('natural', 'boolean'):
+            return error_response('search_mode must be one of: natural, boolean', 400)
+        
+        if total_mode not in ('exact', 'approx', 'none'):
+            return error_response('total must be one of: exact, approx, none', 400)
+        
+        try:
+            fields = Content.parse_fields(request.args.get('fields'))
+        except ValueError as e:
+            return error_response(str(e), 400)
+        
+        cursor = None
+        if cursor_token:
+            try:
+                cursor = decode_keyset_cursor(cursor_token)
+            except ValueError:
+                return error_response('Invalid cursor', 400)
         
         # Build filters
         filters = {}
@@ -28,6 +77,7 @@ def get_contents():
             filters['author_id'] = int(author_id)
         if search:
             filters['search'] = search
+            filters['search_mode'] = search_mode
         
         # Check permissions
         user = request.current_user
@@ -38,10 +88,26 @@ def get_contents():
             filters['author_id'] = user['id']
         
         content = Content()
-        result = content.get_contents(filters, page, per_page)
+        
+        # Unchanged since the client's copy: skip the row fetch entirely
+        validators = None
+        version = content.get_contents_version(filters)
+        if version['success']:
+            # Read before the rows: an index change in between leaves the ETag older, never newer
+            index_state = content_search.state()
+            validators = build_validators(
+                'contents', version['last_modified'], version['total'],
+                request_params(), user['role'], sorted(filters.items()), _categories_etag(),
+                index_state if content.uses_search_index(filters, cursor) else None
+            )
+            if is_fresh(validators):
+                return not_modified(validators)
+        
+        result = content.get_contents(filters, page, per_page, cursor=cursor, total_mode=total_mode, fields=fields)
         
         if result['success']:
-            return success_response('Contents retrieved successfully', result, 200)
+            response = success_response('Contents retrieved successfully', result, 200)
+            return with_validators(response, validators) if validators else response
         else:
             return error_response(result['message'], 500)
             
@@ -52,22 +118,36 @@ def get_contents():
 @content_bp.route('/<int:content_id>', methods=['GET'])
 @token_required
 def get_content(content_id):
-    """Get content by ID"""
+    """Get content by ID (conditional: 304 after a primary key lookup of updated_at)"""
     try:
         content_model = Content()
+        user = request.current_user
+        
+        version = content_model.get_content_version(content_id)
+        if not version['success']:
+            return error_response(version['message'], 404)
+        
+        if user['role'] == 'User' and version['author_id'] != user['id']:
+            return error_response('You do not have permission to view this content', 403)
+        
+        validators = build_validators(
+            f'content-{content_id}', version['last_modified'], None, user['role'], _categories_etag()
+        )
+        if is_fresh(validators):
+            return not_modified(validators)
+        
         result = content_model.get_content_by_id(content_id)
         
         if not result['success']:
             return error_response(result['message'], 404)
         
         content = result['content']
-        user = request.current_user
         
         # Check if user can view this content
         if user['role'] == 'User' and content['author_id'] != user['id']:
             return error_response('You do not have permission to view this content', 403)
         
-        return success_response('Content retrieved successfully', content, 200)
+        return with_validators(success_response('Content retrieved successfully', content, 200), validators)
             
     except Exception as e:
         return error_response(f'Failed to get content: {str(e)}', 500)
@@ -147,7 +227,9 @@ def update_content(content_id):
         if not excerpt:
             excerpt = body[:200] + '...' if len(body) > 200 else body
         
-        result = content_model.update_content(content_id, title, excerpt, body, category_id, featured_image)
+        result = content_model.update_content(
+            content_id, title, excerpt, body, category_id, featured_image, actor_id=user['id']
+        )
         
         if result['success']:
             return success_response('Content updated successfully', None, 200)
@@ -177,7 +259,7 @@ def delete_content(content_id):
         if content['author_id'] != user['id'] and user['role'] != 'Kasubbag Jashumas':
             return error_response('You do not have permission to delete this content', 403)
         
-        result = content_model.delete_content(content_id)
+        result = content_model.delete_content(content_id, actor_id=user['id'])
         
         if result['success']:
             return success_response('Content deleted successfully', None, 200)
@@ -1,17 +1,29 @@
 import base64
 from datetime import datetime
-from flask import Blueprint, request
+from urllib.parse import quote
+from flask import Blueprint, Response, current_app, request
 from app.models.cooperation import Cooperation
+from app.utils.conditional import build_validators, is_fresh, not_modified, request_params, with_validators
+from app.utils.database import call_after_commit
 from app.utils.decorators import token_required, permission_required
 from app.utils.response import success_response, error_response
+from app.utils.uploads import ResumableUpload, UploadError, spool_stream
 
 cooperation_bp = Blueprint('cooperation', __name__)
 
+# Allowance for multipart boundaries and text fields on top of the document
+MULTIPART_OVERHEAD = 64 * 1024
+
 
 @cooperation_bp.route('/', methods=['GET'])
 @token_required
 def get_cooperations():
-    """Get cooperation applications (own for User, all for Staff/Kasubbag)"""
+    """
+    Get cooperation applications (own for User, all for Staff/Kasubbag)
+
+    Conditional: answers If-None-Match/If-Modified-Since with 304 after one
+    COUNT/MAX(updated_at) query, before the rows are fetched.
+    """
     try:
         status = request.args.get('status')
         user = request.current_user
@@ -21,14 +33,26 @@ def get_cooperations():
             created_by = user['id']
 
         coop = Cooperation()
+
+        validators = None
+        version = coop.get_cooperations_version(created_by=created_by, status=status)
+        if version['success']:
+            validators = build_validators(
+                'cooperations', version['last_modified'], version['total'],
+                request_params(), user['role'], created_by
+            )
+            if is_fresh(validators):
+                return not_modified(validators)
+
         result = coop.get_cooperations(created_by=created_by, status=status)
 
         if result['success']:
-            return success_response(
+            response = success_response(
                 'Cooperations retrieved successfully',
                 result['cooperations'],
                 200,
             )
+            return with_validators(response, validators) if validators else response
         return error_response(result['message'], 500)
     except Exception as e:
         return error_response(f'Failed to get cooperations: {str(e)}', 500)
@@ -38,9 +62,29 @@ def get_cooperations():
 @token_required
 @permission_required('submit_coop')
 def create_cooperation():
-    """Create new cooperation application"""
+    """
+    Create new cooperation application
+
+    The document can be sent as:
+    - multipart/form-data with the fields and a ``document`` file part,
+    - JSON with ``upload_id`` of a completed resumable upload (see /uploads),
+    - JSON with ``document_base64`` (legacy, whole file in the body).
+    Multipart and resumable documents are spooled to disk and copied to the
+    blob store in chunks.
+    """
+    document_file = None
+    spooled = False
     try:
-        data = request.get_json()
+        is_multipart = request.mimetype == 'multipart/form-data'
+        if is_multipart:
+            # Refuse oversized bodies before the form parser reads them
+            limit = current_app.config['DOCUMENT_MAX_SIZE'] + MULTIPART_OVERHEAD
+            if request.content_length is None or request.content_length > limit:
+                return error_response('Request body is too large or has no Content-Length', 413)
+            data = request.form
+        else:
+            data = request.get_json() or {}
+
         required_fields = [
             'institution_name',
             'contact_name',
@@ -48,8 +92,6 @@ def create_cooperation():
             'phone',
             'purpose',
             'event_date',
-            'document_name',
-            'document_base64',
         ]
         for field in required_fields:
             if field not in data or not data[field]:
@@ -60,10 +102,30 @@ def create_cooperation():
         except ValueError:
             return error_response('event_date must be YYYY-MM-DD', 400)
 
-        try:
-            document_data = base64.b64decode(data['document_base64'])
-        except Exception:
-            return error_response('document_base64 is invalid', 400)
+        document_data = None
+        if is_multipart:
+            upload = request.files.get('document')
+            if not upload or not upload.filename:
+                return error_response('document is required', 400)
+            document_mime = data.get('document_mime') or upload.mimetype
+            document_file = spool_stream(upload.stream, upload.filename, document_mime)
+            spooled = True
+            document_name = (data.get('document_name') or upload.filename).strip()
+        elif data.get('upload_id'):
+            upload = ResumableUpload.load(data['upload_id'], request.current_user['id'])
+            document_file = upload.finish()
+            document_mime = document_file.mime
+            document_name = (data.get('document_name') or document_file.filename).strip()
+        else:
+            for field in ['document_name', 'document_base64']:
+                if field not in data or not data[field]:
+                    return error_response(f'{field} is required', 400)
+            try:
+                document_data = base64.b64decode(data['document_base64'])
+            except Exception:
+                return error_response('document_base64 is invalid', 400)
+            document_mime = data.get('document_mime')
+            document_name = data['document_name'].strip()
 
         coop = Cooperation()
         result = coop.create_cooperation(
@@ -73,21 +135,147 @@ def create_cooperation():
             phone=data['phone'].strip(),
             purpose=data['purpose'].strip(),
             event_date=event_date,
-            document_name=data['document_name'].strip(),
-            document_mime=data.get('document_mime'),
+            document_name=document_name,
+            document_mime=document_mime,
             document_data=document_data,
+            document_file=document_file,
             created_by=request.current_user['id'],
         )
 
         if result['success']:
+            if document_file is not None and not spooled:
+                # Keep a resumable upload until the row is committed so it can be retried
+                call_after_commit(document_file.cleanup)
             return success_response(
                 'Cooperation created successfully',
                 {'cooperation_id': result['cooperation_id']},
                 201,
             )
         return error_response(result['message'], 400)
+    except UploadError as e:
+        return error_response(e.message, e.status_code)
     except Exception as e:
         return error_response(f'Failed to create cooperation: {str(e)}', 500)
+    finally:
+        if spooled:
+            document_file.cleanup()
+
+
+@cooperation_bp.route('/uploads', methods=['POST'])
+@token_required
+@permission_required('submit_coop')
+def start_document_upload():
+    """
+    Start a resumable document upload
+
+    Body: {"document_name", "document_mime", "size"}. Size and type are
+    checked here, before any bytes are sent.
+    """
+    try:
+        data = request.get_json() or {}
+        for field in ['document_name', 'document_mime', 'size']:
+            if field not in data or not data[field]:
+                return error_response(f'{field} is required', 400)
+
+        upload = ResumableUpload.create(
+            request.current_user['id'],
+            data['document_name'].strip(),
+            data['document_mime'],
+            data['size'],
+        )
+        return success_response(
+            'Upload started',
+            {
+                'upload_id': upload.upload_id,
+                'offset': 0,
+                'size': upload.meta['size'],
+                'chunk_size': current_app.config['UPLOAD_CHUNK_SIZE'],
+            },
+            201,
+        )
+    except UploadError as e:
+        return error_response(e.message, e.status_code)
+    except Exception as e:
+        return error_response(f'Failed to start upload: {str(e)}', 500)
+
+
+@cooperation_bp.route('/uploads/<upload_id>', methods=['GET'])
+@token_required
+@permission_required('submit_coop')
+def get_document_upload(upload_id):
+    """Get the current offset of a resumable upload (to resume after a failure)"""
+    try:
+        upload = ResumableUpload.load(upload_id, request.current_user['id'])
+        return success_response(
+            'Upload status retrieved',
+            {
+                'upload_id': upload_id,
+                'offset': upload.offset,
+                'size': upload.meta['size'],
+                'complete': upload.complete,
+            },
+            200,
+        )
+    except UploadError as e:
+        return error_response(e.message, e.status_code)
+    except Exception as e:
+        return error_response(f'Failed to get upload: {str(e)}', 500)
+
+
+@cooperation_bp.route('/uploads/<upload_id>', methods=['PUT'])
+@token_required
+@permission_required('submit_coop')
+def append_document_upload(upload_id):
+    """
+    Append a chunk to a resumable upload
+
+    The raw request body is the chunk; the ``Upload-Offset`` header must be
+    the current offset (409 otherwise, with the expected offset).
+    """
+    try:
+        upload = ResumableUpload.load(upload_id, request.current_user['id'])
+
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+        except ValueError:
+            return error_response('Upload-Offset header is required', 400)
+
+        remaining = upload.meta['size'] - offset
+        if request.content_length is not None and request.content_length > remaining:
+            return error_response('Chunk exceeds the declared document size', 413)
+
+        new_offset = upload.append(request.stream, offset)
+        return success_response(
+            'Chunk received',
+            {
+                'upload_id': upload_id,
+                'offset': new_offset,
+                'size': upload.meta['size'],
+                'complete': new_offset == upload.meta['size'],
+            },
+            200,
+        )
+    except UploadError as e:
+        if e.status_code == 409:
+            return error_response(e.message, 409, {'offset': upload.offset})
+        return error_response(e.message, e.status_code)
+    except Exception as e:
+        return error_response(f'Failed to upload chunk: {str(e)}', 500)
+
+
+@cooperation_bp.route('/uploads/<upload_id>', methods=['DELETE'])
+@token_required
+@permission_required('submit_coop')
+def cancel_document_upload(upload_id):
+    """Cancel a resumable upload and delete its data"""
+    try:
+        upload = ResumableUpload.load(upload_id, request.current_user['id'])
+        upload.discard()
+        return success_response('Upload cancelled', None, 200)
+    except UploadError as e:
+        return error_response(e.message, e.status_code)
+    except Exception as e:
+        return error_response(f'Failed to cancel upload: {str(e)}', 500)
 
 
 @cooperation_bp.route('/<int:cooperation_id>/verify', methods=['POST'])
@@ -195,3 +383,77 @@ def get_cooperation_document(cooperation_id):
         )
     except Exception as e:
         return error_response(f'Failed to get document: {str(e)}', 500)
+
+
+@cooperation_bp.route('/<int:cooperation_id>/document/download', methods=['GET'])
+@token_required
+def download_cooperation_document(cooperation_id):
+    """
+    Stream cooperation document as binary
+
+    Supports ETag/If-None-Match (304) and single-range requests
+    (Range/If-Range, 206/416). The blob is read in chunks while the
+    response is sent, so memory use does not grow with the file size.
+    """
+    try:
+        user = request.current_user
+
+        coop = Cooperation()
+        result = coop.get_document_meta(cooperation_id)
+        if not result['success']:
+            return error_response(result['message'], 404)
+
+        doc = result['document']
+
+        # Access control: staff/kasubbag or owner
+        if user['role'] not in ['Staff Jashumas', 'Kasubbag Jashumas'] and user['id'] != doc['created_by']:
+            return error_response('You do not have permission to view this document', 403)
+
+        size = doc['document_size']
+        if size is None:
+            return error_response('Document not found', 404)
+        size = int(size)
+        etag = doc['document_sha256']
+
+        headers = {
+            'Accept-Ranges': 'bytes',
+            'ETag': f'"{etag}"',
+            'Cache-Control': 'private, no-cache',
+        }
+
+        if request.if_none_match.contains(etag):
+            return Response(status=304, headers=headers)
+
+        status = 200
+        start, end = 0, size - 1
+        range_header = request.range
+        if_range = request.if_range
+        range_applies = range_header is not None and (not if_range or if_range.etag == etag)
+        if range_applies and range_header.units == 'bytes':
+            span = range_header.range_for_length(size)
+            if span is None:
+                if len(range_header.ranges) == 1:
+                    headers['Content-Range'] = f'bytes */{size}'
+                    return Response(status=416, headers=headers)
+                # Multiple ranges are not supported: send the whole document
+            else:
+                start, end = span[0], span[1] - 1
+                status = 206
+                headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+
+        headers['Content-Length'] = str(end - start + 1 if size else 0)
+        headers['Content-Disposition'] = f"attachment; filename*=UTF-8''{quote(doc['document_name'])}"
+
+        chunk_size = current_app.config['DOCUMENT_STREAM_CHUNK_SIZE']
+        body = coop.iter_document_chunks(
+            cooperation_id, start, end, chunk_size, document_ref=doc['document_ref']
+        ) if size else []
+        return Response(
+            body,
+            status=status,
+            headers=headers,
+            mimetype=doc.get('document_mime') or 'application/octet-stream',
+            direct_passthrough=True,
+        )
+    except Exception as e:
+        return error_response(f'Failed to download document: {str(e)}', 500)
@@ -1,35 +1,25 @@
 # File: backend/app/routes/user_routes.py
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from app import mysql
 from app.utils.security import (
-    hash_password, token_required, role_required, sanitize_input
+    hash_password, token_required, role_required, sanitize_input,
+    PasswordHasherBusy, password_hasher_busy_response
 )
 from app.utils.validators import (
     validate_username, validate_email_format, validate_nip, 
     validate_full_name, validate_role_id
 )
+from app.utils.audit import log_audit
+from app.utils.principal_cache import invalidate_principal
+from app.utils.revocation import revoke_user_tokens
+from app.utils.sessions import delete_user_sessions
 from datetime import datetime
 import MySQLdb.cursors
-import json
 
 user_bp = Blueprint('user', __name__, url_prefix='/api/users')
 
 
-def log_audit(user_id, action, module, details, ip_address, user_agent):
-    """Log activity to audit_logs table"""
-    try:
-        cursor = mysql.connection.cursor()
-        cursor.execute('''
-            INSERT INTO audit_logs (user_id, action, module, ip_address, user_agent, details)
-            VALUES (%s, %s, %s, %s, %s, %s)
-        ''', (user_id, action, module, ip_address, user_agent, json.dumps(details)))
-        mysql.connection.commit()
-        cursor.close()
-    except Exception as e:
-        print(f"Error logging audit: {str(e)}")
-
-
 @user_bp.route('/', methods=['GET'])
 @token_required
 @role_required(['Staff Jashumas', 'Kasubbag Jashumas'])
@@ -311,6 +301,8 @@ def create_user(current_user):
             }
         }), 201
         
+    except PasswordHasherBusy:
+        return password_hasher_busy_response()
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -383,6 +375,7 @@ def update_user(current_user, user_id):
         
         mysql.connection.commit()
         cursor.close()
+        invalidate_principal(user_id)
         
         # Log audit
         log_audit(
@@ -428,10 +421,14 @@ def delete_user(current_user, user_id):
             return jsonify({'status': 'error', 'message': 'User tidak ditemukan'}), 404
         
         # Soft delete (set is_active to FALSE) or hard delete
-        # Using hard delete here, but soft delete is recommended
+        # Using hard delete here, but soft delete is recommended.
+        # audit_logs is partitioned and has no FK to users, so detach its
+        # rows here (the old ON DELETE SET NULL) in the same transaction.
+        cursor.execute('UPDATE audit_logs SET user_id = NULL WHERE user_id = %s', (user_id,))
         cursor.execute('DELETE FROM users WHERE id = %s', (user_id,))
         mysql.connection.commit()
         cursor.close()
+        invalidate_principal(user_id)
         
         # Log audit
         log_audit(
@@ -481,10 +478,12 @@ def reset_user_password(current_user, user_id):
         ''', (password_hash, datetime.now(), user_id))
         
         # Invalidate all sessions
-        cursor.execute('DELETE FROM sessions WHERE user_id = %s', (user_id,))
+        delete_user_sessions(cursor, user_id)
         
         mysql.connection.commit()
         cursor.close()
+        revoke_user_tokens(user_id, current_app.config['JWT_ACCESS_TOKEN_EXPIRES'])
+        invalidate_principal(user_id)
         
         # Log audit
         log_audit(
@@ -505,6 +504,8 @@ def reset_user_password(current_user, user_id):
             }
         }), 200
         
+    except PasswordHasherBusy:
+        return password_hasher_busy_response()
     except Exception as e:
         return jsonify({
             'status': 'error',
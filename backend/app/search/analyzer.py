@@ -0,0 +1,116 @@
+# File: backend/app/search/analyzer.py
+
+import re
+
+# Common Indonesian (plus a few English) function words that carry no
+# meaning for ranking
+STOPWORDS = frozenset([
+    'ada', 'adalah', 'agar', 'akan', 'aku', 'anda', 'antara', 'apa', 'atas',
+    'atau', 'bagi', 'bahwa', 'banyak', 'belum', 'berbagai', 'bisa', 'dalam',
+    'dan', 'dapat', 'dari', 'dengan', 'di', 'dia', 'hanya', 'harus', 'ia',
+    'ini', 'itu', 'jika', 'juga', 'kali', 'kami', 'karena', 'ke', 'kepada',
+    'kita', 'lagi', 'lain', 'lebih', 'maka', 'masih', 'mereka', 'namun',
+    'oleh', 'pada', 'para', 'saat', 'saja', 'sangat', 'saya', 'se', 'sebagai',
+    'secara', 'sedang', 'sehingga', 'sejak', 'serta', 'setelah', 'sudah',
+    'tanpa', 'telah', 'tentang', 'tersebut', 'tetapi', 'tidak', 'untuk',
+    'yaitu', 'yakni', 'yang',
+    'a', 'an', 'and', 'are', 'as', 'for', 'in', 'is', 'of', 'on', 'or', 'the',
+    'to', 'with',
+])
+
+PARTICLES = ('kah', 'lah', 'tah', 'pun')
+POSSESSIVES = ('nya', 'ku', 'mu')
+DERIVATION_SUFFIXES = ('kan', 'an', 'i')
+VOWELS = 'aeiou'
+MIN_STEM = 3
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_TOKEN_RE = re.compile(r'[0-9a-z]+')
+
+
+def _strip_suffix(word, suffixes):
+    for suffix in suffixes:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM + 1:
+            return word[:-len(suffix)], True
+    return word, False
+
+
+def _strip_prefix(word):
+    """Remove one derivational prefix, restoring the melted initial consonant"""
+    if len(word) < MIN_STEM + 2:
+        return word, False
+
+    for prefix in ('di', 'ke', 'se'):
+        if word.startswith(prefix) and len(word) - len(prefix) >= MIN_STEM:
+            return word[len(prefix):], True
+
+    for prefix in ('ber', 'ter', 'per'):
+        if word.startswith(prefix) and len(word) - len(prefix) >= MIN_STEM + 1:
+            return word[len(prefix):], True
+    if word.startswith('bel') and word[3:].startswith('ajar'):
+        return word[3:], True
+
+    for head in ('me', 'pe'):
+        if not word.startswith(head):
+            continue
+        rest = word[2:]
+        if rest.startswith('ng') and len(rest) > 2:
+            # meng-ambil -> ambil, meng-gali -> gali
+            return rest[2:], True
+        if rest.startswith('ny') and len(rest) > 2 and rest[2] in VOWELS:
+            # meny-apu -> sapu
+            return 's' + rest[2:], True
+        if rest.startswith('m') and len(rest) > 1:
+            if rest[1] in 'bpf':
+                return rest[1:], True
+            if rest[1] in VOWELS:
+                # mem-ukul -> pukul
+                return 'p' + rest[1:], True
+        if rest.startswith('n') and len(rest) > 1:
+            if rest[1] in 'cdjtsz':
+                return rest[1:], True
+            if rest[1] in VOWELS:
+                # men-ulis -> tulis
+                return 't' + rest[1:], True
+        if rest[:1] in ('l', 'r', 'w', 'y') and len(rest) >= MIN_STEM:
+            return rest, True
+    return word, False
+
+
+def stem(word):
+    """
+    Light Indonesian stemmer (dictionary-less Nazief-Adriani/ECS variant)
+
+    Strips particles (-lah, -kah, -pun), possessives (-nya, -ku, -mu),
+    derivational suffixes (-kan, -an, -i) and up to two prefixes (di-, ke-,
+    se-, ber-, ter-, per-, me(N)-, pe(N)-). It over-stems occasionally, but
+    it is deterministic, so indexing and querying always agree.
+    """
+    if len(word) <= MIN_STEM + 1 or not word.isalpha():
+        return word
+
+    word, _ = _strip_suffix(word, PARTICLES)
+    word, _ = _strip_suffix(word, POSSESSIVES)
+
+    stemmed, changed = _strip_prefix(word)
+    if changed:
+        stemmed, _ = _strip_prefix(stemmed)
+        stemmed, _ = _strip_suffix(stemmed, DERIVATION_SUFFIXES)
+        return stemmed
+
+    if len(word) >= 7:
+        # Without a prefix, a trailing -i is usually part of the root
+        word, _ = _strip_suffix(word, ('kan', 'an'))
+    return word
+
+
+def normalize(text):
+    """Lowercase, drop HTML tags and split into raw word tokens"""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(_TAG_RE.sub(' ', text).lower())
+
+
+def analyze(text):
+    """Tokenize, drop stopwords and stem; used for both documents and queries"""
+    return [stem(token) for token in normalize(text) if token not in STOPWORDS]
@@ -0,0 +1,243 @@
+# File: backend/app/search/index.py
+
+import bisect
+import math
+import threading
+from collections import Counter
+
+from app.search.analyzer import STOPWORDS, normalize, stem
+
+# Field weights: a title hit counts three times a body hit
+FIELD_WEIGHTS = (('title', 3), ('excerpt', 2), ('body', 1))
+FACET_FIELDS = ('category_id', 'status', 'author_id')
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+PREFIX_EXPANSIONS = 30
+PREFIX_WEIGHT = 0.7
+TYPO_WEIGHT = 0.5
+
+
+def edit_distance_within(a, b, limit):
+    """Levenshtein distance between a and b, or limit + 1 once it exceeds limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, cb in enumerate(b, 1):
+            cost = previous[j - 1] + (ca != cb)
+            value = min(previous[j] + 1, current[j - 1] + 1, cost)
+            current.append(value)
+            row_min = min(row_min, value)
+        if row_min > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class InvertedIndex:
+    """
+    In-memory inverted index over contents with BM25 ranking
+
+    Postings map each (stemmed) term to ``{doc_id: weighted term frequency}``.
+    ``surfaces`` maps every indexed word as written to its stem, so prefix
+    and typo matching work on what users type rather than on stems.
+    Each document also keeps its facet metadata (category_id, status,
+    author_id) and ``updated_at`` so searches can filter and count facets
+    without touching MySQL. All public methods are thread-safe.
+    """
+
+    def __init__(self):
+        self.postings = {}      # term -> {doc_id: tf}
+        self.surfaces = {}      # word as written -> term
+        self.docs = {}          # doc_id -> {'length', 'category_id', 'status', 'author_id', 'updated_at'}
+        self.total_length = 0
+        self.watermark = None   # newest updated_at indexed from the database
+        self._doc_terms = {}    # doc_id -> tuple of terms, for removal
+        self._sorted_words = []
+        self._terms_dirty = False
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.docs)
+
+    def add_document(self, doc_id, title, excerpt, body, meta):
+        """Index (or re-index) a document"""
+        counts = Counter()
+        words = {}
+        for field, weight in FIELD_WEIGHTS:
+            text = {'title': title, 'excerpt': excerpt, 'body': body}[field]
+            for token in normalize(text):
+                if token in STOPWORDS:
+                    continue
+                term = words.get(token) or stem(token)
+                words[token] = term
+                counts[term] += weight
+
+        with self._lock:
+            self._remove(doc_id)
+            for token, term in words.items():
+                if self.surfaces.get(token) != term:
+                    self.surfaces[token] = term
+                    self._terms_dirty = True
+            for term, tf in counts.items():
+                postings = self.postings.get(term)
+                if postings is None:
+                    postings = self.postings[term] = {}
+                    self._terms_dirty = True
+                postings[doc_id] = tf
+            length = sum(counts.values())
+            self.docs[doc_id] = dict(meta, length=length)
+            self._doc_terms[doc_id] = tuple(counts)
+            self.total_length += length
+
+    def update_document(self, doc_id, title, excerpt, body, meta):
+        """
+        Re-index the text of a document, keeping metadata not given in ``meta``
+
+        Returns:
+            bool: False if the document is not indexed yet
+        """
+        with self._lock:
+            current = self.docs.get(doc_id)
+            if current is None:
+                return False
+            merged = {field: current.get(field) for field in FACET_FIELDS + ('updated_at',)}
+            merged.update(meta)
+        self.add_document(doc_id, title, excerpt, body, merged)
+        return True
+
+    def update_meta(self, doc_id, **meta):
+        """Change facet metadata (e.g. status) without re-tokenizing"""
+        with self._lock:
+            doc = self.docs.get(doc_id)
+            if doc is None:
+                return False
+            doc.update(meta)
+            return True
+
+    def remove_document(self, doc_id):
+        with self._lock:
+            self._remove(doc_id)
+
+    def doc_ids(self):
+        with self._lock:
+            return set(self.docs)
+
+    def search(self, query, filters=None, offset=0, limit=10):
+        """
+        Rank documents for a free-text query
+
+        Every query term matches exactly; the last term also matches as a
+        prefix (search-as-you-type), and terms missing from the vocabulary
+        match vocabulary terms within a small edit distance.
+
+        Args:
+            query (str): User query
+            filters (dict): Optional category_id / status / author_id equality filters
+            offset (int): Number of ranked results to skip
+            limit (int): Page size
+
+        Returns:
+            dict: {'ids': [...], 'total': int, 'facets': {field: {value: count}}}
+        """
+        raw_tokens = normalize(query)
+        filters = {key: value for key, value in (filters or {}).items() if value is not None}
+
+        with self._lock:
+            expansions = self._expand(raw_tokens)
+            scores = {}
+            n_docs = len(self.docs) or 1
+            avg_length = (self.total_length / n_docs) or 1.0
+
+            for term, weight in expansions.items():
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    doc = self.docs[doc_id]
+                    if filters and any(doc.get(key) != value for key, value in filters.items()):
+                        continue
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * doc['length'] / avg_length)
+                    score = weight * idf * tf * (BM25_K1 + 1) / (tf + norm)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + score
+
+            facets = {field: {} for field in FACET_FIELDS}
+            for doc_id in scores:
+                doc = self.docs[doc_id]
+                for field in FACET_FIELDS:
+                    value = doc.get(field)
+                    facets[field][value] = facets[field].get(value, 0) + 1
+
+        ranked = sorted(scores, key=lambda doc_id: (-scores[doc_id], -doc_id))
+        return {
+            'ids': ranked[offset:offset + limit],
+            'total': len(ranked),
+            'facets': facets,
+        }
+
+    def _expand(self, raw_tokens):
+        """Map query tokens to index terms with a weight per term"""
+        weights = {}
+
+        def add(term, weight):
+            if weight > weights.get(term, 0):
+                weights[term] = weight
+
+        words = self._vocabulary()
+        for position, token in enumerate(raw_tokens):
+            is_last = position == len(raw_tokens) - 1
+            if token in STOPWORDS and not is_last:
+                continue
+            term = stem(token)
+            if term in self.postings:
+                add(term, 1.0)
+            elif len(token) >= 4:
+                limit = 2 if len(token) >= 8 else 1
+                for word in self._near(words, token, limit):
+                    add(self.surfaces[word], TYPO_WEIGHT)
+            if is_last and len(token) >= 2:
+                start = bisect.bisect_left(words, token)
+                for word in words[start:start + PREFIX_EXPANSIONS]:
+                    if not word.startswith(token):
+                        break
+                    add(self.surfaces[word], PREFIX_WEIGHT)
+        return weights
+
+    @staticmethod
+    def _near(words, token, limit):
+        # Only consider words sharing the first letter; typos rarely hit it
+        start = bisect.bisect_left(words, token[0])
+        end = bisect.bisect_left(words, chr(ord(token[0]) + 1))
+        return [
+            word for word in words[start:end]
+            if edit_distance_within(token, word, limit) <= limit
+        ]
+
+    def _vocabulary(self):
+        # Caller holds the lock; drops words whose term is no longer indexed
+        if self._terms_dirty:
+            self.surfaces = {
+                word: term for word, term in self.surfaces.items() if term in self.postings
+            }
+            self._sorted_words = sorted(self.surfaces)
+            self._terms_dirty = False
+        return self._sorted_words
+
+    def _remove(self, doc_id):
+        # Caller holds the lock
+        doc = self.docs.pop(doc_id, None)
+        if doc is None:
+            return
+        self.total_length -= doc['length']
+        for term in self._doc_terms.pop(doc_id, ()):
+            postings = self.postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self.postings[term]
+                self._terms_dirty = True
@@ -0,0 +1,194 @@
+# File: backend/app/search/segment.py
+
+import os
+import tempfile
+import zlib
+from datetime import datetime, timedelta
+
+from app.search.index import InvertedIndex
+
+MAGIC = b'HSIX\x01'
+STATUSES = ('draft', 'pending', 'approved', 'published', 'rejected')
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _write_varint(out, value):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+class _Reader:
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+
+    def varint(self):
+        result = 0
+        shift = 0
+        while True:
+            byte = self.data[self.pos]
+            self.pos += 1
+            result |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return result
+            shift += 7
+
+    def text(self):
+        length = self.varint()
+        value = self.data[self.pos:self.pos + length].decode('utf-8')
+        self.pos += length
+        return value
+
+
+def _optional(value):
+    # 0 encodes None, anything else is shifted by one
+    return 0 if value is None else int(value) + 1
+
+
+def _from_optional(value):
+    return None if value == 0 else value - 1
+
+
+def _timestamp(value):
+    return 0 if value is None else int((value - _EPOCH).total_seconds()) + 1
+
+
+def _from_timestamp(value):
+    return None if value == 0 else _EPOCH + timedelta(seconds=value - 1)
+
+
+def save_segment(index, path):
+    """
+    Persist an index as a compact segment file
+
+    Layout (zlib-compressed after the magic header), all integers varints:
+    watermark, doc count, then per doc (ascending id) the id delta,
+    category, status, author, updated_at and length; then term count and
+    per term (sorted) its UTF-8 text, posting count and (doc id delta, tf)
+    pairs; then surface word count and per word its text and term number.
+    The file is written to a temp file and atomically renamed.
+    """
+    out = bytearray()
+    with index._lock:
+        _write_varint(out, _timestamp(index.watermark))
+
+        doc_ids = sorted(index.docs)
+        _write_varint(out, len(doc_ids))
+        previous = 0
+        for doc_id in doc_ids:
+            doc = index.docs[doc_id]
+            status = doc.get('status')
+            _write_varint(out, doc_id - previous)
+            _write_varint(out, _optional(doc.get('category_id')))
+            _write_varint(out, _optional(STATUSES.index(status) if status in STATUSES else None))
+            _write_varint(out, _optional(doc.get('author_id')))
+            _write_varint(out, _timestamp(doc.get('updated_at')))
+            _write_varint(out, doc['length'])
+            previous = doc_id
+
+        terms = sorted(index.postings)
+        _write_varint(out, len(terms))
+        for term in terms:
+            encoded = term.encode('utf-8')
+            _write_varint(out, len(encoded))
+            out.extend(encoded)
+            postings = index.postings[term]
+            _write_varint(out, len(postings))
+            previous = 0
+            for doc_id in sorted(postings):
+                _write_varint(out, doc_id - previous)
+                _write_varint(out, postings[doc_id])
+                previous = doc_id
+
+        term_numbers = {term: number for number, term in enumerate(terms)}
+        surfaces = [
+            (word, term_numbers[term]) for word, term in sorted(index.surfaces.items())
+            if term in term_numbers
+        ]
+        _write_varint(out, len(surfaces))
+        for word, number in surfaces:
+            encoded = word.encode('utf-8')
+            _write_varint(out, len(encoded))
+            out.extend(encoded)
+            _write_varint(out, number)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory or '.', prefix='.segment-')
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(MAGIC)
+            handle.write(zlib.compress(bytes(out), 6))
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_segment(path):
+    """
+    Load an index from a segment file written by :func:`save_segment`
+
+    Returns:
+        InvertedIndex or None: None if the file is missing or unreadable
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as handle:
+            data = handle.read()
+        if not data.startswith(MAGIC):
+            return None
+        reader = _Reader(zlib.decompress(data[len(MAGIC):]))
+
+        index = InvertedIndex()
+        index.watermark = _from_timestamp(reader.varint())
+
+        doc_id = 0
+        for _ in range(reader.varint()):
+            doc_id += reader.varint()
+            category_id = _from_optional(reader.varint())
+            status = _from_optional(reader.varint())
+            author_id = _from_optional(reader.varint())
+            updated_at = _from_timestamp(reader.varint())
+            length = reader.varint()
+            index.docs[doc_id] = {
+                'category_id': category_id,
+                'status': STATUSES[status] if status is not None else None,
+                'author_id': author_id,
+                'updated_at': updated_at,
+                'length': length,
+            }
+            index.total_length += length
+
+        doc_terms = {}
+        terms = []
+        for _ in range(reader.varint()):
+            term = reader.text()
+            terms.append(term)
+            postings = {}
+            doc_id = 0
+            for _ in range(reader.varint()):
+                doc_id += reader.varint()
+                postings[doc_id] = reader.varint()
+                doc_terms.setdefault(doc_id, []).append(term)
+            index.postings[term] = postings
+
+        for _ in range(reader.varint()):
+            word = reader.text()
+            index.surfaces[word] = terms[reader.varint()]
+
+        index._doc_terms = {doc_id: tuple(terms) for doc_id, terms in doc_terms.items()}
+        index._terms_dirty = True
+        return index
+    except (OSError, IndexError, ValueError, zlib.error) as e:
+        print(f"[SEARCH] Could not load segment {path}: {str(e)}")
+        return None
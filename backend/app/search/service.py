@@ -0,0 +1,223 @@
+# File: backend/app/search/service.py
+
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+
+import MySQLdb.cursors
+
+from app.search.index import InvertedIndex
+from app.search.segment import load_segment, save_segment
+from app.utils.database import call_after_commit, get_pool
+
+
+class ContentSearchService:
+    """
+    Owns the process-wide content index and keeps it in sync with MySQL
+
+    A single background thread:
+    1. loads the segment file (if any) and catches up from ``contents`` by
+       ``updated_at`` — a full bulk scan the first time,
+    2. applies incremental updates queued by the Content model after each
+       commit,
+    3. every ``refresh_interval`` seconds catches up again (picking up
+       writes made by other worker processes and removing deleted rows) and
+       rewrites the segment file if anything changed.
+
+    ``updated_at`` is stamped when a statement runs, not when its
+    transaction commits, so a row can become visible with an older
+    ``updated_at`` than the watermark. Each catch-up therefore re-reads the
+    last ``refresh_overlap`` seconds before the watermark; rows whose
+    ``updated_at`` is already indexed are skipped.
+
+    Searches are served from memory once the initial build is done; until
+    then callers fall back to MySQL. ``generation`` goes up whenever the
+    index changes, so responses built from it can be revalidated.
+    """
+
+    def __init__(self):
+        self.index = InvertedIndex()
+        self.ready = False
+        self.generation = 0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._dirty = False
+        self._path = None
+        self._refresh_interval = 60
+        self._refresh_overlap = 30
+        self._batch_size = 200
+
+    def start(self, app):
+        """Start the indexing thread (idempotent)"""
+        if self._thread is not None:
+            return
+        self._path = app.config['SEARCH_INDEX_PATH'] or os.path.join(
+            app.instance_path, 'search', 'contents.seg'
+        )
+        self._refresh_interval = app.config['SEARCH_INDEX_REFRESH_INTERVAL']
+        self._refresh_overlap = app.config['SEARCH_INDEX_REFRESH_OVERLAP']
+        self._batch_size = app.config['SEARCH_INDEX_BATCH_SIZE']
+        self._thread = threading.Thread(target=self._run, name='content-search-index', daemon=True)
+        self._thread.start()
+
+    def search(self, query, filters=None, offset=0, limit=10):
+        return self.index.search(query, filters, offset, limit)
+
+    def state(self):
+        """(ready, generation): changes whenever search results may have changed"""
+        return self.ready, self.generation
+
+    # Incremental updates (queued, applied by the indexing thread)
+
+    def content_saved(self, content_id, title, excerpt, body, meta):
+        self._enqueue(('upsert', content_id, title, excerpt, body, meta))
+
+    def content_updated(self, content_id, title, excerpt, body, meta):
+        self._enqueue(('update', content_id, title, excerpt, body, meta))
+
+    def status_changed(self, content_id, status):
+        self._enqueue(('meta', content_id, {'status': status, 'updated_at': datetime.now()}))
+
+    def content_deleted(self, content_id):
+        self._enqueue(('delete', content_id))
+
+    def _enqueue(self, op):
+        if self._thread is None:
+            return
+        call_after_commit(lambda: self._queue.put(op))
+
+    # Indexing thread
+
+    def _run(self):
+        loaded = load_segment(self._path)
+        if loaded is not None:
+            self.index = loaded
+            print(f"[SEARCH] Loaded {len(loaded)} documents from {self._path}")
+
+        while not self.ready:
+            try:
+                self._refresh()
+                self.ready = True
+                self.generation += 1
+                self._save()
+                print(f"[SEARCH] Index ready with {len(self.index)} documents")
+            except Exception as e:
+                print(f"[SEARCH ERROR] Initial build failed: {str(e)}")
+                time.sleep(self._refresh_interval)
+
+        next_refresh = time.monotonic() + self._refresh_interval
+        while True:
+            timeout = max(0.0, next_refresh - time.monotonic())
+            try:
+                op = self._queue.get(timeout=timeout)
+                self._apply(op)
+                continue
+            except queue.Empty:
+                pass
+            except Exception as e:
+                print(f"[SEARCH ERROR] Incremental update failed: {str(e)}")
+                continue
+
+            try:
+                self._refresh()
+                self._save()
+            except Exception as e:
+                print(f"[SEARCH ERROR] Refresh failed: {str(e)}")
+            next_refresh = time.monotonic() + self._refresh_interval
+
+    def _apply(self, op):
+        kind = op[0]
+        if kind == 'upsert':
+            _, content_id, title, excerpt, body, meta = op
+            self.index.add_document(content_id, title, excerpt, body, meta)
+        elif kind == 'update':
+            _, content_id, title, excerpt, body, meta = op
+            # Unknown documents are picked up by the next refresh instead
+            self.index.update_document(content_id, title, excerpt, body, meta)
+        elif kind == 'meta':
+            _, content_id, meta = op
+            self.index.update_meta(content_id, **meta)
+        elif kind == 'delete':
+            self.index.remove_document(op[1])
+        self._dirty = True
+        self.generation += 1
+
+    def _refresh(self):
+        """Re-index rows changed since the watermark and drop deleted rows"""
+        pool = get_pool()
+        conn = pool.acquire()
+        try:
+            cursor = conn.cursor(MySQLdb.cursors.DictCursor)
+            watermark = self.index.watermark
+            last_key = None
+            if watermark is not None:
+                # Late commits below the watermark
+                last_key = (watermark - timedelta(seconds=self._refresh_overlap), 0)
+            newest = watermark
+            changed = 0
+
+            while True:
+                query = """
+                    SELECT id, title, excerpt, body, category_id, author_id, status, updated_at
+                    FROM contents
+                """
+                params = []
+                if last_key is not None:
+                    query += " WHERE updated_at > %s OR (updated_at = %s AND id > %s)"
+                    params = [last_key[0], last_key[0], last_key[1]]
+                query += " ORDER BY updated_at, id LIMIT %s"
+                params.append(self._batch_size)
+
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
+                for row in rows:
+                    indexed = self.index.docs.get(row['id'])
+                    if indexed is not None and indexed.get('updated_at') == row['updated_at']:
+                        continue
+                    changed += 1
+                    self.index.add_document(
+                        row['id'], row['title'], row['excerpt'], row['body'],
+                        {
+                            'category_id': row['category_id'],
+                            'author_id': row['author_id'],
+                            'status': row['status'],
+                            'updated_at': row['updated_at'],
+                        }
+                    )
+                if rows:
+                    last_key = (rows[-1]['updated_at'], rows[-1]['id'])
+                    if newest is None or rows[-1]['updated_at'] > newest:
+                        newest = rows[-1]['updated_at']
+                if len(rows) < self._batch_size:
+                    break
+
+            cursor.execute("SELECT id FROM contents")
+            existing = {row['id'] for row in cursor.fetchall()}
+            removed = self.index.doc_ids() - existing
+            for content_id in removed:
+                self.index.remove_document(content_id)
+            cursor.close()
+        finally:
+            pool.release(conn)
+
+        self.index.watermark = newest
+        if changed or removed:
+            self._dirty = True
+            self.generation += 1
+
+    def _save(self):
+        if not self._dirty:
+            return
+        save_segment(self.index, self._path)
+        self._dirty = False
+
+
+content_search = ContentSearchService()
+
+
+def init_search(app):
+    """Start the content search index if enabled in the configuration"""
+    if app.config['SEARCH_INDEX_ENABLED']:
+        content_search.start(app)
@@ -0,0 +1,201 @@
+# File: backend/app/utils/audit.py
+
+import atexit
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from flask import has_request_context, request
+
+from app.utils.database import get_pool
+
+
+class AuditWriter:
+    """
+    Buffered, batched writer for ``audit_logs``
+
+    ``log`` only appends a row to an in-memory buffer; a background thread
+    writes the buffer with one multi-row INSERT every ``flush_interval``
+    seconds or as soon as ``flush_events`` rows are waiting. Each row keeps
+    the time it was logged, not the time it was flushed.
+
+    Backpressure: when ``capacity`` rows are already waiting (e.g. MySQL is
+    down), ``log`` waits up to ``block_timeout`` seconds for the flusher to
+    make room, then drops the row and counts it. Rows of a failed flush are
+    put back and retried. Pending rows are flushed at interpreter exit.
+    """
+
+    INSERT_SQL = """
+        INSERT INTO audit_logs
+        (user_id, action, module, table_name, record_id, ip_address, user_agent,
+         details, old_values, new_values, timestamp)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """
+
+    def __init__(self, capacity=10000, flush_events=200, flush_interval=0.2, block_timeout=0.05):
+        self.capacity = capacity
+        self.flush_events = flush_events
+        self.flush_interval = flush_interval
+        self.block_timeout = block_timeout
+
+        self._buffer = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._stopping = False
+        self._counters = {'logged': 0, 'written': 0, 'dropped': 0, 'flushes': 0, 'failures': 0}
+
+    def configure(self, capacity, flush_events, flush_interval, block_timeout):
+        self.capacity = capacity
+        self.flush_events = flush_events
+        self.flush_interval = flush_interval
+        self.block_timeout = block_timeout
+
+    def start(self):
+        """Start the flusher thread and register the exit flush (idempotent)"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def log(self, user_id, action, module, details=None, ip_address=None, user_agent=None,
+            table_name=None, record_id=None, old_values=None, new_values=None):
+        """
+        Queue one audit row; never touches the database
+
+        Returns:
+            bool: False if the row was dropped because the buffer stayed full
+        """
+        row = (
+            user_id, action, module, table_name, record_id, ip_address, user_agent,
+            _to_json(details), _to_json(old_values), _to_json(new_values), datetime.now(),
+        )
+        with self._cond:
+            if len(self._buffer) >= self.capacity:
+                self._cond.notify_all()
+                deadline = time.monotonic() + self.block_timeout
+                while len(self._buffer) >= self.capacity:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._counters['dropped'] += 1
+                        print(f"[AUDIT] Buffer full, dropped {action} for user {user_id}")
+                        return False
+                    self._cond.wait(remaining)
+            self._buffer.append(row)
+            self._counters['logged'] += 1
+            if len(self._buffer) >= self.flush_events:
+                self._cond.notify_all()
+        return True
+
+    def flush(self):
+        """Write everything buffered so far (called by the flusher and at exit)"""
+        with self._flush_lock:
+            while True:
+                with self._cond:
+                    if not self._buffer:
+                        return True
+                    batch = [self._buffer.popleft() for _ in range(min(len(self._buffer), self.flush_events))]
+                    # Producers blocked on a full buffer can continue
+                    self._cond.notify_all()
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    print(f"[AUDIT ERROR] Flush of {len(batch)} rows failed: {str(e)}")
+                    with self._cond:
+                        self._counters['failures'] += 1
+                        # Put the batch back in front, keeping order, as far as capacity allows
+                        room = max(self.capacity - len(self._buffer), 0)
+                        kept = batch[:room]
+                        self._buffer.extendleft(reversed(kept))
+                        self._counters['dropped'] += len(batch) - len(kept)
+                    return False
+                with self._cond:
+                    self._counters['written'] += len(batch)
+                    self._counters['flushes'] += 1
+
+    def _write(self, batch):
+        pool = get_pool()
+        conn = pool.acquire()
+        try:
+            cursor = conn.cursor()
+            cursor.executemany(self.INSERT_SQL, batch)
+            conn.commit()
+            cursor.close()
+        except Exception:
+            pool.release(conn, discard=True)
+            raise
+        pool.release(conn)
+
+    def _run(self):
+        backoff = self.flush_interval
+        retry_at = 0.0
+        while True:
+            with self._cond:
+                while not self._stopping:
+                    now = time.monotonic()
+                    if now < retry_at:
+                        # Last flush failed: wait out the backoff even if producers notify
+                        self._cond.wait(retry_at - now)
+                        continue
+                    if len(self._buffer) < self.flush_events:
+                        self._cond.wait(self.flush_interval)
+                    break
+                if self._stopping:
+                    return
+            if self.flush():
+                backoff = self.flush_interval
+                retry_at = 0.0
+            else:
+                backoff = min(backoff * 2, 30)
+                retry_at = time.monotonic() + backoff
+
+    def shutdown(self):
+        """Stop the flusher and write any pending rows"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self.flush()
+
+    def stats(self):
+        with self._cond:
+            return dict(self._counters, pending=len(self._buffer), capacity=self.capacity)
+
+
+def _to_json(value):
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, default=str)
+
+
+audit_writer = AuditWriter()
+
+
+def log_audit(user_id, action, module, details, ip_address=None, user_agent=None, **extra):
+    """
+    Record an audit event (buffered, written in the background)
+
+    ``ip_address``/``user_agent`` default to the current request's. Extra
+    keyword arguments (table_name, record_id, old_values, new_values) are
+    stored in the matching columns.
+    """
+    if has_request_context():
+        if ip_address is None:
+            ip_address = request.remote_addr
+        if user_agent is None:
+            user_agent = request.headers.get('User-Agent', 'Unknown')
+    return audit_writer.log(user_id, action, module, details, ip_address, user_agent, **extra)
+
+
+def init_audit(app):
+    """Configure the audit writer from the app config and start its flusher"""
+    config = app.config
+    audit_writer.configure(
+        capacity=config['AUDIT_BUFFER_SIZE'],
+        flush_events=config['AUDIT_FLUSH_EVENTS'],
+        flush_interval=config['AUDIT_FLUSH_INTERVAL_MS'] / 1000.0,
+        block_timeout=config['AUDIT_BLOCK_TIMEOUT_MS'] / 1000.0,
+    )
+    audit_writer.start()
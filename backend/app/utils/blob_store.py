@@ -0,0 +1,206 @@
+# File: backend/app/utils/blob_store.py
+
+import hashlib
+import os
+from abc import ABC, abstractmethod
+import re
+import tempfile
+import threading
+
+from flask import current_app
+
+try:
+    import boto3
+except ImportError:  # S3 support is optional
+    boto3 = None
+
+_REF_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+class BlobNotFoundError(Exception):
+    """Raised when a blob reference does not exist in the store"""
+
+
+class BlobStore(ABC):
+    """
+    Content-addressed blob storage
+
+    A blob's reference is the hex SHA-256 of its bytes, so storing the same
+    document twice keeps a single copy. Implementations provide ``exists``,
+    ``_put_file`` and ``iter_range``.
+    """
+
+    @abstractmethod
+    def exists(self, ref):
+        """True if a blob with this reference is stored"""
+
+    @abstractmethod
+    def _put_file(self, ref, path):
+        """Store the file at ``path`` under ``ref``"""
+
+    @abstractmethod
+    def iter_range(self, ref, start, end, chunk_size):
+        """Yield bytes [start, end] (inclusive) of a blob in chunks"""
+
+    def put_file(self, path, sha256):
+        """
+        Store a file whose SHA-256 is already known (e.g. a spooled upload)
+
+        Returns:
+            str: Blob reference
+        """
+        if not _REF_RE.match(sha256):
+            raise ValueError('Invalid SHA-256')
+        if not self.exists(sha256):
+            self._put_file(sha256, path)
+        return sha256
+
+    def put_bytes(self, data):
+        """Store an in-memory document; returns its reference"""
+        sha256 = hashlib.sha256(data).hexdigest()
+        if self.exists(sha256):
+            return sha256
+        fd, path = tempfile.mkstemp(prefix='blob-')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                handle.write(data)
+            self._put_file(sha256, path)
+        finally:
+            os.remove(path)
+        return sha256
+
+    def read(self, ref, size):
+        """Read a whole blob into memory (only for the legacy base64 endpoint)"""
+        if size == 0:
+            return b''
+        return b''.join(self.iter_range(ref, 0, size - 1, 1024 * 1024))
+
+
+class LocalBlobStore(BlobStore):
+    """
+    Blobs on the local filesystem under ``root/ab/cd/<sha256>``
+
+    Two levels of sharding keep directories small. Files are written to a
+    temporary name and renamed, so readers never see partial blobs.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, ref):
+        if not _REF_RE.match(ref):
+            raise BlobNotFoundError(ref)
+        return os.path.join(self.root, ref[:2], ref[2:4], ref)
+
+    def exists(self, ref):
+        return os.path.exists(self._path(ref))
+
+    def _put_file(self, ref, path):
+        target = self._path(ref)
+        directory = os.path.dirname(target)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as out, open(path, 'rb') as source:
+                for chunk in iter(lambda: source.read(1024 * 1024), b''):
+                    out.write(chunk)
+            os.replace(tmp_path, target)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def iter_range(self, ref, start, end, chunk_size):
+        try:
+            handle = open(self._path(ref), 'rb')
+        except FileNotFoundError:
+            raise BlobNotFoundError(ref)
+        with handle:
+            handle.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = handle.read(min(chunk_size, remaining))
+                if not chunk:
+                    return
+                remaining -= len(chunk)
+                yield chunk
+
+
+class S3BlobStore(BlobStore):
+    """Blobs in an S3-compatible bucket under ``<prefix><ab>/<cd>/<sha256>`` (needs boto3)"""
+
+    def __init__(self, bucket, prefix='', endpoint_url=None, region=None,
+                 access_key=None, secret_key=None):
+        if boto3 is None:
+            raise RuntimeError('boto3 is required for BLOB_STORE_BACKEND=s3')
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client(
+            's3',
+            endpoint_url=endpoint_url or None,
+            region_name=region or None,
+            aws_access_key_id=access_key or None,
+            aws_secret_access_key=secret_key or None,
+        )
+
+    def _key(self, ref):
+        if not _REF_RE.match(ref):
+            raise BlobNotFoundError(ref)
+        return f'{self.prefix}{ref[:2]}/{ref[2:4]}/{ref}'
+
+    def exists(self, ref):
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(ref))
+            return True
+        except self.client.exceptions.ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+
+    def _put_file(self, ref, path):
+        self.client.upload_file(path, self.bucket, self._key(ref))
+
+    def iter_range(self, ref, start, end, chunk_size):
+        try:
+            response = self.client.get_object(
+                Bucket=self.bucket, Key=self._key(ref), Range=f'bytes={start}-{end}'
+            )
+        except self.client.exceptions.NoSuchKey:
+            raise BlobNotFoundError(ref)
+        body = response['Body']
+        try:
+            for chunk in body.iter_chunks(chunk_size):
+                yield chunk
+        finally:
+            body.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def create_blob_store(config, instance_path):
+    """Build the blob store selected by BLOB_STORE_BACKEND (local or s3)"""
+    backend = config['BLOB_STORE_BACKEND']
+    if backend == 'local':
+        return LocalBlobStore(config['BLOB_STORE_PATH'] or os.path.join(instance_path, 'blobs'))
+    if backend == 's3':
+        return S3BlobStore(
+            bucket=config['BLOB_STORE_S3_BUCKET'],
+            prefix=config['BLOB_STORE_S3_PREFIX'],
+            endpoint_url=config['BLOB_STORE_S3_ENDPOINT'],
+            region=config['BLOB_STORE_S3_REGION'],
+            access_key=config['BLOB_STORE_S3_ACCESS_KEY'],
+            secret_key=config['BLOB_STORE_S3_SECRET_KEY'],
+        )
+    raise ValueError(f'Unknown BLOB_STORE_BACKEND: {backend}')
+
+
+def get_blob_store():
+    """Return the process-wide blob store for ``current_app``"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = create_blob_store(current_app.config, current_app.instance_path)
+    return _store
@@ -0,0 +1,135 @@
+# File: backend/app/utils/category_cache.py
+
+import hashlib
+import threading
+import time
+
+from flask import current_app
+
+from app.utils.conditional import build_validators
+from app.utils.database import call_after_commit
+
+
+def _digest(value):
+    return hashlib.sha1(repr(value).encode('utf-8')).hexdigest()[:16]
+
+
+class CategorySnapshot:
+    """
+    One immutable load of ``content_categories``
+
+    Holds every row (active or not) in name order, the active subset, a
+    by-id index, and validators computed once from the row contents, so
+    every worker holding the same data hands out the same ETags.
+    Rows are shared between requests and must not be modified.
+    """
+
+    def __init__(self, rows, version, ttl):
+        self.version = version
+        self.expires_at = time.monotonic() + ttl
+        self.all = rows
+        self.active = [row for row in rows if row['is_active']]
+        self.by_id = {row['id']: row for row in rows}
+
+        row_digests = {row['id']: _digest(sorted(row.items())) for row in rows}
+        self.row_validators = {
+            row['id']: build_validators(f"cat-{row['id']}", row['updated_at'], None, row_digests[row['id']])
+            for row in rows
+        }
+        table_digest = _digest([row_digests[row['id']] for row in rows])
+        self.list_validators = {
+            active_only: build_validators(
+                'cats-active' if active_only else 'cats-all',
+                max((row['updated_at'] for row in view if row['updated_at']), default=None),
+                len(view),
+                table_digest
+            )
+            for active_only, view in ((True, self.active), (False, self.all))
+        }
+
+
+class CategoryCache:
+    """
+    Versioned read-through cache for categories
+
+    The whole table is loaded at once (it holds a handful of rows) and
+    served from memory until ``ttl`` seconds pass or a write in this
+    process invalidates it. Each invalidation bumps ``version``; a load
+    that started before the bump is not stored, so a slow read racing a
+    write can never re-install stale rows. Writes in other processes are
+    picked up when the TTL runs out.
+    """
+
+    def __init__(self):
+        self._snapshot = None
+        self._version = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+
+    def get(self, loader, ttl):
+        """
+        Return the current snapshot, calling ``loader()`` for the rows on miss
+
+        Args:
+            loader (callable): Returns every category row ordered by name
+            ttl (int): Seconds a snapshot may be served
+
+        Returns:
+            CategorySnapshot
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() < snapshot.expires_at:
+            self.hits += 1
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and time.monotonic() < snapshot.expires_at:
+                self.hits += 1
+                return snapshot
+            version = self._version
+
+        # Load outside the lock; concurrent misses each load once at worst
+        snapshot = CategorySnapshot(list(loader()), version, ttl)
+        with self._lock:
+            self.loads += 1
+            if version == self._version:
+                self._snapshot = snapshot
+        return snapshot
+
+    def invalidate(self):
+        with self._lock:
+            self._version += 1
+            self._snapshot = None
+
+    def stats(self):
+        snapshot = self._snapshot
+        lookups = self.hits + self.loads
+        return {
+            'cached': snapshot is not None,
+            'categories': len(snapshot.all) if snapshot else 0,
+            'version': self._version,
+            'hits': self.hits,
+            'loads': self.loads,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+category_cache = CategoryCache()
+
+
+def get_category_snapshot(loader):
+    """Cached categories, loaded with ``loader`` when stale"""
+    return category_cache.get(loader, current_app.config['CATEGORY_CACHE_TTL'])
+
+
+def invalidate_categories():
+    """
+    Drop cached categories now and again once the current change commits
+
+    The second invalidation discards anything a concurrent request loaded
+    from the database before the transaction became visible.
+    """
+    category_cache.invalidate()
+    call_after_commit(category_cache.invalidate)
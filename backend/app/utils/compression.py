@@ -0,0 +1,265 @@
+# File: backend/app/utils/compression.py
+
+import threading
+import zlib
+from collections import OrderedDict
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+}
+
+# Server preference when the client accepts several encodings equally
+PREFERENCE = ('zstd', 'br', 'gzip')
+
+
+class _GzipEncoder:
+    def __init__(self, level):
+        self.level = level
+
+    def compress(self, data):
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+
+    def stream(self):
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        return compressor.compress, compressor.flush
+
+
+class _BrotliEncoder:
+    def __init__(self, level):
+        self.level = level
+
+    def compress(self, data):
+        return brotli.compress(data, quality=self.level)
+
+    def stream(self):
+        compressor = brotli.Compressor(quality=self.level)
+        return compressor.process, compressor.finish
+
+
+class _ZstdEncoder:
+    def __init__(self, level):
+        self.compressor = zstandard.ZstdCompressor(level=level)
+
+    def compress(self, data):
+        return self.compressor.compress(data)
+
+    def stream(self):
+        compressor = self.compressor.compressobj()
+        return compressor.compress, compressor.flush
+
+
+class CompressedBodyCache:
+    """
+    Small LRU of compressed bodies keyed by (URL, ETag, encoding)
+
+    Responses carrying an ETag are usually identical for everyone who gets
+    that ETag at that URL, so the compressed bytes can be reused instead of
+    compressing the same list again for every client that polls it. Each
+    entry also records the CRC-32 of the uncompressed body (far cheaper
+    than compressing it), so an ETag that did not change with the body
+    (e.g. two edits within one second of updated_at) never serves stale
+    bytes. Bounded by total size, not entry count.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, checksum):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != checksum:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, checksum, body):
+        if len(body) > self.max_bytes // 4:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[1])
+            self._entries[key] = (checksum, body)
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted[1])
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class ResponseCompressor:
+    """
+    Negotiated gzip/brotli/zstd compression of responses
+
+    brotli and zstd are used when their packages are installed; gzip
+    always works. Bodies below ``min_size`` and types that do not shrink
+    (images, PDFs, archives) are left alone, as are ranged responses,
+    whose byte offsets refer to the uncompressed body. Streamed responses
+    are compressed chunk by chunk as they are sent.
+    """
+
+    def __init__(self):
+        self.min_size = 1024
+        self.encoders = {}
+        self.cache = CompressedBodyCache(16 * 1024 * 1024)
+        self._counters = {'compressed': 0, 'streamed': 0, 'bytes_in': 0, 'bytes_out': 0}
+        self._lock = threading.Lock()
+
+    def configure(self, config):
+        self.min_size = config['COMPRESS_MIN_SIZE']
+        self.cache = CompressedBodyCache(config['COMPRESS_CACHE_BYTES'])
+        self.encoders = {'gzip': _GzipEncoder(config['COMPRESS_GZIP_LEVEL'])}
+        if brotli is not None:
+            self.encoders['br'] = _BrotliEncoder(config['COMPRESS_BROTLI_LEVEL'])
+        if zstandard is not None:
+            self.encoders['zstd'] = _ZstdEncoder(config['COMPRESS_ZSTD_LEVEL'])
+
+    def negotiate(self, accept_encodings):
+        """Best encoding the client accepts (highest q, then server preference), or None"""
+        best, best_quality = None, 0
+        for encoding in PREFERENCE:
+            if encoding not in self.encoders:
+                continue
+            quality = accept_encodings[encoding]
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def _compressible(self, response):
+        if response.status_code < 200 or response.status_code in (204, 206, 304):
+            return False
+        if 'Content-Encoding' in response.headers or 'Content-Range' in response.headers:
+            return False
+        if response.headers.get('Accept-Ranges') == 'bytes':
+            # Range requests address the identity body (document downloads)
+            return False
+        mimetype = response.mimetype or ''
+        return mimetype.startswith('text/') or mimetype in COMPRESSIBLE_MIMETYPES
+
+    def process(self, response):
+        if request.method == 'HEAD' or not self._compressible(response):
+            return response
+        response.vary.add('Accept-Encoding')
+
+        encoding = self.negotiate(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            return self._compress_stream(response, encoding)
+
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+
+        etag, _ = response.get_etag()
+        body = None
+        if etag:
+            key = (request.full_path, etag, encoding)
+            checksum = (zlib.crc32(data), len(data))
+            body = self.cache.get(key, checksum)
+        if body is None:
+            body = self.encoders[encoding].compress(data)
+            if etag:
+                self.cache.put(key, checksum, body)
+        if len(body) >= len(data):
+            return response
+
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        if etag:
+            # The body differs from the identity encoding; weak keeps If-None-Match working
+            response.set_etag(etag, weak=True)
+        with self._lock:
+            self._counters['compressed'] += 1
+            self._counters['bytes_in'] += len(data)
+            self._counters['bytes_out'] += len(body)
+        return response
+
+    def _compress_stream(self, response, encoding):
+        compress, finish = self.encoders[encoding].stream()
+        chunks = response.response
+
+        def generate():
+            try:
+                for chunk in chunks:
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode('utf-8')
+                    out = compress(chunk)
+                    if out:
+                        yield out
+                yield finish()
+            finally:
+                close = getattr(chunks, 'close', None)
+                if close is not None:
+                    close()
+
+        response.response = generate()
+        response.headers['Content-Encoding'] = encoding
+        response.headers.pop('Content-Length', None)
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        with self._lock:
+            self._counters['streamed'] += 1
+        return response
+
+    def stats(self):
+        with self._lock:
+            data = dict(self._counters)
+        data['ratio'] = round(data['bytes_out'] / data['bytes_in'], 4) if data['bytes_in'] else None
+        data['encodings'] = [encoding for encoding in PREFERENCE if encoding in self.encoders]
+        data['min_size'] = self.min_size
+        data['cache'] = self.cache.stats()
+        return data
+
+
+response_compressor = ResponseCompressor()
+
+
+def init_compression(app):
+    """
+    Compress responses after every other after_request hook has run
+
+    Must be called before hooks that may replace the response (e.g.
+    init_request_session), since Flask runs after_request hooks in reverse
+    registration order.
+    """
+    response_compressor.configure(app.config)
+    if app.config['COMPRESS_ENABLED']:
+        app.after_request(response_compressor.process)
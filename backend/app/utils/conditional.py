@@ -0,0 +1,67 @@
+# File: backend/app/utils/conditional.py
+
+import hashlib
+from collections import namedtuple
+from datetime import timezone
+
+from flask import request
+
+from app.utils.response import not_modified_response, with_etag
+
+Validators = namedtuple('Validators', ['etag', 'last_modified'])
+
+
+def build_validators(prefix, last_modified, count=None, *parts):
+    """
+    Validators for a representation from cheap facts about its rows
+
+    The weak ETag is a digest of ``(last_modified, count, *parts)``:
+    ``last_modified`` is max(updated_at) over the rows, ``count`` catches
+    deletions (which leave max(updated_at) unchanged) and ``parts`` are
+    whatever else shapes the body (filter params, the caller's role).
+    Naive ``last_modified`` values are taken as UTC, like the JSON
+    provider's HTTP dates.
+
+    Args:
+        prefix (str): Readable ETag prefix, e.g. ``'contents'``
+        last_modified (datetime): Newest updated_at, or None for no rows
+
+    Returns:
+        Validators: (etag, last_modified)
+    """
+    if last_modified is not None and last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    if last_modified is not None:
+        last_modified = last_modified.replace(microsecond=0)
+    digest = hashlib.sha1(repr((last_modified, count, parts)).encode('utf-8')).hexdigest()[:20]
+    return Validators(f'{prefix}-{digest}', last_modified)
+
+
+def request_params():
+    """The query string as a canonical tuple, for ETag parts"""
+    return tuple(sorted(request.args.items(multi=True)))
+
+
+def is_fresh(validators):
+    """
+    True when the client's copy (If-None-Match / If-Modified-Since) is current
+
+    If-None-Match wins when both are sent (RFC 9110 13.2.2). If-Modified-Since
+    alone has one-second resolution and cannot see deletions, so clients
+    should prefer the ETag.
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(validators.etag)
+    if request.if_modified_since and validators.last_modified is not None:
+        return validators.last_modified <= request.if_modified_since
+    return False
+
+
+def not_modified(validators):
+    """304 carrying the validators"""
+    return not_modified_response(validators.etag, validators.last_modified)
+
+
+def with_validators(response, validators):
+    """Attach ETag/Last-Modified to a (response, status) pair"""
+    return with_etag(response, validators.etag, validators.last_modified)
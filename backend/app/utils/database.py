@@ -0,0 +1,448 @@
+# File: backend/app/utils/database.py
+
+import os
+import threading
+import time
+from collections import deque
+
+import MySQLdb
+from MySQLdb import cursors
+from flask import current_app, g, has_request_context, jsonify
+from flask_mysqldb import MySQL
+
+
+class PoolExhaustedError(Exception):
+    """Raised when no pooled connection becomes available within the checkout timeout"""
+
+
+class ConnectionPool:
+    """
+    Process-wide, thread-safe pool of MySQLdb connections
+
+    - Bounded: at most ``max_size`` connections exist at once, callers wait
+      up to ``checkout_timeout`` seconds for one to be released.
+    - Health check on checkout: connections idle for longer than
+      ``ping_interval`` seconds are pinged before being handed out.
+    - Max lifetime: connections older than ``max_lifetime`` seconds are
+      closed instead of being reused.
+    - Idle reaping: connections unused for ``idle_timeout`` seconds are
+      closed whenever the pool is touched.
+    """
+
+    def __init__(self, connect_kwargs, max_size=10, max_lifetime=1800,
+                 idle_timeout=300, checkout_timeout=10, ping_interval=30):
+        self._connect_kwargs = dict(connect_kwargs)
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.ping_interval = ping_interval
+
+        self._cond = threading.Condition()
+        self._idle = deque()        # (conn, created_at, last_used), most recently used on the right
+        self._in_use = {}           # id(conn) -> created_at
+        self._size = 0
+        self._pid = os.getpid()
+        self._counters = {
+            'created': 0,
+            'reused': 0,
+            'discarded': 0,
+            'reaped': 0,
+            'waits': 0,
+            'timeouts': 0,
+        }
+
+    def acquire(self):
+        """
+        Check a connection out of the pool
+
+        Returns:
+            MySQLdb connection with no open transaction
+
+        Raises:
+            PoolExhaustedError: If the pool stayed full for ``checkout_timeout`` seconds
+        """
+        deadline = time.monotonic() + self.checkout_timeout
+        entry = None
+
+        with self._cond:
+            self._check_fork()
+            stale = self._reap_idle()
+            while True:
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters['timeouts'] += 1
+                    raise PoolExhaustedError(
+                        f"No database connection available after {self.checkout_timeout}s "
+                        f"(pool size {self.max_size})"
+                    )
+                self._counters['waits'] += 1
+                self._cond.wait(remaining)
+
+        self._close_all(stale)
+
+        conn = None
+        created_at = None
+        if entry is not None:
+            conn, created_at, last_used = entry
+            now = time.monotonic()
+            if now - created_at > self.max_lifetime:
+                self._close_quietly(conn)
+                conn = None
+            elif now - last_used > self.ping_interval and not self._ping(conn):
+                self._close_quietly(conn)
+                conn = None
+            if conn is None:
+                with self._cond:
+                    self._counters['discarded'] += 1
+
+        if conn is None:
+            try:
+                conn = MySQLdb.connect(**self._connect_kwargs)
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            created_at = time.monotonic()
+            with self._cond:
+                self._counters['created'] += 1
+        else:
+            with self._cond:
+                self._counters['reused'] += 1
+
+        with self._cond:
+            self._in_use[id(conn)] = created_at
+        return conn
+
+    def release(self, conn, discard=False):
+        """
+        Return a connection to the pool
+
+        Any transaction left open is rolled back so the next borrower starts
+        from a clean snapshot.
+
+        Args:
+            conn: Connection previously returned by :meth:`acquire`
+            discard (bool): Close the connection instead of keeping it
+        """
+        if conn is None:
+            return
+
+        if not discard:
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            self._check_fork()
+            created_at = self._in_use.pop(id(conn), None)
+            if created_at is None:
+                # Borrowed before a fork, or not ours at all
+                discard = True
+            elif time.monotonic() - created_at > self.max_lifetime:
+                discard = True
+
+            if discard:
+                if created_at is not None:
+                    self._size -= 1
+                self._counters['discarded'] += 1
+            else:
+                self._idle.append((conn, created_at, time.monotonic()))
+            self._cond.notify()
+
+        if discard:
+            self._close_quietly(conn)
+
+    def reap(self):
+        """Close connections that have been idle for longer than ``idle_timeout``"""
+        with self._cond:
+            stale = self._reap_idle()
+        self._close_all(stale)
+        return len(stale)
+
+    def close_all(self):
+        """Close every idle connection (checked-out connections are closed on release)"""
+        with self._cond:
+            stale = [entry[0] for entry in self._idle]
+            self._idle.clear()
+            self._size -= len(stale)
+            self._cond.notify_all()
+        self._close_all(stale)
+
+    def stats(self):
+        """Snapshot of pool occupancy and lifetime counters"""
+        with self._cond:
+            data = {
+                'max_size': self.max_size,
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': len(self._in_use),
+            }
+            data.update(self._counters)
+        return data
+
+    def _reap_idle(self):
+        # Caller holds the lock; the oldest idle connections sit on the left
+        stale = []
+        cutoff = time.monotonic() - self.idle_timeout
+        while self._idle and self._idle[0][2] < cutoff:
+            stale.append(self._idle.popleft()[0])
+        if stale:
+            self._size -= len(stale)
+            self._counters['reaped'] += len(stale)
+            self._cond.notify_all()
+        return stale
+
+    def _check_fork(self):
+        # Sockets inherited from a parent process must not be shared; forget
+        # them without closing so the parent's sessions stay intact.
+        pid = os.getpid()
+        if pid != self._pid:
+            self._pid = pid
+            self._idle.clear()
+            self._in_use.clear()
+            self._size = 0
+
+    @staticmethod
+    def _ping(conn):
+        try:
+            conn.ping()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _close_all(self, conns):
+        for conn in conns:
+            self._close_quietly(conn)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def connection_kwargs(config):
+    """Build MySQLdb.connect() keyword arguments from a Flask config mapping"""
+    kwargs = {
+        'host': config['MYSQL_HOST'],
+        'port': config['MYSQL_PORT'],
+        'user': config['MYSQL_USER'],
+        'password': config['MYSQL_PASSWORD'],
+        'database': config['MYSQL_DB'],
+        'connect_timeout': config.get('MYSQL_CONNECT_TIMEOUT', 10),
+    }
+    if config.get('MYSQL_CHARSET'):
+        kwargs['charset'] = config['MYSQL_CHARSET']
+    if config.get('MYSQL_CURSORCLASS'):
+        kwargs['cursorclass'] = getattr(cursors, config['MYSQL_CURSORCLASS'])
+    return kwargs
+
+
+def init_pool(app):
+    """Create the process-wide connection pool from the app configuration"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            config = app.config
+            _pool = ConnectionPool(
+                connection_kwargs(config),
+                max_size=config['DB_POOL_SIZE'],
+                max_lifetime=config['DB_POOL_MAX_LIFETIME'],
+                idle_timeout=config['DB_POOL_IDLE_TIMEOUT'],
+                checkout_timeout=config['DB_POOL_TIMEOUT'],
+                ping_interval=config['DB_POOL_PING_INTERVAL'],
+            )
+    return _pool
+
+
+def get_pool():
+    """Return the shared pool, creating it from ``current_app`` if needed"""
+    if _pool is None:
+        return init_pool(current_app)
+    return _pool
+
+
+class SessionConnection:
+    """
+    Connection proxy handed out inside a request-scoped session
+
+    ``commit()`` and ``close()`` are deferred to the end of the request so
+    every model method and decorator shares one transaction. ``rollback()``
+    rolls back immediately and marks the session as failed, so nothing
+    written earlier in the request gets committed either.
+    """
+
+    def __init__(self, session):
+        self._session = session
+
+    def cursor(self, *args, **kwargs):
+        return self._session.raw_connection.cursor(*args, **kwargs)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        self._session.rollback()
+
+    def close(self):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._session.raw_connection, name)
+
+
+class DbSession:
+    """Unit of work bound to a single request: one connection, one transaction"""
+
+    def __init__(self, pool):
+        self._pool = pool
+        self.raw_connection = None
+        self.failed = False
+        self.after_commit = []
+        self._proxy = SessionConnection(self)
+
+    def connection(self):
+        if self.raw_connection is None:
+            self.raw_connection = self._pool.acquire()
+        return self._proxy
+
+    def rollback(self):
+        self.failed = True
+        if self.raw_connection is not None:
+            self.raw_connection.rollback()
+
+    def finish(self, commit=True):
+        """Commit (unless failed) or roll back, then return the connection to the pool"""
+        conn = self.raw_connection
+        callbacks, self.after_commit = self.after_commit, []
+        committed = commit and not self.failed
+        if conn is not None:
+            self.raw_connection = None
+            try:
+                if committed:
+                    conn.commit()
+                else:
+                    conn.rollback()
+            except Exception:
+                self._pool.release(conn, discard=True)
+                raise
+            self._pool.release(conn)
+
+        if committed:
+            for callback in callbacks:
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"[DB ERROR] After-commit callback failed: {str(e)}")
+
+
+def _request_session():
+    session = g.get('db_session')
+    if session is None:
+        session = DbSession(get_pool())
+        g.db_session = session
+    return session
+
+
+def _uses_request_session():
+    return has_request_context() and current_app.config.get('DB_REQUEST_SESSION', True)
+
+
+def get_connection():
+    """
+    Borrow a database connection
+
+    Inside a request this joins the request-scoped session, so the caller's
+    ``commit()`` is deferred to the end of the request. Elsewhere (scripts,
+    background threads) it is a plain connection from the shared pool.
+    """
+    if _uses_request_session():
+        return _request_session().connection()
+    return get_pool().acquire()
+
+
+def release_connection(conn, discard=False):
+    """Give back a connection obtained from :func:`get_connection`"""
+    if isinstance(conn, SessionConnection):
+        return
+    get_pool().release(conn, discard=discard)
+
+
+def call_after_commit(callback):
+    """
+    Run ``callback`` once the current unit of work has been committed
+
+    Inside a request the callback is queued on the request session and
+    dropped if the request rolls back; elsewhere it runs immediately.
+    """
+    if _uses_request_session():
+        _request_session().after_commit.append(callback)
+    else:
+        callback()
+
+
+def init_request_session(app):
+    """Commit the request's unit of work on success and roll it back otherwise"""
+
+    @app.after_request
+    def commit_db_session(response):
+        session = g.pop('db_session', None)
+        if session is not None:
+            try:
+                session.finish(commit=response.status_code < 400)
+            except Exception as e:
+                print(f"[DB ERROR] Commit failed: {str(e)}")
+                # after_request hooks must hand a Response to the next hook
+                failed = jsonify({
+                    'status': 'error',
+                    'message': f'Database commit failed: {str(e)}'
+                })
+                failed.status_code = 500
+                return failed
+        return response
+
+    @app.teardown_request
+    def rollback_db_session(exception):
+        session = g.pop('db_session', None)
+        if session is not None:
+            try:
+                session.finish(commit=False)
+            except Exception as e:
+                print(f"[DB ERROR] Rollback failed: {str(e)}")
+
+
+class PooledMySQL(MySQL):
+    """flask_mysqldb extension whose per-context connection comes from the shared pool"""
+
+    @property
+    def connect(self):
+        return get_connection()
+
+    @property
+    def connection(self):
+        if 'mysql_db' not in g:
+            conn = self.connect
+            if isinstance(conn, SessionConnection):
+                # The request session owns this connection and its lifetime
+                return conn
+            g.mysql_db = conn
+        return g.mysql_db
+
+    def teardown(self, exception):
+        conn = g.pop('mysql_db', None)
+        if conn is not None:
+            release_connection(conn)
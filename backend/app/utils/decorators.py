@@ -1,8 +1,10 @@
 from functools import wraps
-from functools import wraps
 from flask import request, jsonify, current_app
 import jwt
 from app.models.user import User
+from app.utils.permissions import role_has_permission
+from app.utils.principal_cache import cache_principal, get_cached_principal
+from app.utils.revocation import is_token_revoked
 
 def token_required(f):
     """Decorator to require valid JWT token"""
@@ -35,18 +37,30 @@ def token_required(f):
                 algorithms=['HS256']
             )
             
-            # Get user
-            user_model = User()
-            result = user_model.get_user_by_id(payload['user_id'])
-            
-            if not result['success']:
+            if is_token_revoked(payload):
                 return jsonify({
                     'status': 'error',
-                    'message': 'User not found'
+                    'message': 'Token has been revoked'
                 }), 401
             
+            # Get user (cached per token, loaded from database on miss)
+            current_user = get_cached_principal('user', payload['user_id'], payload.get('iat'))
+            
+            if current_user is None:
+                user_model = User()
+                result = user_model.get_user_by_id(payload['user_id'])
+                
+                if not result['success']:
+                    return jsonify({
+                        'status': 'error',
+                        'message': 'User not found'
+                    }), 401
+                
+                current_user = result['user']
+                cache_principal('user', payload['user_id'], payload.get('iat'), current_user)
+            
             # Attach user to request
-            request.current_user = result['user']
+            request.current_user = current_user
             
         except jwt.ExpiredSignatureError:
             return jsonify({
@@ -80,31 +94,12 @@ def permission_required(permission_name):
                     'message': 'Authentication required'
                 }), 401
             
-            # Get user permissions from database
-            import MySQLdb
+            # Answer from the cached role -> permission matrix
             try:
-                conn = MySQLdb.connect(
-                    host=current_app.config['MYSQL_HOST'],
-                    port=current_app.config['MYSQL_PORT'],
-                    user=current_app.config['MYSQL_USER'],
-                    password=current_app.config['MYSQL_PASSWORD'],
-                    database=current_app.config['MYSQL_DB']
+                has_permission = role_has_permission(
+                    request.current_user['role_id'],
+                    permission_name
                 )
-                cursor = conn.cursor()
-                
-                query = """
-                    SELECT p.permission_name
-                    FROM permissions p
-                    JOIN role_permissions rp ON p.id = rp.permission_id
-                    JOIN users u ON u.role_id = rp.role_id
-                    WHERE u.id = %s AND p.permission_name = %s
-                """
-                cursor.execute(query, (request.current_user['id'], permission_name))
-                
-                has_permission = cursor.fetchone() is not None
-                
-                cursor.close()
-                conn.close()
                 
                 if not has_permission:
                     return jsonify({
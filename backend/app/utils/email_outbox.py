@@ -0,0 +1,210 @@
+# File: backend/app/utils/email_outbox.py
+
+import random
+import threading
+
+import MySQLdb
+
+from app.utils.database import call_after_commit, get_connection, get_pool, release_connection
+
+
+def enqueue_email(to_email, subject, body_html, body_text=None):
+    """
+    Add an email to the ``email_outbox`` table
+
+    Inside a request the row is part of the request's transaction, so the
+    email is only sent if the request commits. Delivery happens in the
+    background workers started by :func:`init_email_outbox`.
+
+    Returns:
+        int: Outbox row ID
+    """
+    return enqueue_emails([(to_email, subject, body_html, body_text)])
+
+
+def enqueue_emails(emails):
+    """
+    Add several emails to the outbox with one multi-row INSERT
+
+    Args:
+        emails (list): Tuples of (to_email, subject, body_html, body_text)
+
+    Returns:
+        int: ID of the first inserted row
+    """
+    if not emails:
+        return None
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.executemany(
+            """
+            INSERT INTO email_outbox (to_email, subject, body_html, body_text)
+            VALUES (%s, %s, %s, %s)
+            """,
+            emails,
+        )
+        conn.commit()
+        outbox_id = cursor.lastrowid
+    finally:
+        cursor.close()
+        release_connection(conn)
+
+    call_after_commit(outbox_workers.wake)
+    return outbox_id
+
+
+class EmailOutboxWorkers:
+    """
+    Background threads that drain ``email_outbox``
+
+    Each worker claims a batch of due rows with ``FOR UPDATE SKIP LOCKED``
+    (so workers in other processes never pick the same row), marks them
+    ``sending`` with a lease, and delivers them through
+    ``EmailService.deliver``. Failures are retried with exponential backoff
+    plus jitter until EMAIL_OUTBOX_MAX_ATTEMPTS, then marked ``failed``.
+    Rows whose lease expired (worker crashed mid-send) are claimed again.
+    """
+
+    def __init__(self):
+        self._app = None
+        self._threads = []
+        self._wakeup = threading.Event()
+
+    def start(self, app):
+        """Start EMAIL_OUTBOX_WORKERS threads (idempotent)"""
+        if self._threads:
+            return
+        self._app = app
+        for number in range(app.config['EMAIL_OUTBOX_WORKERS']):
+            thread = threading.Thread(target=self._run, name=f'email-outbox-{number}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def wake(self):
+        """Let an idle worker pick up newly queued mail without waiting for the next poll"""
+        self._wakeup.set()
+
+    def _run(self):
+        config = self._app.config
+        while True:
+            self._wakeup.clear()
+            try:
+                with self._app.app_context():
+                    batch = self._claim(config['EMAIL_OUTBOX_BATCH_SIZE'], config['EMAIL_OUTBOX_LEASE'])
+                    if batch:
+                        self._deliver(batch, config)
+                        continue
+            except Exception as e:
+                print(f"[OUTBOX ERROR] {str(e)}")
+            self._wakeup.wait(config['EMAIL_OUTBOX_POLL_INTERVAL'])
+
+    @staticmethod
+    def _claim(batch_size, lease):
+        pool = get_pool()
+        conn = pool.acquire()
+        cursor = conn.cursor(MySQLdb.cursors.DictCursor)
+        try:
+            cursor.execute(
+                """
+                SELECT id, to_email, subject, body_html, body_text, attempts
+                FROM email_outbox
+                WHERE (status = 'pending' AND next_attempt_at <= NOW())
+                   OR (status = 'sending' AND locked_until < NOW())
+                ORDER BY next_attempt_at
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+                """,
+                (batch_size,),
+            )
+            rows = cursor.fetchall()
+            if rows:
+                placeholders = ', '.join(['%s'] * len(rows))
+                cursor.execute(
+                    f"""
+                    UPDATE email_outbox
+                    SET status = 'sending', attempts = attempts + 1,
+                        locked_until = NOW() + INTERVAL %s SECOND
+                    WHERE id IN ({placeholders})
+                    """,
+                    [lease] + [row['id'] for row in rows],
+                )
+            conn.commit()
+            return rows
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            pool.release(conn)
+
+    def _deliver(self, batch, config):
+        from app.utils.email_service import EmailService
+
+        results = EmailService.deliver_batch([
+            (row['to_email'], row['subject'], row['body_html'], row['body_text']) for row in batch
+        ])
+        for row, (success, message) in zip(batch, results):
+            attempts = row['attempts'] + 1
+            if success:
+                self._mark(row['id'], 'sent', None, None)
+            elif attempts >= config['EMAIL_OUTBOX_MAX_ATTEMPTS']:
+                print(f"[OUTBOX] Giving up on email {row['id']} after {attempts} attempts")
+                self._mark(row['id'], 'failed', message, None)
+            else:
+                self._mark(row['id'], 'pending', message, self._backoff(attempts, config))
+
+    @staticmethod
+    def _backoff(attempts, config):
+        """Seconds before the next attempt: base * 2^(attempts-1), capped, with +/-20% jitter"""
+        delay = min(config['EMAIL_OUTBOX_BACKOFF_BASE'] * (2 ** (attempts - 1)),
+                    config['EMAIL_OUTBOX_BACKOFF_MAX'])
+        return int(delay * random.uniform(0.8, 1.2))
+
+    @staticmethod
+    def _mark(outbox_id, status, error, retry_in):
+        pool = get_pool()
+        conn = pool.acquire()
+        cursor = conn.cursor()
+        try:
+            if status == 'sent':
+                cursor.execute(
+                    """
+                    UPDATE email_outbox
+                    SET status = 'sent', sent_at = NOW(), locked_until = NULL, last_error = NULL
+                    WHERE id = %s
+                    """,
+                    (outbox_id,),
+                )
+            elif status == 'pending':
+                cursor.execute(
+                    """
+                    UPDATE email_outbox
+                    SET status = 'pending', locked_until = NULL, last_error = %s,
+                        next_attempt_at = NOW() + INTERVAL %s SECOND
+                    WHERE id = %s
+                    """,
+                    (error, retry_in, outbox_id),
+                )
+            else:
+                cursor.execute(
+                    """
+                    UPDATE email_outbox
+                    SET status = 'failed', locked_until = NULL, last_error = %s
+                    WHERE id = %s
+                    """,
+                    (error, outbox_id),
+                )
+            conn.commit()
+        finally:
+            cursor.close()
+            pool.release(conn)
+
+
+outbox_workers = EmailOutboxWorkers()
+
+
+def init_email_outbox(app):
+    """Start the outbox delivery workers unless EMAIL_OUTBOX_WORKERS is 0"""
+    if app.config['EMAIL_OUTBOX_WORKERS'] > 0:
+        outbox_workers.start(app)
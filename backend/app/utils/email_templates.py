@@ -0,0 +1,199 @@
+# File: backend/app/utils/email_templates.py
+
+import base64
+import html
+import os
+import re
+import threading
+import uuid
+from email.header import Header
+from email.utils import formatdate, make_msgid
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates', 'email')
+DEFAULT_LOCALE = 'id'
+LOCALES = ['id', 'en']
+
+_PLACEHOLDER_RE = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+_FILENAME_RE = re.compile(r'^(\w+)\.(\w+)\.(html|txt)$')
+
+MONTHS = {
+    'id': ('Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni', 'Juli',
+           'Agustus', 'September', 'Oktober', 'November', 'Desember'),
+    'en': ('January', 'February', 'March', 'April', 'May', 'June', 'July',
+           'August', 'September', 'October', 'November', 'December'),
+}
+
+
+class CompiledTemplate:
+    """
+    A template split once into static text and ``{{ name }}`` slots
+
+    Rendering is a single ``''.join`` over the pre-split parts; HTML
+    templates escape every value.
+    """
+
+    def __init__(self, source, escape):
+        pieces = _PLACEHOLDER_RE.split(source)
+        # Even indexes are static text, odd indexes are variable names
+        self._statics = pieces[0::2]
+        self._names = pieces[1::2]
+        self._escape = escape
+
+    @property
+    def variables(self):
+        return set(self._names)
+
+    def render(self, values):
+        escape = html.escape if self._escape else str
+        out = [self._statics[0]]
+        for name, static in zip(self._names, self._statics[1:]):
+            out.append(escape(str(values[name])))
+            out.append(static)
+        return ''.join(out)
+
+
+class EmailTemplate:
+    """Subject, text and HTML variants of one email in one locale"""
+
+    def __init__(self, subject, text, html_body):
+        self.subject = CompiledTemplate(subject, escape=False)
+        self.text = CompiledTemplate(text, escape=False) if text is not None else None
+        self.html = CompiledTemplate(html_body, escape=True) if html_body is not None else None
+
+    def render(self, values):
+        """
+        Returns:
+            tuple: (subject, body_html, body_text)
+        """
+        return (
+            self.subject.render(values),
+            self.html.render(values) if self.html else None,
+            self.text.render(values) if self.text else None,
+        )
+
+
+class TemplateRegistry:
+    """
+    Compiles every template in a directory once, keyed by (name, locale)
+
+    Files are ``<name>.<locale>.html`` and ``<name>.<locale>.txt``; the
+    text file starts with a ``Subject: ...`` line and a blank line. A
+    missing locale falls back to DEFAULT_LOCALE.
+    """
+
+    def __init__(self, directory=TEMPLATE_DIR):
+        self.directory = directory
+        self._templates = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        sources = {}
+        for filename in sorted(os.listdir(self.directory)):
+            match = _FILENAME_RE.match(filename)
+            if not match:
+                continue
+            name, locale, kind = match.groups()
+            with open(os.path.join(self.directory, filename), encoding='utf-8') as handle:
+                sources.setdefault((name, locale), {})[kind] = handle.read()
+
+        templates = {}
+        for key, parts in sources.items():
+            text = parts.get('txt')
+            if text is None or not text.startswith('Subject:'):
+                raise ValueError(f'Email template {key[0]}.{key[1]}.txt must start with a Subject line')
+            subject_line, _, text_body = text.partition('\n')
+            templates[key] = EmailTemplate(
+                subject_line[len('Subject:'):].strip(),
+                text_body.lstrip('\n'),
+                parts.get('html'),
+            )
+        self._templates = templates
+        return self
+
+    def get(self, name, locale=None):
+        if self._templates is None:
+            with self._lock:
+                if self._templates is None:
+                    self.load()
+        template = self._templates.get((name, locale or DEFAULT_LOCALE))
+        if template is None:
+            template = self._templates.get((name, DEFAULT_LOCALE))
+        if template is None:
+            raise KeyError(f'Unknown email template: {name}')
+        return template
+
+    def render(self, name, locale=None, **values):
+        """
+        Render an email template
+
+        Returns:
+            tuple: (subject, body_html, body_text)
+        """
+        return self.get(name, locale).render(values)
+
+
+email_templates = TemplateRegistry()
+
+
+def format_datetime(value, locale=None):
+    """Format a datetime as '17 Oktober 2026, 09:30:00 WIB' with localized month names"""
+    months = MONTHS.get(locale or DEFAULT_LOCALE, MONTHS[DEFAULT_LOCALE])
+    return f"{value.day:02d} {months[value.month - 1]} {value.year}, {value:%H:%M:%S} WIB"
+
+
+def _b64_lines(data):
+    encoded = base64.encodebytes(data)
+    return encoded.replace(b'\n', b'\r\n')
+
+
+class MimeSkeleton:
+    """
+    Pre-serialized multipart/alternative message
+
+    The boundary, MIME headers and part headers are built once; each message
+    only fills From/To/Subject/Date/Message-ID and the base64 bodies. The
+    boundary contains characters outside the base64 alphabet, so it can
+    never appear in an encoded body.
+    """
+
+    def __init__(self, sender):
+        boundary = f'=_humas_{uuid.uuid4().hex}'
+        self.sender = sender
+        self._headers_tail = (
+            'MIME-Version: 1.0\r\n'
+            f'Content-Type: multipart/alternative; boundary="{boundary}"\r\n'
+            '\r\n'
+        ).encode('ascii')
+        part_header = (
+            f'--{boundary}\r\n'
+            'Content-Type: text/{subtype}; charset="utf-8"\r\n'
+            'Content-Transfer-Encoding: base64\r\n'
+            '\r\n'
+        )
+        self._text_part = part_header.format(subtype='plain').encode('ascii')
+        self._html_part = part_header.format(subtype='html').encode('ascii')
+        self._closing = f'--{boundary}--\r\n'.encode('ascii')
+        self._from = f'From: {sender}\r\n'.encode('utf-8')
+        # make_msgid() would otherwise resolve the FQDN for every message
+        self._domain = sender.rpartition('@')[2].strip('> ') or 'localhost'
+
+    def build(self, to_email, subject, body_html, body_text=None):
+        """
+        Returns:
+            bytes: RFC 5322 message ready for ``SMTP.sendmail``
+        """
+        out = [
+            self._from,
+            f'To: {to_email}\r\n'.encode('utf-8'),
+            b'Subject: ' + Header(subject, 'utf-8').encode(linesep='\r\n').encode('ascii') + b'\r\n',
+            f'Date: {formatdate(localtime=True)}\r\n'.encode('ascii'),
+            f'Message-ID: {make_msgid(domain=self._domain)}\r\n'.encode('ascii'),
+            self._headers_tail,
+        ]
+        if body_text:
+            out.append(self._text_part)
+            out.append(_b64_lines(body_text.encode('utf-8')))
+        out.append(self._html_part)
+        out.append(_b64_lines(body_html.encode('utf-8')))
+        out.append(self._closing)
+        return b''.join(out)
@@ -0,0 +1,38 @@
+# File: backend/app/utils/pagination.py
+
+import base64
+import json
+from datetime import datetime
+
+
+def encode_keyset_cursor(timestamp, row_id):
+    """
+    Encode the sort key of the last row on a page as an opaque cursor
+
+    Args:
+        timestamp (datetime): Value of the timestamp sort column
+        row_id (int): Primary key, used as tie-breaker
+
+    Returns:
+        str: URL-safe cursor token
+    """
+    raw = json.dumps([timestamp.isoformat(), int(row_id)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_keyset_cursor(token):
+    """
+    Decode a cursor produced by :func:`encode_keyset_cursor`
+
+    Returns:
+        tuple: (timestamp: datetime, row_id: int)
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except Exception:
+        raise ValueError('Invalid cursor')
@@ -0,0 +1,246 @@
+# File: backend/app/utils/password_pool.py
+
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from argon2 import PasswordHasher
+from argon2.exceptions import VerifyMismatchError
+
+# Default Argon2id profile; the app uses argon2_params(config) (ARGON2_* settings)
+ARGON2_PARAMS = {
+    'time_cost': 3,         # Number of iterations
+    'memory_cost': 65536,   # Memory usage in KB (64 MB)
+    'parallelism': 4,       # Number of parallel threads
+    'hash_len': 32,         # Length of the hash in bytes
+    'salt_len': 16,         # Length of the salt in bytes
+}
+
+
+def argon2_params(config):
+    """The Argon2id profile configured by the ARGON2_* settings"""
+    return {
+        'time_cost': config['ARGON2_TIME_COST'],
+        'memory_cost': config['ARGON2_MEMORY_COST'],
+        'parallelism': config['ARGON2_PARALLELISM'],
+        'hash_len': config['ARGON2_HASH_LEN'],
+        'salt_len': config['ARGON2_SALT_LEN'],
+    }
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many hash/verify jobs are already queued; answer 503"""
+
+
+# --- Worker side -------------------------------------------------------------
+
+_hasher = None
+
+
+def _init_worker(params):
+    global _hasher
+    _hasher = PasswordHasher(**params)
+
+
+def _hash_job(submitted_at, password):
+    started_at = time.time()
+    password_hash = _hasher.hash(password)
+    return password_hash, started_at - submitted_at, time.time() - started_at
+
+
+def _verify_job(submitted_at, password_hash, password):
+    """Returns ((matched, needs_rehash), queue wait, hash time); malformed hashes raise"""
+    started_at = time.time()
+    try:
+        _hasher.verify(password_hash, password)
+        result = (True, _hasher.check_needs_rehash(password_hash))
+    except VerifyMismatchError:
+        result = (False, False)
+    return result, started_at - submitted_at, time.time() - started_at
+
+
+# --- Parent side -------------------------------------------------------------
+
+class PasswordHasherPool:
+    """
+    Argon2 hashing in a fixed set of worker processes
+
+    Every hash/verify costs ``memory_cost`` KB and tens of milliseconds of
+    CPU; running them on request threads lets a login burst exhaust memory
+    and starve other requests. Here at most ``workers`` run at once, at
+    most ``max_pending`` may be queued or running per process, and a job
+    beyond that raises :class:`PasswordHasherBusy` immediately so the
+    route can shed load with 503.
+
+    Workers are forked when the pool starts (``init_password_hasher`` runs
+    early in ``create_app``, before any background thread exists) and are
+    re-created if the process forks again or a worker dies. With
+    ``workers=0`` jobs run inline on the calling thread.
+    """
+
+    def __init__(self, workers=2, max_pending=32, timeout=10, params=None):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.params = dict(params or ARGON2_PARAMS)
+
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._counters = {'hashes': 0, 'verifies': 0, 'rejected': 0, 'timeouts': 0, 'restarts': 0,
+                          'rehashes': 0}
+        self._queue_wait = deque(maxlen=1024)
+        self._hash_time = deque(maxlen=1024)
+
+    def configure(self, workers, max_pending, timeout, params=None):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        if params is not None:
+            self.params = dict(params)
+
+    def start(self):
+        """Fork the workers now and wait until they are ready"""
+        if self.workers <= 0:
+            _init_worker(self.params)
+            return
+        self._ensure_executor().submit(time.time).result()
+
+    def _ensure_executor(self):
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                if self._executor is not None and self._pid == os.getpid():
+                    self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('fork'),
+                    initializer=_init_worker,
+                    initargs=(self.params,),
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def _run(self, job, *args):
+        if self.workers <= 0:
+            if _hasher is None:
+                _init_worker(self.params)
+            return self._record(job(time.time(), *args))
+
+        for attempt in range(2):
+            future = self._submit(job, *args)
+            try:
+                return self._record(future.result(timeout=self.timeout))
+            except FutureTimeoutError:
+                # A running job cannot be cancelled; it keeps its slot until it ends
+                future.cancel()
+                with self._lock:
+                    self._counters['timeouts'] += 1
+                raise PasswordHasherBusy('Password hasher timed out')
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM killed); start a fresh pool once
+                with self._lock:
+                    self._executor = None
+                    self._counters['restarts'] += 1
+                if attempt:
+                    raise
+
+    def _submit(self, job, *args):
+        """
+        Queue a job if fewer than ``max_pending`` are outstanding
+
+        The slot is released when the job finishes (or is cancelled), not
+        when the caller stops waiting, so jobs that outlive their timeout
+        still count against ``max_pending``.
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._counters['rejected'] += 1
+                raise PasswordHasherBusy('Password hasher queue is full')
+            self._pending += 1
+        try:
+            future = self._ensure_executor().submit(job, time.time(), *args)
+        except BaseException:
+            self._release_slot(None)
+            raise
+        future.add_done_callback(self._release_slot)
+        return future
+
+    def _release_slot(self, future):
+        with self._lock:
+            self._pending -= 1
+
+    def _record(self, outcome):
+        result, queue_wait, hash_time = outcome
+        with self._lock:
+            self._queue_wait.append(max(queue_wait, 0.0))
+            self._hash_time.append(hash_time)
+        return result
+
+    def hash(self, password):
+        """Returns the encoded Argon2id hash"""
+        result = self._run(_hash_job, password)
+        with self._lock:
+            self._counters['hashes'] += 1
+        return result
+
+    def verify(self, password_hash, password):
+        """
+        Verify a password; ``needs_rehash`` is True when the hash was made
+        with parameters other than the configured profile
+
+        Returns:
+            tuple: (matched: bool, needs_rehash: bool)
+
+        Raises:
+            PasswordHasherBusy: Queue full or no worker answered in time
+            argon2.exceptions.VerificationError, InvalidHash: Malformed hash
+        """
+        result = self._run(_verify_job, password_hash, password)
+        with self._lock:
+            self._counters['verifies'] += 1
+        return result
+
+    def count(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    @staticmethod
+    def _summary(samples):
+        if not samples:
+            return {'avg_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+        ordered = sorted(samples)
+        return {
+            'avg_ms': round(sum(ordered) / len(ordered) * 1000, 2),
+            'p95_ms': round(ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)] * 1000, 2),
+            'max_ms': round(ordered[-1] * 1000, 2),
+        }
+
+    def stats(self):
+        with self._lock:
+            data = dict(self._counters, pending=self._pending, workers=self.workers,
+                        max_pending=self.max_pending, params=dict(self.params))
+            queue_wait, hash_time = list(self._queue_wait), list(self._hash_time)
+        data['queue_wait'] = self._summary(queue_wait)
+        data['hash_time'] = self._summary(hash_time)
+        return data
+
+
+password_hasher = PasswordHasherPool()
+
+
+def init_password_hasher(app):
+    """Configure the hasher pool from the app config and fork its workers"""
+    config = app.config
+    password_hasher.configure(
+        workers=config['PASSWORD_HASH_WORKERS'],
+        max_pending=config['PASSWORD_HASH_MAX_PENDING'],
+        timeout=config['PASSWORD_HASH_TIMEOUT'],
+        params=argon2_params(config),
+    )
+    password_hasher.start()
@@ -0,0 +1,92 @@
+# File: backend/app/utils/permissions.py
+
+import threading
+import time
+
+import MySQLdb.cursors
+from flask import current_app
+
+from app.utils.database import get_connection, release_connection
+
+
+class PermissionMatrix:
+    """
+    In-process cache of the role -> permission mapping
+
+    The whole ``role_permissions`` table is loaded at once into
+    ``{role_id: frozenset(permission_name, ...)}`` and kept for ``ttl``
+    seconds. Code that edits roles or permissions must call
+    :meth:`invalidate` so the next check reloads it; the TTL bounds how long
+    other worker processes keep serving the old mapping.
+    """
+
+    def __init__(self):
+        self._matrix = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, ttl):
+        """
+        Return the current matrix, reloading it if it expired or was invalidated
+
+        Args:
+            ttl (int): Seconds a freshly loaded matrix stays valid
+
+        Returns:
+            dict: role_id -> frozenset of permission names
+        """
+        matrix = self._matrix
+        if matrix is not None and time.monotonic() < self._expires_at:
+            return matrix
+
+        with self._lock:
+            # Another thread may have reloaded while we waited for the lock
+            if self._matrix is not None and time.monotonic() < self._expires_at:
+                return self._matrix
+            self._matrix = self._load()
+            self._expires_at = time.monotonic() + ttl
+            return self._matrix
+
+    def has_permission(self, role_id, permission_name, ttl):
+        """Check whether a role has been granted a permission"""
+        return permission_name in self.get(ttl).get(role_id, frozenset())
+
+    def invalidate(self):
+        """Drop the cached matrix so the next check reloads it from the database"""
+        with self._lock:
+            self._matrix = None
+            self._expires_at = 0.0
+
+    @staticmethod
+    def _load():
+        conn = get_connection()
+        try:
+            cursor = conn.cursor(MySQLdb.cursors.DictCursor)
+            cursor.execute('''
+                SELECT rp.role_id, p.permission_name
+                FROM role_permissions rp
+                JOIN permissions p ON p.id = rp.permission_id
+            ''')
+            rows = cursor.fetchall()
+            cursor.close()
+        finally:
+            release_connection(conn)
+
+        grouped = {}
+        for row in rows:
+            grouped.setdefault(int(row['role_id']), set()).add(row['permission_name'])
+        return {role_id: frozenset(names) for role_id, names in grouped.items()}
+
+
+permission_matrix = PermissionMatrix()
+
+
+def role_has_permission(role_id, permission_name):
+    """Answer a permission check from the cached role -> permission matrix"""
+    ttl = current_app.config['PERMISSION_CACHE_TTL']
+    return permission_matrix.has_permission(role_id, permission_name, ttl)
+
+
+def invalidate_permission_cache():
+    """Hook to call after roles, permissions or role_permissions are modified"""
+    permission_matrix.invalidate()
@@ -0,0 +1,117 @@
+# File: backend/app/utils/principal_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+from app.utils.database import call_after_commit
+
+
+class PrincipalCache:
+    """
+    Bounded LRU + TTL cache of authenticated users
+
+    Entries are keyed by ``(kind, user_id, iat)`` where ``kind`` separates
+    the differently shaped user records built by the two ``token_required``
+    decorators, and ``iat`` ties an entry to the token it was loaded for.
+    A secondary index by user id lets every entry of a user be dropped at
+    once when the account changes.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()   # key -> (expires_at, principal)
+        self._by_user = {}              # user_id -> set of keys
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return a copy of the cached principal, or None on miss/expiry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, principal = entry
+            if time.monotonic() >= expires_at:
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(principal)
+
+    def put(self, key, principal, ttl, max_size):
+        """Store a principal, evicting least recently used entries beyond ``max_size``"""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, dict(principal))
+            self._by_user.setdefault(key[1], set()).add(key)
+            while len(self._entries) > max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id):
+        """Drop every cached entry for a user"""
+        with self._lock:
+            for key in list(self._by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _remove(self, key):
+        # Caller holds the lock
+        self._entries.pop(key, None)
+        keys = self._by_user.get(key[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[key[1]]
+
+
+principal_cache = PrincipalCache()
+
+
+def get_cached_principal(kind, user_id, iat):
+    """Look up the user record cached for a decoded token"""
+    return principal_cache.get((kind, user_id, iat))
+
+
+def cache_principal(kind, user_id, iat, principal):
+    """Remember the user record loaded for a decoded token"""
+    principal_cache.put(
+        (kind, user_id, iat),
+        principal,
+        current_app.config['PRINCIPAL_CACHE_TTL'],
+        current_app.config['PRINCIPAL_CACHE_SIZE']
+    )
+
+
+def invalidate_principal(user_id):
+    """
+    Forget cached records for a user once the current change is committed
+
+    Invalidated immediately as well, so a concurrent request cannot keep
+    serving the old record while the transaction is still open.
+    """
+    principal_cache.invalidate_user(user_id)
+    call_after_commit(lambda: principal_cache.invalidate_user(user_id))
@@ -0,0 +1,350 @@
+# File: backend/app/utils/rate_limit.py
+
+import math
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, namedtuple
+from functools import wraps
+
+from flask import current_app, request
+
+from app.utils.response import error_response
+
+try:
+    import redis
+except ImportError:  # optional, only needed for RATE_LIMIT_BACKEND=redis
+    redis = None
+
+RateLimitResult = namedtuple('RateLimitResult', 'allowed remaining retry_after limit')
+
+
+def sliding_window(previous, current, elapsed, limit, window, pending=0):
+    """
+    Sliding window counter over two fixed windows
+
+    The previous window's count is weighted by how much of it still overlaps
+    the sliding window ending now, which approximates a true sliding log
+    with two integers per key.
+
+    Args:
+        previous (int): Hits in the previous fixed window
+        current (int): Hits in the current fixed window (including a hit just recorded)
+        elapsed (float): Seconds since the current fixed window started
+        limit (int): Allowed hits per ``window``
+        window (int): Window length in seconds
+        pending (int): Hits about to be made (1 when checking without recording)
+
+    Returns:
+        RateLimitResult: (allowed, remaining hits, seconds until allowed, limit)
+    """
+    count = previous * (1 - elapsed / window) + current
+    remaining = max(limit - math.ceil(count), 0)
+    if count + pending <= limit:
+        return RateLimitResult(True, remaining, 0, limit)
+
+    threshold = limit - pending
+    if current <= threshold:
+        # Enough once the previous window's weight has decayed
+        retry_after = window * (1 - (threshold - current) / previous) - elapsed
+    else:
+        # This window's hits become the previous window, then decay too
+        retry_after = (window - elapsed) + window * (1 - threshold / current)
+    return RateLimitResult(False, remaining, max(math.ceil(retry_after), 1), limit)
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage for sliding window counters
+
+    Keys are opaque strings. ``hit`` records ``cost`` hits and reports
+    whether they fit in the limit; ``peek`` reports whether one more hit
+    would fit, without recording it. Subclasses implement ``_update``,
+    which atomically rolls the key's counters forward to the current
+    window, adds ``cost`` and returns ``(previous, current)``.
+    """
+
+    name = 'base'
+
+    @abstractmethod
+    def _update(self, key, index, window, cost):
+        """Atomically roll ``key`` forward to window ``index``, add ``cost``; returns (previous, current)"""
+
+    @abstractmethod
+    def reset(self, key):
+        """Forget the counters of ``key``"""
+
+    def hit(self, key, limit, window, cost=1):
+        now = time.time()
+        index = int(now // window)
+        previous, current = self._update(key, index, window, cost)
+        return sliding_window(previous, current, now - index * window, limit, window)
+
+    def peek(self, key, limit, window):
+        now = time.time()
+        index = int(now // window)
+        previous, current = self._update(key, index, window, 0)
+        return sliding_window(previous, current, now - index * window, limit, window, pending=1)
+
+    def stats(self):
+        return {'backend': self.name}
+
+    @staticmethod
+    def _advance(state, index):
+        """Roll a (window_index, previous, current) state forward to window ``index``"""
+        if state is None or state[0] < index - 1:
+            return index, 0, 0
+        if state[0] == index - 1:
+            return index, state[2], 0
+        return state
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Per-process counters in a bounded LRU; the least recently used keys are evicted"""
+
+    name = 'memory'
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._counters = OrderedDict()  # key -> (window_index, previous, current)
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def _update(self, key, index, window, cost):
+        with self._lock:
+            state = self._advance(self._counters.get(key), index)
+            if cost:
+                state = (index, state[1], state[2] + cost)
+                self._counters[key] = state
+                self._counters.move_to_end(key)
+                while len(self._counters) > self.max_keys:
+                    self._counters.popitem(last=False)
+                    self.evictions += 1
+        return state[1], state[2]
+
+    def reset(self, key):
+        with self._lock:
+            self._counters.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {'backend': self.name, 'keys': len(self._counters),
+                    'max_keys': self.max_keys, 'evictions': self.evictions}
+
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """
+    Counters in a SQLite file shared by every worker process on the host
+
+    Each hit is a ``BEGIN IMMEDIATE`` read-modify-write, so concurrent
+    workers never lose one. Rows untouched for two windows are pruned
+    every ``prune_every`` hits.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path, timeout=5.0, prune_every=1000):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.timeout = timeout
+        self.prune_every = prune_every
+        self._local = threading.local()
+        self._hits = 0
+        conn = self._connection()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rate_limits (
+                key TEXT PRIMARY KEY,
+                window_index INTEGER NOT NULL,
+                previous INTEGER NOT NULL,
+                current INTEGER NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_rate_limits_expires ON rate_limits (expires_at)")
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit mode; transactions are explicit
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _select(self, conn, key):
+        return conn.execute(
+            "SELECT window_index, previous, current FROM rate_limits WHERE key = ?", (key,)
+        ).fetchone()
+
+    def _update(self, key, index, window, cost):
+        conn = self._connection()
+        if not cost:
+            state = self._advance(self._select(conn, key), index)
+            return state[1], state[2]
+
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            state = self._advance(self._select(conn, key), index)
+            state = (index, state[1], state[2] + cost)
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limits (key, window_index, previous, current, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, state[0], state[1], state[2], (index + 2) * window),
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        self._hits += 1
+        if self._hits % self.prune_every == 0:
+            conn.execute("DELETE FROM rate_limits WHERE expires_at < ?", (time.time(),))
+        return state[1], state[2]
+
+    def reset(self, key):
+        self._connection().execute("DELETE FROM rate_limits WHERE key = ?", (key,))
+
+    def stats(self):
+        count = self._connection().execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0]
+        return {'backend': self.name, 'keys': count, 'path': self.path}
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Counters in Redis (or any Redis-protocol server with Lua), shared across hosts
+
+    Each key is one hash ``{i: window index, p: previous, c: current}``
+    updated by a server-side script, so a hit is one atomic round trip.
+    Needs the ``redis`` package.
+    """
+
+    name = 'redis'
+
+    UPDATE_SCRIPT = """
+        local index, cost, ttl = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+        local state = redis.call('HMGET', KEYS[1], 'i', 'p', 'c')
+        local i, p, c = tonumber(state[1]), tonumber(state[2]) or 0, tonumber(state[3]) or 0
+        if i == nil or i < index - 1 then
+            p, c = 0, 0
+        elseif i == index - 1 then
+            p, c = c, 0
+        end
+        if cost > 0 then
+            c = c + cost
+            redis.call('HSET', KEYS[1], 'i', index, 'p', p, 'c', c)
+            redis.call('EXPIRE', KEYS[1], ttl)
+        end
+        return {p, c}
+    """
+
+    def __init__(self, url, prefix='humas:rl:'):
+        if redis is None:
+            raise RuntimeError('redis is required for RATE_LIMIT_BACKEND=redis')
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._script = self.client.register_script(self.UPDATE_SCRIPT)
+
+    def _update(self, key, index, window, cost):
+        previous, current = self._script(keys=[self.prefix + key], args=[index, cost, window * 2])
+        return int(previous), int(current)
+
+    def reset(self, key):
+        self.client.delete(self.prefix + key)
+
+
+class RateLimiter:
+    """Rate limits by scope and identifier (``login:ip:10.0.0.1``) on top of a backend"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    @staticmethod
+    def _key(scope, identifier):
+        return f'{scope}:{identifier}'
+
+    def check(self, scope, identifier, limit, window):
+        """Would one more hit be allowed? Does not count as a hit"""
+        return self.backend.peek(self._key(scope, identifier), limit, window)
+
+    def hit(self, scope, identifier, limit, window, cost=1):
+        """Record hits and return the resulting state"""
+        return self.backend.hit(self._key(scope, identifier), limit, window, cost)
+
+    def reset(self, scope, identifier):
+        self.backend.reset(self._key(scope, identifier))
+
+    def stats(self):
+        return self.backend.stats()
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def create_rate_limit_backend(config, instance_path):
+    """Build the backend selected by RATE_LIMIT_BACKEND (memory, sqlite or redis)"""
+    backend = config['RATE_LIMIT_BACKEND']
+    if backend == 'memory':
+        return MemoryRateLimitBackend(config['RATE_LIMIT_MAX_KEYS'])
+    if backend == 'sqlite':
+        return SQLiteRateLimitBackend(
+            config['RATE_LIMIT_STORAGE_PATH'] or os.path.join(instance_path, 'rate_limits.sqlite3')
+        )
+    if backend == 'redis':
+        return RedisRateLimitBackend(config['RATE_LIMIT_REDIS_URL'])
+    raise ValueError(f'Unknown RATE_LIMIT_BACKEND: {backend}')
+
+
+def get_rate_limiter():
+    """Return the process-wide rate limiter for ``current_app``"""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiter(create_rate_limit_backend(current_app.config, current_app.instance_path))
+    return _limiter
+
+
+def _setting(value):
+    """Limits may be given as numbers or as config key names"""
+    return current_app.config[value] if isinstance(value, str) else value
+
+
+def too_many_requests(result, message='Too many requests, please try again later'):
+    """429 response with a Retry-After header for a blocked RateLimitResult"""
+    response, status_code = error_response(message, 429)
+    response.headers['Retry-After'] = str(result.retry_after)
+    return response, status_code
+
+
+def rate_limit(scope, limit, window, key_func=None):
+    """
+    Decorator limiting how often an endpoint can be called
+
+    Every call counts, including rejected ones. Over the limit the
+    endpoint answers 429 with a ``Retry-After`` header.
+
+    Args:
+        scope (str): Counter namespace, e.g. 'upload'
+        limit (int or str): Calls per window, or a config key holding it
+        window (int or str): Window in seconds, or a config key holding it
+        key_func (callable): Returns the identifier to count by (default: client IP)
+
+    Example:
+        @rate_limit('cooperation', 'RATE_LIMIT_COOPERATION', 'RATE_LIMIT_WINDOW')
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            identifier = key_func() if key_func else request.remote_addr
+            result = get_rate_limiter().hit(scope, identifier, _setting(limit), _setting(window))
+            if not result.allowed:
+                return too_many_requests(result)
+            return f(*args, **kwargs)
+        return decorated
+    return decorator
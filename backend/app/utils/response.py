@@ -1,4 +1,4 @@
-from flask import jsonify
+from flask import current_app, jsonify
 
 def success_response(message, data=None, status_code=200):
     """Standard success response"""
@@ -23,3 +23,20 @@ def error_response(message, status_code=400, errors=None):
         response['errors'] = errors
     
     return jsonify(response), status_code
+
+def not_modified_response(etag, last_modified=None):
+    """304 Not Modified for a conditional GET whose validators matched"""
+    response = current_app.response_class(status=304)
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def with_etag(response, etag, last_modified=None):
+    """Attach a weak ETag (and Last-Modified) to a (response, status) pair; clients revalidate on every use"""
+    response[0].set_etag(etag, weak=True)
+    if last_modified is not None:
+        response[0].last_modified = last_modified
+    response[0].headers['Cache-Control'] = 'private, no-cache'
+    return response
@@ -0,0 +1,234 @@
+# File: backend/app/utils/revocation.py
+
+import threading
+import time
+
+import MySQLdb
+
+from app.utils.database import get_pool
+
+
+class RevocationList:
+    """
+    In-memory view of revoked access tokens
+
+    Two structures, both checked with a single dict lookup per request:
+
+    - ``jti -> expires_at`` for individually revoked tokens (logout)
+    - ``user_id -> not_before`` watermarks: every token of the user issued
+      before ``not_before`` is revoked (password change/reset)
+
+    Entries are only kept until the tokens they cover expire, so the list
+    stays as small as the number of revocations within one access token
+    lifetime. Refresh tokens need no entry: they only work while their
+    session row exists (see app/utils/sessions.py).
+
+    The ``token_revocations`` table is the shared log. A revocation is
+    committed on its own and applied locally at once; every process polls
+    the table for rows with a higher id every ``poll_interval`` seconds,
+    which keeps all workers and hosts in sync. Auto-increment ids can
+    become visible out of order (a lower id committing after a higher one
+    was read), so each poll also re-reads the rows created in the last
+    ``overlap`` seconds; ids already applied are skipped.
+    """
+
+    def __init__(self):
+        self.poll_interval = 1.0
+        self.overlap = 30
+        self._jtis = {}
+        self._not_before = {}
+        self._lock = threading.Lock()
+        self._last_id = 0
+        self._seen = {}                 # id -> created_at of rows inside the overlap window
+        self._thread = None
+        self._counters = {'polls': 0, 'applied': 0, 'errors': 0}
+
+    # --- Request path ---------------------------------------------------
+
+    def is_revoked(self, payload):
+        """True if an access token payload (with jti, user_id, iat) has been revoked"""
+        not_before = self._not_before.get(payload.get('user_id'))
+        if not_before is not None and payload.get('iat', 0) < not_before[0]:
+            return True
+        return payload.get('jti') in self._jtis
+
+    # --- Local state ----------------------------------------------------
+
+    def apply(self, jti, user_id, not_before, expires_at):
+        """Add one revocation (times are UNIX timestamps)"""
+        if expires_at <= time.time():
+            return
+        with self._lock:
+            if jti:
+                self._jtis[jti] = expires_at
+            if user_id is not None and not_before is not None:
+                current = self._not_before.get(user_id)
+                if current is None or not_before >= current[0]:
+                    self._not_before[user_id] = (not_before, expires_at)
+            self._counters['applied'] += 1
+
+    def prune(self):
+        """Forget revocations whose tokens have expired anyway"""
+        now = time.time()
+        with self._lock:
+            # Rebuilt and swapped so readers never see a dict being resized
+            self._jtis = {jti: exp for jti, exp in self._jtis.items() if exp > now}
+            self._not_before = {uid: entry for uid, entry in self._not_before.items() if entry[1] > now}
+            # Rows older than the overlap window are never re-read
+            self._seen = {row_id: created for row_id, created in self._seen.items()
+                          if created > now - 2 * self.overlap}
+
+    # --- Synchronisation ------------------------------------------------
+
+    def start(self, app):
+        """Load unexpired revocations and start polling for new ones (idempotent)"""
+        self.poll_interval = app.config['REVOCATION_POLL_INTERVAL']
+        self.overlap = app.config['REVOCATION_POLL_OVERLAP']
+        if self._thread is not None:
+            return
+        try:
+            self.poll()
+        except Exception as e:
+            print(f"[REVOCATION ERROR] Initial load failed: {str(e)}")
+        self._thread = threading.Thread(target=self._run, name='token-revocations', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        polls = 0
+        while True:
+            time.sleep(self.poll_interval)
+            try:
+                self.poll()
+                polls += 1
+                if polls % 60 == 0:
+                    self.prune()
+            except Exception as e:
+                self._counters['errors'] += 1
+                print(f"[REVOCATION ERROR] {str(e)}")
+
+    def poll(self):
+        """Apply revocations logged by any process since the last poll"""
+        pool = get_pool()
+        conn = pool.acquire()
+        cursor = conn.cursor(MySQLdb.cursors.DictCursor)
+        columns = """
+            SELECT id, jti, user_id,
+                   UNIX_TIMESTAMP(not_before) as not_before,
+                   UNIX_TIMESTAMP(expires_at) as expires_at,
+                   UNIX_TIMESTAMP(created_at) as created_at
+            FROM token_revocations
+        """
+        try:
+            # Late commits below the high-water mark
+            cursor.execute(
+                columns + """
+                WHERE created_at >= NOW() - INTERVAL %s SECOND AND id <= %s AND expires_at > NOW()
+                ORDER BY id
+                """,
+                (self.overlap, self._last_id)
+            )
+            self._apply_rows(cursor.fetchall())
+            conn.commit()
+            while True:
+                cursor.execute(
+                    columns + """
+                    WHERE id > %s AND expires_at > NOW()
+                    ORDER BY id
+                    LIMIT 1000
+                    """,
+                    (self._last_id,)
+                )
+                rows = cursor.fetchall()
+                conn.commit()
+                self._apply_rows(rows)
+                if len(rows) < 1000:
+                    break
+        finally:
+            cursor.close()
+            pool.release(conn)
+        self._counters['polls'] += 1
+
+    def _apply_rows(self, rows):
+        for row in rows:
+            self._last_id = max(self._last_id, row['id'])
+            if row['id'] in self._seen:
+                continue
+            self._seen[row['id']] = float(row['created_at'])
+            self.apply(
+                row['jti'], row['user_id'],
+                float(row['not_before']) if row['not_before'] is not None else None,
+                float(row['expires_at'])
+            )
+
+    def stats(self):
+        return dict(self._counters, revoked_tokens=len(self._jtis), user_watermarks=len(self._not_before),
+                    last_id=self._last_id, poll_interval=self.poll_interval)
+
+
+revocation_list = RevocationList()
+
+
+def _log_revocation(jti, user_id, not_before, expires_at):
+    """
+    Log a revocation in its own transaction and apply it locally
+
+    Committed at once on a pool connection rather than with the request,
+    so other workers see it within one poll; if the request's own writes
+    roll back the token simply stays revoked, which errs on the safe side.
+    """
+    pool = get_pool()
+    conn = pool.acquire()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            """
+            INSERT INTO token_revocations (jti, user_id, not_before, expires_at)
+            VALUES (%s, %s, FROM_UNIXTIME(%s), FROM_UNIXTIME(%s))
+            """,
+            (jti, user_id, not_before, expires_at)
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        pool.release(conn)
+    revocation_list.apply(jti, user_id, not_before, expires_at)
+
+
+def revoke_token(payload):
+    """
+    Revoke one access token (logout)
+
+    Args:
+        payload (dict): Decoded access token with jti and exp
+    """
+    if not payload.get('jti'):
+        return
+    _log_revocation(payload['jti'], payload.get('user_id'), None, payload['exp'])
+
+
+def revoke_user_tokens(user_id, access_token_lifetime):
+    """
+    Revoke every access token issued to a user until now
+
+    Tokens issued within the current second stay valid (``iat`` has
+    one-second resolution), so a login right after still works.
+
+    Args:
+        user_id (int): User ID
+        access_token_lifetime (timedelta): JWT_ACCESS_TOKEN_EXPIRES
+    """
+    now = int(time.time())
+    _log_revocation(None, user_id, now, now + int(access_token_lifetime.total_seconds()))
+
+
+def is_token_revoked(payload):
+    """Check a decoded access token against the revocation list (no I/O)"""
+    return revocation_list.is_revoked(payload)
+
+
+def init_revocations(app):
+    """Load the revocation list and start syncing it from token_revocations"""
+    revocation_list.start(app)
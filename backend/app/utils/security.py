@@ -1,66 +1,141 @@
 # File: backend/app/utils/security.py
 
-from argon2 import PasswordHasher
-from argon2.exceptions import VerifyMismatchError, VerificationError, InvalidHash
+from argon2.exceptions import VerificationError, InvalidHash
 import re
+import uuid
 from datetime import datetime, timedelta
 import jwt
 from functools import wraps
 from flask import request, jsonify, current_app
 import MySQLdb.cursors
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from app.utils.database import call_after_commit, get_pool
+from app.utils.password_pool import PasswordHasherBusy, password_hasher
+from app.utils.principal_cache import cache_principal, get_cached_principal, invalidate_principal
+from app.utils.revocation import is_token_revoked
 
-# Initialize Argon2 Password Hasher
-ph = PasswordHasher(
-    time_cost=3,        # Number of iterations
-    memory_cost=65536,  # Memory usage in KB (64 MB)
-    parallelism=4,      # Number of parallel threads
-    hash_len=32,        # Length of the hash in bytes
-    salt_len=16         # Length of the salt in bytes
-)
+# Background rehash-on-login: one thread, at most one queued rehash per user
+_rehash_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='password-rehash')
+_rehash_pending = set()
+_rehash_lock = threading.Lock()
 
 
 def hash_password(password: str) -> str:
     """
-    Hash a password using Argon2id algorithm
+    Hash a password using Argon2id algorithm (in the hasher worker pool)
     
     Args:
         password (str): Plain text password
         
     Returns:
         str: Hashed password
+        
+    Raises:
+        PasswordHasherBusy: Too many hashes queued, answer with 503
     """
     try:
-        return ph.hash(password)
+        return password_hasher.hash(password)
+    except PasswordHasherBusy:
+        raise
     except Exception as e:
         raise ValueError(f"Error hashing password: {str(e)}")
 
 
 def verify_password(hashed_password: str, plain_password: str) -> bool:
     """
-    Verify a password against its hash
+    Verify a password against its hash (in the hasher worker pool)
     
     Args:
         hashed_password (str): The Argon2 hashed password
         plain_password (str): The plain text password to verify
         
     Returns:
-        bool: True if password matches, False otherwise
+        bool: True if password matches, False otherwise; the truthy string
+        "rehash_needed" if it matches but the hash predates the configured
+        Argon2 profile (see schedule_password_rehash)
+        
+    Raises:
+        PasswordHasherBusy: Too many hashes queued, answer with 503
     """
     try:
-        ph.verify(hashed_password, plain_password)
+        matched, needs_rehash = password_hasher.verify(hashed_password, plain_password)
         
         # Check if rehashing is needed (parameters changed)
-        if ph.check_needs_rehash(hashed_password):
+        if matched and needs_rehash:
             return "rehash_needed"
         
-        return True
-    except VerifyMismatchError:
-        return False
+        return matched
     except (VerificationError, InvalidHash) as e:
         print(f"Password verification error: {str(e)}")
         return False
 
 
+def _rehash_password(user_id, old_hash, plain_password):
+    try:
+        new_hash = password_hasher.hash(plain_password)
+        pool = get_pool()
+        conn = pool.acquire()
+        try:
+            cursor = conn.cursor()
+            # Only replace the hash we verified; a password change in between wins
+            cursor.execute(
+                'UPDATE users SET password_hash = %s WHERE id = %s AND password_hash = %s',
+                (new_hash, user_id, old_hash)
+            )
+            updated = cursor.rowcount
+            conn.commit()
+            cursor.close()
+        finally:
+            pool.release(conn)
+        if updated:
+            password_hasher.count('rehashes')
+            invalidate_principal(user_id)
+            print(f"[AUTH] Password hash of user {user_id} upgraded to the current Argon2 profile")
+    except PasswordHasherBusy:
+        # Retried on the user's next login
+        pass
+    except Exception as e:
+        print(f"[AUTH ERROR] Password rehash for user {user_id} failed: {str(e)}")
+    finally:
+        with _rehash_lock:
+            _rehash_pending.discard(user_id)
+
+
+def schedule_password_rehash(user_id: int, old_hash: str, plain_password: str):
+    """
+    Re-hash a password with the current Argon2 profile in the background
+    
+    Call after ``verify_password`` returned ``"rehash_needed"``. Runs once
+    the request commits, off the request thread; the new hash is computed
+    in the hasher pool and stored only if the user's hash is still
+    ``old_hash``.
+    
+    Args:
+        user_id (int): User ID
+        old_hash (str): The hash the password was verified against
+        plain_password (str): The verified plain text password
+    """
+    def submit():
+        with _rehash_lock:
+            if user_id in _rehash_pending:
+                return
+            _rehash_pending.add(user_id)
+        _rehash_executor.submit(_rehash_password, user_id, old_hash, plain_password)
+    
+    call_after_commit(submit)
+
+
+def password_hasher_busy_response():
+    """503 for requests shed because the password hasher queue is full"""
+    response = jsonify({
+        'status': 'error',
+        'message': 'Server sedang sibuk, silakan coba lagi dalam beberapa detik'
+    })
+    response.headers['Retry-After'] = '2'
+    return response, 503
+
+
 def validate_password_strength(password: str) -> tuple:
     """
     Validate password strength
@@ -96,7 +171,8 @@ def validate_password_strength(password: str) -> tuple:
     return True, "Password valid"
 
 
-def generate_jwt_token(user_id: int, username: str, role: str) -> dict:
+def generate_jwt_token(user_id: int, username: str, role: str, jti: str = None,
+                       refresh_jti: str = None) -> dict:
     """
     Generate JWT access and refresh tokens
     
@@ -104,6 +180,8 @@ def generate_jwt_token(user_id: int, username: str, role: str) -> dict:
         user_id (int): User ID
         username (str): Username
         role (str): User role
+        jti (str): Unique ID of the access token (random if omitted)
+        refresh_jti (str): Unique ID of the refresh token (random if omitted)
         
     Returns:
         dict: Dictionary containing access_token and refresh_token
@@ -118,6 +196,7 @@ def generate_jwt_token(user_id: int, username: str, role: str) -> dict:
             'username': username,
             'role': role,
             'type': 'access',
+            'jti': jti or uuid.uuid4().hex,
             'exp': datetime.utcnow() + access_token_expires,
             'iat': datetime.utcnow()
         }
@@ -127,6 +206,7 @@ def generate_jwt_token(user_id: int, username: str, role: str) -> dict:
             'user_id': user_id,
             'username': username,
             'type': 'refresh',
+            'jti': refresh_jti or uuid.uuid4().hex,
             'exp': datetime.utcnow() + refresh_token_expires,
             'iat': datetime.utcnow()
         }
@@ -215,24 +295,36 @@ def token_required(f):
                     'message': 'Token type tidak valid'
                 }), 401
             
-            # Get current user from database
-            from app import mysql
-            cursor = mysql.connection.cursor(MySQLdb.cursors.DictCursor)
-            cursor.execute('''
-                SELECT u.*, r.role_name 
-                FROM users u 
-                JOIN roles r ON u.role_id = r.id 
-                WHERE u.id = %s AND u.is_active = TRUE
-            ''', (payload['user_id'],))
-            current_user = cursor.fetchone()
-            cursor.close()
-            
-            if not current_user:
+            # Logged out / password changed since issue (in-memory, no query)
+            if is_token_revoked(payload):
                 return jsonify({
                     'status': 'error',
-                    'message': 'User tidak ditemukan atau tidak aktif'
+                    'message': 'Token telah dicabut. Silakan login kembali.'
                 }), 401
             
+            # Get current user (cached per token, loaded from database on miss)
+            current_user = get_cached_principal('account', payload['user_id'], payload.get('iat'))
+            
+            if current_user is None:
+                from app import mysql
+                cursor = mysql.connection.cursor(MySQLdb.cursors.DictCursor)
+                cursor.execute('''
+                    SELECT u.*, r.role_name 
+                    FROM users u 
+                    JOIN roles r ON u.role_id = r.id 
+                    WHERE u.id = %s AND u.is_active = TRUE
+                ''', (payload['user_id'],))
+                current_user = cursor.fetchone()
+                cursor.close()
+                
+                if not current_user:
+                    return jsonify({
+                        'status': 'error',
+                        'message': 'User tidak ditemukan atau tidak aktif'
+                    }), 401
+                
+                cache_principal('account', payload['user_id'], payload.get('iat'), current_user)
+            
             # Add current_user to kwargs
             kwargs['current_user'] = current_user
             
@@ -0,0 +1,184 @@
+# File: backend/app/utils/sessions.py
+
+import hashlib
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import MySQLdb
+from flask import current_app
+
+from app.utils.database import get_pool
+from app.utils.security import generate_jwt_token
+
+
+def token_digest(token):
+    """SHA-256 of a token as the 32 bytes stored in ``sessions`` (raw tokens are never stored)"""
+    return hashlib.sha256(token.encode('utf-8')).digest()
+
+
+def create_session(cursor, user, ip_address, user_agent):
+    """
+    Issue tokens for a login and record the session
+
+    The session row keeps digests of both tokens and the access token's
+    ``jti``; it lives as long as the refresh token.
+
+    Args:
+        cursor: Cursor on the request's connection (committed by the caller)
+        user (dict): Row with id, username and role_name
+
+    Returns:
+        dict: Tokens as returned by generate_jwt_token
+    """
+    jti = uuid.uuid4().hex
+    tokens = generate_jwt_token(user['id'], user['username'], user['role_name'], jti=jti)
+    cursor.execute('''
+        INSERT INTO sessions (user_id, token_hash, refresh_token_hash, jti, ip_address, user_agent, expires_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+    ''', (
+        user['id'],
+        token_digest(tokens['access_token']),
+        token_digest(tokens['refresh_token']),
+        jti,
+        ip_address,
+        user_agent,
+        datetime.now() + current_app.config['JWT_REFRESH_TOKEN_EXPIRES']
+    ))
+    return tokens
+
+
+def rotate_session(cursor, refresh_token, user):
+    """
+    Exchange a refresh token for new tokens on the same session
+
+    The session is found by the refresh token's digest (unique index), so
+    a refresh token whose session was logged out or swept is refused, and
+    each refresh token can be used only once.
+
+    Returns:
+        dict: New tokens, or None if no live session holds ``refresh_token``
+    """
+    jti = uuid.uuid4().hex
+    tokens = generate_jwt_token(user['id'], user['username'], user['role_name'], jti=jti)
+    cursor.execute('''
+        UPDATE sessions
+        SET token_hash = %s, refresh_token_hash = %s, jti = %s, expires_at = %s
+        WHERE refresh_token_hash = %s AND user_id = %s AND expires_at > NOW()
+    ''', (
+        token_digest(tokens['access_token']),
+        token_digest(tokens['refresh_token']),
+        jti,
+        datetime.now() + current_app.config['JWT_REFRESH_TOKEN_EXPIRES'],
+        token_digest(refresh_token),
+        user['id']
+    ))
+    return tokens if cursor.rowcount else None
+
+
+def delete_session(cursor, user_id, access_token):
+    """Delete the session an access token belongs to; returns the number of rows deleted"""
+    cursor.execute(
+        'DELETE FROM sessions WHERE token_hash = %s AND user_id = %s',
+        (token_digest(access_token), user_id)
+    )
+    return cursor.rowcount
+
+
+def delete_user_sessions(cursor, user_id):
+    """Delete every session of a user (password change/reset)"""
+    cursor.execute('DELETE FROM sessions WHERE user_id = %s', (user_id,))
+    return cursor.rowcount
+
+
+class SessionSweeper:
+    """
+    Background thread deleting expired sessions in small batches
+
+    Each pass deletes ``batch_size`` expired rows per statement (using the
+    expires_at index) with a short pause in between, so the sweep never
+    holds long locks. Expired ``token_revocations`` rows are swept the same
+    way. A MySQL named lock makes sure only one process of
+    the deployment sweeps at a time.
+    """
+
+    LOCK_NAME = 'sistem_humas.session_sweeper'
+    TABLES = ('sessions', 'token_revocations')
+
+    def __init__(self):
+        self.interval = 300
+        self.batch_size = 500
+        self.pause = 0.05
+        self._thread = None
+        self._stop = threading.Event()
+        self._counters = {'passes': 0, 'deleted': 0, 'errors': 0}
+
+    def start(self, interval, batch_size):
+        """Start the sweeper thread (idempotent)"""
+        self.interval = interval
+        self.batch_size = batch_size
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='session-sweeper', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                self._counters['errors'] += 1
+                print(f"[SESSION SWEEPER ERROR] {str(e)}")
+
+    def sweep(self):
+        """Delete all sessions and revocations expired by now; returns the number deleted"""
+        pool = get_pool()
+        conn = pool.acquire()
+        cursor = conn.cursor(MySQLdb.cursors.DictCursor)
+        deleted = 0
+        try:
+            cursor.execute("SELECT GET_LOCK(%s, 0) as acquired", (self.LOCK_NAME,))
+            if not cursor.fetchone()['acquired']:
+                # Another process is sweeping
+                return 0
+            try:
+                for table in self.TABLES:
+                    while True:
+                        cursor.execute(
+                            f"DELETE FROM {table} WHERE expires_at < NOW() ORDER BY expires_at LIMIT %s",
+                            (self.batch_size,)
+                        )
+                        batch = cursor.rowcount
+                        conn.commit()
+                        deleted += batch
+                        if batch < self.batch_size or self._stop.is_set():
+                            break
+                        time.sleep(self.pause)
+            finally:
+                cursor.execute("SELECT RELEASE_LOCK(%s)", (self.LOCK_NAME,))
+                cursor.fetchone()
+        finally:
+            cursor.close()
+            pool.release(conn)
+
+        self._counters['passes'] += 1
+        self._counters['deleted'] += deleted
+        if deleted:
+            print(f"[SESSION SWEEPER] Deleted {deleted} expired rows")
+        return deleted
+
+    def stats(self):
+        return dict(self._counters, interval=self.interval, batch_size=self.batch_size)
+
+
+session_sweeper = SessionSweeper()
+
+
+def init_session_sweeper(app):
+    """Start the expired-session sweeper unless SESSION_SWEEP_INTERVAL is 0"""
+    if app.config['SESSION_SWEEP_INTERVAL'] > 0:
+        session_sweeper.start(app.config['SESSION_SWEEP_INTERVAL'], app.config['SESSION_SWEEP_BATCH_SIZE'])
@@ -0,0 +1,222 @@
+# File: backend/app/utils/smtp_pool.py
+
+import smtplib
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+
+# Errors after which a session is dropped and the send retried on a fresh one
+# (SMTPException subclasses OSError, so these must be caught before it)
+_CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)
+
+
+class _Session:
+    def __init__(self, smtp):
+        self.smtp = smtp
+        self.last_used = time.monotonic()
+        self.sent = 0
+
+
+class SMTPPool:
+    """
+    Pool of authenticated, keep-alive SMTP sessions
+
+    Opening a session costs a TCP connect, STARTTLS and AUTH; the pool keeps
+    up to ``max_size`` sessions open and reuses them. A session idle for
+    more than ``max_idle`` seconds is checked with NOOP before reuse (servers
+    drop idle clients), and one that has sent ``max_messages`` messages is
+    replaced (providers cap messages per connection). Sends that fail with
+    a connection error are retried once on a new session.
+    """
+
+    def __init__(self, host, port, username=None, password=None, use_tls=True,
+                 max_size=4, max_idle=60, max_messages=100, timeout=30):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.max_messages = max_messages
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._idle = deque()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._counters = {'connects': 0, 'reused': 0, 'reconnects': 0, 'sent': 0, 'failed': 0}
+
+    def _connect(self):
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+        except Exception:
+            self._close_quietly(smtp)
+            raise
+        with self._lock:
+            self._counters['connects'] += 1
+        return _Session(smtp)
+
+    @staticmethod
+    def _close_quietly(smtp):
+        try:
+            smtp.quit()
+        except Exception:
+            try:
+                smtp.close()
+            except Exception:
+                pass
+
+    def _acquire(self):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise smtplib.SMTPConnectError(421, 'SMTP pool exhausted')
+        try:
+            while True:
+                with self._lock:
+                    session = self._idle.pop() if self._idle else None
+                if session is None:
+                    return self._connect()
+                if time.monotonic() - session.last_used > self.max_idle:
+                    try:
+                        if session.smtp.noop()[0] != 250:
+                            raise smtplib.SMTPServerDisconnected('NOOP failed')
+                    except Exception:
+                        self._close_quietly(session.smtp)
+                        continue
+                with self._lock:
+                    self._counters['reused'] += 1
+                return session
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _release(self, session, discard=False):
+        try:
+            if discard or session.sent >= self.max_messages:
+                self._close_quietly(session.smtp)
+            else:
+                session.last_used = time.monotonic()
+                with self._lock:
+                    self._idle.append(session)
+        finally:
+            self._slots.release()
+
+    def _send_on(self, session, message):
+        if isinstance(message, tuple):
+            # Pre-serialized (from_addr, to_addrs, raw bytes)
+            session.smtp.sendmail(*message)
+        else:
+            session.smtp.send_message(message)
+        session.sent += 1
+
+    def send(self, message):
+        """Send one message, reconnecting once if the pooled session is dead"""
+        return self.send_batch([message], concurrency=1)[0]
+
+    def send_batch(self, messages, concurrency=1):
+        """
+        Send messages over at most ``concurrency`` sessions
+
+        Each session sends its share back to back, so the handshake is paid
+        once per session rather than once per message. A message is either
+        an ``email.message.Message`` or a ``(from_addr, to_addrs, raw)`` tuple.
+
+        Returns:
+            list: (success: bool, error: str or None) per message, in order
+        """
+        if not messages:
+            return []
+        concurrency = max(1, min(concurrency, self.max_size, len(messages)))
+        results = [None] * len(messages)
+        shares = [list(range(i, len(messages), concurrency)) for i in range(concurrency)]
+
+        def run(indexes):
+            session = None
+            try:
+                for index in indexes:
+                    results[index], session = self._send_with_retry(session, messages[index])
+            finally:
+                if session is not None:
+                    self._release(session)
+
+        if concurrency == 1:
+            run(shares[0])
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                list(executor.map(run, shares))
+        return results
+
+    def _send_with_retry(self, session, message):
+        """Returns ((success, error), session to keep using or None)"""
+        for attempt in range(2):
+            try:
+                if session is None:
+                    session = self._acquire()
+                elif session.sent >= self.max_messages:
+                    self._release(session)
+                    session = None
+                    session = self._acquire()
+                self._send_on(session, message)
+                with self._lock:
+                    self._counters['sent'] += 1
+                return (True, None), session
+            except _CONNECTION_ERRORS as e:
+                error = str(e)
+            except smtplib.SMTPException as e:
+                # Rejected by the server (e.g. bad recipient): the session is still fine
+                error = str(e)
+                break
+            except OSError as e:
+                # Socket-level failure (reset, timeout)
+                error = str(e)
+
+            if session is not None:
+                self._release(session, discard=True)
+                session = None
+            if attempt == 0:
+                with self._lock:
+                    self._counters['reconnects'] += 1
+        with self._lock:
+            self._counters['failed'] += 1
+        return (False, error), session
+
+    def close_all(self):
+        with self._lock:
+            sessions, self._idle = list(self._idle), deque()
+        for session in sessions:
+            self._close_quietly(session.smtp)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters, idle=len(self._idle), max_size=self.max_size)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_smtp_pool():
+    """Return the process-wide SMTP pool, created from ``current_app`` config"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                config = current_app.config
+                _pool = SMTPPool(
+                    config['MAIL_SERVER'],
+                    config['MAIL_PORT'],
+                    username=config['MAIL_USERNAME'],
+                    password=config['MAIL_PASSWORD'],
+                    use_tls=config['MAIL_USE_TLS'],
+                    max_size=config['SMTP_POOL_SIZE'],
+                    max_idle=config['SMTP_POOL_MAX_IDLE'],
+                    max_messages=config['SMTP_MAX_MESSAGES_PER_CONNECTION'],
+                    timeout=config['SMTP_TIMEOUT'],
+                )
+    return _pool
@@ -0,0 +1,310 @@
+# File: backend/app/utils/uploads.py
+
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+from flask import current_app
+
+# Leading bytes of the document types we accept
+MAGIC_NUMBERS = {
+    'application/pdf': (b'%PDF-',),
+    'application/msword': (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',),
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': (b'PK\x03\x04',),
+    'image/png': (b'\x89PNG\r\n\x1a\n',),
+    'image/jpeg': (b'\xff\xd8\xff',),
+}
+SNIFF_BYTES = 8
+
+
+class UploadError(Exception):
+    """Raised when an upload is rejected; ``status_code`` is the HTTP status to answer with"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+class SpooledFile:
+    """
+    A document spooled to disk, with size and SHA-256 computed while writing
+
+    Pass it to ``Cooperation.create_cooperation(document_file=...)`` and call
+    :meth:`cleanup` once it has been stored.
+    """
+
+    def __init__(self, path, size, sha256, mime, filename, owned=True):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+        self.mime = mime
+        self.filename = filename
+        self._owned = owned
+
+    def iter_chunks(self, chunk_size):
+        with open(self.path, 'rb') as handle:
+            while True:
+                chunk = handle.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def cleanup(self):
+        if self._owned and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _upload_dir():
+    directory = current_app.config['UPLOAD_TMP_DIR'] or os.path.join(
+        current_app.instance_path, 'uploads'
+    )
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def check_document_type(mime, head):
+    """
+    Check a declared MIME type against the allow-list and the file's leading bytes
+
+    Raises:
+        UploadError: 415 if the type is not allowed or the content does not match it
+    """
+    allowed = current_app.config['DOCUMENT_ALLOWED_MIME']
+    if mime not in allowed:
+        raise UploadError(f'Document type {mime or "unknown"} is not allowed', 415)
+    signatures = MAGIC_NUMBERS.get(mime)
+    if signatures and head is not None and not head.startswith(signatures):
+        raise UploadError(f'Document content does not match {mime}', 415)
+
+
+def check_document_size(size):
+    """Raise UploadError 413 if ``size`` exceeds DOCUMENT_MAX_SIZE"""
+    max_size = current_app.config['DOCUMENT_MAX_SIZE']
+    if size is not None and size > max_size:
+        raise UploadError(f'Document exceeds the maximum size of {max_size} bytes', 413)
+
+
+def spool_stream(stream, filename, mime):
+    """
+    Copy a file-like stream to a temporary file in UPLOAD_CHUNK_SIZE pieces
+
+    Size and SHA-256 are computed on the fly; the copy stops with 413 as
+    soon as DOCUMENT_MAX_SIZE is exceeded and with 415 if the first bytes do
+    not match ``mime``. Memory use is bounded by the chunk size.
+
+    Returns:
+        SpooledFile
+    """
+    chunk_size = current_app.config['UPLOAD_CHUNK_SIZE']
+    max_size = current_app.config['DOCUMENT_MAX_SIZE']
+    digest = hashlib.sha256()
+    size = 0
+    head = b''
+
+    fd, path = tempfile.mkstemp(dir=_upload_dir(), prefix='spool-')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                if len(head) < SNIFF_BYTES:
+                    head += chunk[:SNIFF_BYTES - len(head)]
+                    if len(head) >= SNIFF_BYTES:
+                        check_document_type(mime, head)
+                size += len(chunk)
+                if size > max_size:
+                    check_document_size(size)
+                digest.update(chunk)
+                out.write(chunk)
+        if size == 0:
+            raise UploadError('Document is empty', 400)
+        check_document_type(mime, head)
+    except Exception:
+        os.remove(path)
+        raise
+
+    return SpooledFile(path, size, digest.hexdigest(), mime, filename)
+
+
+class ResumableUpload:
+    """
+    A chunked upload that can be resumed after a dropped connection
+
+    State lives on disk under ``<UPLOAD_TMP_DIR>/<upload_id>/`` (``data`` plus
+    ``meta.json``), so any worker can accept the next chunk. Chunks must be
+    appended in order; the client asks for the current offset to resume.
+    """
+
+    def __init__(self, upload_id, meta):
+        self.upload_id = upload_id
+        self.meta = meta
+        self.directory = os.path.join(_upload_dir(), upload_id)
+
+    @property
+    def data_path(self):
+        return os.path.join(self.directory, 'data')
+
+    @property
+    def offset(self):
+        return os.path.getsize(self.data_path)
+
+    @property
+    def complete(self):
+        return self.offset == self.meta['size']
+
+    @classmethod
+    def create(cls, owner_id, filename, mime, size):
+        """
+        Start an upload after validating the declared size and type
+
+        Raises:
+            UploadError: 413/415 if the declared document is not acceptable
+        """
+        if not isinstance(size, int) or size <= 0:
+            raise UploadError('size must be a positive integer', 400)
+        check_document_size(size)
+        check_document_type(mime, None)
+        cleanup_expired_uploads()
+
+        upload_id = uuid.uuid4().hex
+        upload = cls(upload_id, {
+            'owner_id': owner_id,
+            'filename': filename,
+            'mime': mime,
+            'size': size,
+            'created_at': time.time(),
+        })
+        os.makedirs(upload.directory)
+        open(upload.data_path, 'wb').close()
+        with open(os.path.join(upload.directory, 'meta.json'), 'w') as handle:
+            json.dump(upload.meta, handle)
+        return upload
+
+    @classmethod
+    def load(cls, upload_id, owner_id):
+        """
+        Raises:
+            UploadError: 404 if the upload does not exist or belongs to someone else
+        """
+        try:
+            uuid.UUID(hex=upload_id)
+        except ValueError:
+            raise UploadError('Upload not found', 404)
+        upload = cls(upload_id, None)
+        try:
+            with open(os.path.join(upload.directory, 'meta.json')) as handle:
+                upload.meta = json.load(handle)
+        except (OSError, ValueError):
+            raise UploadError('Upload not found', 404)
+        if upload.meta['owner_id'] != owner_id:
+            raise UploadError('Upload not found', 404)
+        return upload
+
+    def append(self, stream, offset):
+        """
+        Append the chunk read from ``stream`` at ``offset``
+
+        Appends to one upload are serialized with an exclusive lock on the
+        data file, so a client retrying a chunk while the dropped request is
+        still writing it waits and then gets 409 instead of duplicating it.
+
+        Raises:
+            UploadError: 409 if ``offset`` is not the current end of the upload,
+                413 if the chunk would go past the declared size,
+                415 if the first bytes do not match the declared type
+        """
+        chunk_size = current_app.config['UPLOAD_CHUNK_SIZE']
+        with open(self.data_path, 'ab+') as out:
+            fcntl.flock(out, fcntl.LOCK_EX)
+            try:
+                current = os.fstat(out.fileno()).st_size
+                if offset != current:
+                    raise UploadError(f'Expected offset {current}', 409)
+
+                remaining = self.meta['size'] - offset
+                # Sniff across reads and chunks until the signature is complete
+                head = None
+                if offset < SNIFF_BYTES:
+                    out.seek(0)
+                    head = out.read(offset)
+                try:
+                    while True:
+                        chunk = stream.read(chunk_size)
+                        if not chunk:
+                            break
+                        if len(chunk) > remaining:
+                            raise UploadError('Chunk exceeds the declared document size', 413)
+                        remaining -= len(chunk)
+                        if head is not None:
+                            head += chunk[:SNIFF_BYTES - len(head)]
+                            if len(head) >= SNIFF_BYTES or remaining == 0:
+                                check_document_type(self.meta['mime'], head)
+                                head = None
+                        out.write(chunk)
+                except UploadError:
+                    out.truncate(offset)
+                    raise
+                out.flush()
+                return os.fstat(out.fileno()).st_size
+            finally:
+                fcntl.flock(out, fcntl.LOCK_UN)
+
+    def finish(self):
+        """
+        Hash the completed upload and hand it over as a SpooledFile
+
+        Raises:
+            UploadError: 409 if not all bytes have been received
+        """
+        if not self.complete:
+            raise UploadError(f'Upload incomplete: {self.offset} of {self.meta["size"]} bytes', 409)
+        digest = hashlib.sha256()
+        chunk_size = current_app.config['UPLOAD_CHUNK_SIZE']
+        with open(self.data_path, 'rb') as handle:
+            for chunk in iter(lambda: handle.read(chunk_size), b''):
+                digest.update(chunk)
+        return _ResumableFile(self, digest.hexdigest())
+
+    def discard(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class _ResumableFile(SpooledFile):
+    """SpooledFile whose cleanup removes the whole upload directory"""
+
+    def __init__(self, upload, sha256):
+        super().__init__(upload.data_path, upload.meta['size'], sha256,
+                         upload.meta['mime'], upload.meta['filename'])
+        self._upload = upload
+
+    def cleanup(self):
+        self._upload.discard()
+
+
+def cleanup_expired_uploads():
+    """Remove resumable uploads older than UPLOAD_SESSION_TTL seconds"""
+    directory = _upload_dir()
+    cutoff = time.time() - current_app.config['UPLOAD_SESSION_TTL']
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        # A resumable upload's last activity is the mtime of its data file
+        data_path = os.path.join(path, 'data')
+        try:
+            if os.path.exists(data_path):
+                modified = max(os.path.getmtime(path), os.path.getmtime(data_path))
+            else:
+                modified = os.path.getmtime(path)
+            if modified < cutoff:
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    os.remove(path)
+        except OSError:
+            pass
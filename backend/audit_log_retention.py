@@ -0,0 +1,46 @@
+# File: backend/audit_log_retention.py
+#
+# Monthly partition maintenance for audit_logs (see migration 010).
+#
+#     python audit_log_retention.py [--retention-months 12] [--ahead 3] [--dry-run]
+#
+# Creates the pYYYYMM partitions for the next --ahead months and drops every
+# partition that ended more than --retention-months months ago. Dropping a
+# partition removes its rows instantly, with no DELETE, undo log or
+# fragmentation. Run it daily or monthly from cron; it is idempotent.
+
+import argparse
+
+from app import create_script_app
+from app.models.audit_log import AuditLog
+
+
+def run(retention_months, months_ahead, dry_run):
+    app = create_script_app()
+    with app.app_context():
+        config = app.config
+        result = AuditLog().maintain_partitions(
+            retention_months if retention_months is not None else config['AUDIT_LOG_RETENTION_MONTHS'],
+            months_ahead if months_ahead is not None else config['AUDIT_LOG_PARTITIONS_AHEAD'],
+            dry_run=dry_run,
+        )
+        if not result['success']:
+            print(f"[RETENTION] {result['message']}")
+            return 1
+
+        prefix = 'Would' if dry_run else 'Did'
+        print(f"[RETENTION] {prefix} add partitions: {', '.join(result['added']) or 'none'}")
+        print(f"[RETENTION] {prefix} drop partitions before {result['cutoff']:%Y-%m-%d}: "
+              f"{', '.join(result['dropped']) or 'none'}")
+        return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Add and drop monthly audit_logs partitions')
+    parser.add_argument('--retention-months', type=int, default=None,
+                        help='Months of audit logs to keep (default: AUDIT_LOG_RETENTION_MONTHS)')
+    parser.add_argument('--ahead', type=int, default=None,
+                        help='Months of partitions to create in advance (default: AUDIT_LOG_PARTITIONS_AHEAD)')
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+    raise SystemExit(run(args.retention_months, args.ahead, args.dry_run))
@@ -0,0 +1,94 @@
+# File: backend/bench_json.py
+#
+# Micro-benchmark: cost to serialize one 100-row content list response.
+#
+#     python bench_json.py [--iterations 2000] [--rows 100] [--body-bytes 4000]
+#
+# Rows have the shape Content.get_contents returns (contents.* plus the
+# joined category/author names, datetimes as MySQLdb returns them). Each
+# provider builds the complete response body the way success_response does
+# through jsonify. "stdlib" is Flask's default encoder (plus bytes
+# support); "orjson" is what the app installs when orjson is available.
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from flask import Flask
+
+from app.config import Config
+from app.utils.json_provider import OrjsonProvider, StdlibJSONProvider, orjson
+
+
+def content_page(rows, body_bytes):
+    now = datetime(2026, 10, 17, 9, 30, 15)
+    body = ('<p>Politeknik Siber dan Sandi Negara menyelenggarakan kegiatan humas. </p>' * body_bytes)[:body_bytes]
+    contents = []
+    for i in range(rows):
+        created_at = now - timedelta(hours=i)
+        contents.append({
+            'id': 1000 - i,
+            'title': f'Kerja Sama Poltek SSN dengan Mitra Industri #{i}',
+            'slug': f'kerja-sama-poltek-ssn-mitra-industri-{i}',
+            'excerpt': 'Ringkasan kegiatan kerja sama dan penandatanganan nota kesepahaman.',
+            'body': body,
+            'featured_image': f'/uploads/contents/{1000 - i}.jpg',
+            'category_id': i % 7 + 1,
+            'author_id': i % 5 + 1,
+            'status': 'published',
+            'views': i * 37,
+            'published_at': created_at,
+            'created_at': created_at,
+            'updated_at': created_at + timedelta(minutes=5),
+            'category_name': 'Berita',
+            'author_name': 'Budi Santoso',
+            'score': Decimal('0.8125'),
+        })
+    return {
+        'status': 'success',
+        'message': 'Contents retrieved successfully',
+        'data': {
+            'contents': contents,
+            'pagination': {'page': 1, 'per_page': rows, 'total': 5000, 'has_next': True},
+        },
+    }
+
+
+def measure(label, app, provider, payload, iterations):
+    with app.app_context():
+        size = len(provider.response(payload).get_data())
+        start = time.perf_counter()
+        for _ in range(iterations):
+            provider.response(payload).get_data()
+        elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed / iterations * 1e3:8.3f} ms/response  ({size} bytes)")
+    return elapsed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark JSON response serialization')
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--rows', type=int, default=100)
+    parser.add_argument('--body-bytes', type=int, default=4000)
+    args = parser.parse_args()
+
+    payload = content_page(args.rows, args.body_bytes)
+    app = Flask(__name__)
+    app.config.from_object(Config)
+
+    results = {}
+    for datetime_format in ('http', 'iso'):
+        app.config['JSON_DATETIME_FORMAT'] = datetime_format
+        results[f'stdlib ({datetime_format})'] = measure(
+            f'stdlib ({datetime_format})', app, StdlibJSONProvider(app), payload, args.iterations)
+        if orjson is not None:
+            results[f'orjson ({datetime_format})'] = measure(
+                f'orjson ({datetime_format})', app, OrjsonProvider(app), payload, args.iterations)
+
+    if orjson is None:
+        print("orjson is not installed; only the stdlib provider was measured")
+    else:
+        for datetime_format in ('http', 'iso'):
+            speedup = results[f'stdlib ({datetime_format})'] / results[f'orjson ({datetime_format})']
+            print(f"Speed-up ({datetime_format} datetimes): {speedup:.1f}x")
@@ -0,0 +1,109 @@
+# File: backend/migrate_documents.py
+#
+# Move cooperation documents from cooperations.document_data (LONGBLOB) into
+# the configured blob store, one batch at a time.
+#
+#     python migrate_documents.py [--batch-size 20] [--dry-run]
+#
+# Each blob is copied to a temporary file in DOCUMENT_DB_CHUNK_SIZE slices
+# (hashing on the way), stored under its SHA-256, and the row is updated to
+# reference it with document_data set to NULL. Safe to re-run: rows that
+# already have a document_ref are skipped.
+
+import argparse
+import hashlib
+import os
+import tempfile
+
+import MySQLdb
+
+from app import create_script_app
+from app.utils.blob_store import get_blob_store
+from app.utils.database import get_pool
+
+
+def copy_blob_to_file(cursor, cooperation_id, path, chunk_size):
+    """Copy one document_data blob to ``path``; returns (size, sha256)"""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'wb') as out:
+        while True:
+            cursor.execute(
+                "SELECT SUBSTRING(document_data, %s, %s) as chunk FROM cooperations WHERE id = %s",
+                (size + 1, chunk_size, cooperation_id),
+            )
+            row = cursor.fetchone()
+            chunk = row['chunk'] if row else None
+            if not chunk:
+                break
+            digest.update(chunk)
+            out.write(chunk)
+            size += len(chunk)
+    return size, digest.hexdigest()
+
+
+def migrate(batch_size, dry_run):
+    app = create_script_app()
+    with app.app_context():
+        store = get_blob_store()
+        chunk_size = app.config['DOCUMENT_DB_CHUNK_SIZE']
+        pool = get_pool()
+        conn = pool.acquire()
+        cursor = conn.cursor(MySQLdb.cursors.DictCursor)
+        moved = 0
+        last_id = 0
+        try:
+            while True:
+                cursor.execute(
+                    """
+                    SELECT id FROM cooperations
+                    WHERE id > %s AND document_ref IS NULL AND document_data IS NOT NULL
+                    ORDER BY id
+                    LIMIT %s
+                    """,
+                    (last_id, batch_size),
+                )
+                ids = [row['id'] for row in cursor.fetchall()]
+                conn.commit()
+                if not ids:
+                    break
+
+                for cooperation_id in ids:
+                    fd, path = tempfile.mkstemp(prefix='migrate-')
+                    os.close(fd)
+                    try:
+                        size, sha256 = copy_blob_to_file(cursor, cooperation_id, path, chunk_size)
+                        if dry_run:
+                            print(f"[MIGRATE] Would move cooperation {cooperation_id}: {size} bytes, {sha256}")
+                            continue
+                        ref = store.put_file(path, sha256)
+                        cursor.execute(
+                            """
+                            UPDATE cooperations
+                            SET document_ref = %s, document_sha256 = %s, document_size = %s,
+                                document_data = NULL
+                            WHERE id = %s AND document_ref IS NULL
+                            """,
+                            (ref, sha256, size, cooperation_id),
+                        )
+                        moved += cursor.rowcount
+                        print(f"[MIGRATE] Moved cooperation {cooperation_id}: {size} bytes")
+                    finally:
+                        os.remove(path)
+
+                if not dry_run:
+                    conn.commit()
+                last_id = ids[-1]
+        finally:
+            cursor.close()
+            pool.release(conn)
+
+        print(f"[MIGRATE] Done, {moved} documents moved to the blob store")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Move cooperation documents to the blob store')
+    parser.add_argument('--batch-size', type=int, default=20)
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+    migrate(args.batch_size, args.dry_run)
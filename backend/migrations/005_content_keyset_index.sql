@@ -0,0 +1,19 @@
+-- =====================================================
+-- Keyset Pagination Indexes for Contents
+-- Migration: 005_content_keyset_index.sql
+-- =====================================================
+
+USE sistem_humas_poltek;
+
+-- Content lists are ordered by (created_at DESC, id DESC) and paged with a
+-- "(created_at, id) < cursor" predicate. These composite indexes let MySQL
+-- seek straight to the cursor position, with or without the common filters.
+ALTER TABLE contents
+    ADD INDEX idx_created_id (created_at, id),
+    ADD INDEX idx_status_created_id (status, created_at, id),
+    ADD INDEX idx_author_created_id (author_id, created_at, id),
+    ADD INDEX idx_category_created_id (category_id, created_at, id);
+
+-- =====================================================
+-- Done! Keyset Pagination Indexes Created
+-- =====================================================
@@ -0,0 +1,22 @@
+-- =====================================================
+-- Cooperation Document Metadata
+-- Migration: 006_cooperation_document_meta.sql
+-- =====================================================
+
+USE sistem_humas_poltek;
+
+-- Size and SHA-256 of document_data, stored at upload time so downloads can
+-- send Content-Length/ETag and answer Range requests without reading the blob.
+ALTER TABLE cooperations
+    ADD COLUMN document_size BIGINT UNSIGNED NULL AFTER document_mime,
+    ADD COLUMN document_sha256 CHAR(64) NULL AFTER document_size;
+
+-- Backfill existing rows
+UPDATE cooperations
+SET document_size = LENGTH(document_data),
+    document_sha256 = SHA2(document_data, 256)
+WHERE document_data IS NOT NULL AND document_sha256 IS NULL;
+
+-- =====================================================
+-- Done! Cooperation Document Metadata Added
+-- =====================================================
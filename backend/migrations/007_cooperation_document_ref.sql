@@ -0,0 +1,23 @@
+-- =====================================================
+-- Cooperation Documents in Blob Store
+-- Migration: 007_cooperation_document_ref.sql
+-- =====================================================
+
+USE sistem_humas_poltek;
+
+-- New documents are kept in the blob store (app/utils/blob_store.py) and
+-- referenced by their SHA-256; document_data is only read for rows that
+-- have not been moved yet.
+ALTER TABLE cooperations
+    ADD COLUMN document_ref CHAR(64) NULL AFTER document_sha256,
+    ADD INDEX idx_document_ref (document_ref);
+
+-- Move existing documents out in batches with:
+--     python migrate_documents.py
+-- The script sets document_data to NULL for every row it moves; reclaim the
+-- space afterwards with:
+--     OPTIMIZE TABLE cooperations;
+
+-- =====================================================
+-- Done! Cooperation Document Reference Added
+-- =====================================================
@@ -0,0 +1,29 @@
+-- =====================================================
+-- Email Outbox
+-- Migration: 008_email_outbox.sql
+-- =====================================================
+
+USE sistem_humas_poltek;
+
+-- Emails are queued here by EmailService.send_email and delivered by the
+-- background workers in app/utils/email_outbox.py.
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    to_email VARCHAR(255) NOT NULL,
+    subject VARCHAR(255) NOT NULL,
+    body_html MEDIUMTEXT NOT NULL,
+    body_text MEDIUMTEXT,
+    status ENUM('pending', 'sending', 'sent', 'failed') NOT NULL DEFAULT 'pending',
+    attempts INT NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_until TIMESTAMP NULL,
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    sent_at TIMESTAMP NULL,
+    INDEX idx_status_next_attempt (status, next_attempt_at),
+    INDEX idx_status_locked_until (status, locked_until)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- =====================================================
+-- Done! Email Outbox Created
+-- =====================================================
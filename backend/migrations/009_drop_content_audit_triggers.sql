@@ -0,0 +1,23 @@
+-- =====================================================
+-- Drop Content Audit Triggers
+-- Migration: 009_drop_content_audit_triggers.sql
+-- =====================================================
+
+USE sistem_humas_poltek;
+
+-- Content changes are now audited by the application (app/utils/audit.py,
+-- called from the Content model after commit) through the batched audit
+-- writer, so the per-row trigger inserts are no longer needed. UPDATE and
+-- DELETE entries still carry the old title and status as old_values.
+--
+-- Only changes made through those model methods are audited now. Rows
+-- changed any other way are not: contents deleted by ON DELETE CASCADE
+-- when their category or author is deleted, manual SQL, and scripts that
+-- bypass the Content model.
+DROP TRIGGER IF EXISTS after_content_insert;
+DROP TRIGGER IF EXISTS after_content_update;
+DROP TRIGGER IF EXISTS after_content_delete;
+
+-- =====================================================
+-- Done! Content Audit Triggers Dropped
+-- =====================================================
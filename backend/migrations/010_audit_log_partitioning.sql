@@ -0,0 +1,80 @@
+-- =====================================================
+-- Audit Log Partitioning
+-- Migration: 010_audit_log_partitioning.sql
+-- =====================================================
+
+USE sistem_humas_poltek;
+
+-- audit_logs gets one row per login and per content change. It is split
+-- into monthly RANGE partitions on `timestamp`, so a time-bounded query
+-- only reads the months it covers, and old months are removed with
+-- DROP PARTITION (audit_log_retention.py) instead of DELETEs.
+--
+-- MySQL requirements for partitioning:
+--   * partitioned InnoDB tables cannot have foreign keys, so the
+--     user_id -> users FK is dropped; its ON DELETE SET NULL is now done
+--     by delete_user (app/routes/user_routes.py) in the same transaction
+--     as the DELETE;
+--   * every unique key must contain the partitioning column, so the
+--     primary key becomes (id, timestamp) and timestamp becomes NOT NULL.
+--
+-- Rewrites the table; run it in a maintenance window on large tables.
+
+-- The FK was created unnamed, so look its name up instead of assuming it.
+SET @audit_fk = (
+    SELECT CONSTRAINT_NAME
+    FROM information_schema.KEY_COLUMN_USAGE
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = 'audit_logs'
+      AND COLUMN_NAME = 'user_id'
+      AND REFERENCED_TABLE_NAME = 'users'
+    LIMIT 1
+);
+SET @drop_fk = IF(@audit_fk IS NULL, 'DO 0',
+                  CONCAT('ALTER TABLE audit_logs DROP FOREIGN KEY `', @audit_fk, '`'));
+PREPARE drop_fk_stmt FROM @drop_fk;
+EXECUTE drop_fk_stmt;
+DEALLOCATE PREPARE drop_fk_stmt;
+
+UPDATE audit_logs SET timestamp = CURRENT_TIMESTAMP WHERE timestamp IS NULL;
+
+-- Composite indexes match the GET /api/audit-logs filters and its
+-- (timestamp DESC, id DESC) keyset order.
+ALTER TABLE audit_logs
+    MODIFY timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (id, timestamp),
+    DROP INDEX idx_user_id,
+    DROP INDEX idx_timestamp,
+    DROP INDEX idx_action,
+    ADD INDEX idx_timestamp_id (timestamp, id),
+    ADD INDEX idx_user_timestamp_id (user_id, timestamp, id),
+    ADD INDEX idx_module_timestamp_id (module, timestamp, id),
+    ADD INDEX idx_action_timestamp_id (action, timestamp, id);
+
+-- Later months are split out of pmax by audit_log_retention.py.
+ALTER TABLE audit_logs
+PARTITION BY RANGE (UNIX_TIMESTAMP(timestamp)) (
+    PARTITION p_old VALUES LESS THAN (UNIX_TIMESTAMP('2025-10-01 00:00:00')),
+    PARTITION p202510 VALUES LESS THAN (UNIX_TIMESTAMP('2025-11-01 00:00:00')),
+    PARTITION p202511 VALUES LESS THAN (UNIX_TIMESTAMP('2025-12-01 00:00:00')),
+    PARTITION p202512 VALUES LESS THAN (UNIX_TIMESTAMP('2026-01-01 00:00:00')),
+    PARTITION p202601 VALUES LESS THAN (UNIX_TIMESTAMP('2026-02-01 00:00:00')),
+    PARTITION p202602 VALUES LESS THAN (UNIX_TIMESTAMP('2026-03-01 00:00:00')),
+    PARTITION p202603 VALUES LESS THAN (UNIX_TIMESTAMP('2026-04-01 00:00:00')),
+    PARTITION p202604 VALUES LESS THAN (UNIX_TIMESTAMP('2026-05-01 00:00:00')),
+    PARTITION p202605 VALUES LESS THAN (UNIX_TIMESTAMP('2026-06-01 00:00:00')),
+    PARTITION p202606 VALUES LESS THAN (UNIX_TIMESTAMP('2026-07-01 00:00:00')),
+    PARTITION p202607 VALUES LESS THAN (UNIX_TIMESTAMP('2026-08-01 00:00:00')),
+    PARTITION p202608 VALUES LESS THAN (UNIX_TIMESTAMP('2026-09-01 00:00:00')),
+    PARTITION p202609 VALUES LESS THAN (UNIX_TIMESTAMP('2026-10-01 00:00:00')),
+    PARTITION p202610 VALUES LESS THAN (UNIX_TIMESTAMP('2026-11-01 00:00:00')),
+    PARTITION p202611 VALUES LESS THAN (UNIX_TIMESTAMP('2026-12-01 00:00:00')),
+    PARTITION p202612 VALUES LESS THAN (UNIX_TIMESTAMP('2027-01-01 00:00:00')),
+    PARTITION p202701 VALUES LESS THAN (UNIX_TIMESTAMP('2027-02-01 00:00:00')),
+    PARTITION pmax VALUES LESS THAN MAXVALUE
+);
+
+-- =====================================================
+-- Done! Audit Logs Partitioned by Month
+-- =====================================================
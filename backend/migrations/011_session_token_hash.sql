@@ -0,0 +1,40 @@
+-- =====================================================
+-- Hashed, Indexed Session Tokens
+-- Migration: 011_session_token_hash.sql
+-- =====================================================
+
+USE sistem_humas_poltek;
+
+-- Sessions were stored with the raw JWTs in unindexed TEXT columns, so
+-- logout scanned every session of the user comparing whole tokens, and a
+-- database leak exposed usable tokens. They are now stored as fixed-width
+-- SHA-256 digests with unique indexes (app/utils/sessions.py), plus the
+-- access token's jti claim. expires_at is the session lifetime (refresh
+-- token expiry); expired rows are deleted by the session sweeper.
+ALTER TABLE sessions
+    ADD COLUMN token_hash BINARY(32) NULL AFTER user_id,
+    ADD COLUMN refresh_token_hash BINARY(32) NULL AFTER token_hash,
+    ADD COLUMN jti CHAR(32) NULL AFTER refresh_token_hash;
+
+UPDATE sessions
+SET token_hash = UNHEX(SHA2(token, 256)),
+    refresh_token_hash = IF(refresh_token IS NULL, NULL, UNHEX(SHA2(refresh_token, 256)));
+
+-- Tokens issued in the same second for the same user were identical
+-- before the jti claim; keep the newest row of each duplicate.
+DELETE older FROM sessions older
+JOIN sessions newer ON newer.token_hash = older.token_hash AND newer.id > older.id;
+
+-- Rows created before this migration only covered the access token
+-- lifetime; the sweeper removes them once expired.
+ALTER TABLE sessions
+    MODIFY token_hash BINARY(32) NOT NULL,
+    DROP COLUMN token,
+    DROP COLUMN refresh_token,
+    ADD UNIQUE INDEX uq_token_hash (token_hash),
+    ADD UNIQUE INDEX uq_refresh_token_hash (refresh_token_hash),
+    ADD INDEX idx_jti (jti);
+
+-- =====================================================
+-- Done! Session Tokens Hashed and Indexed
+-- =====================================================
@@ -0,0 +1,30 @@
+-- =====================================================
+-- Access Token Revocation Log
+-- Migration: 012_token_revocations.sql
+-- =====================================================
+
+USE sistem_humas_poltek;
+
+-- Access tokens are checked against an in-memory revocation list
+-- (app/utils/revocation.py) instead of the database. This table is the
+-- shared log every process polls by id to keep its list in sync:
+--   jti set        -> that single token is revoked (logout)
+--   not_before set -> every token of user_id issued before it is revoked
+--                     (password change/reset)
+-- Pollers also re-read recently created rows (idx_created_at), since ids
+-- can commit out of order. Rows are only needed until the tokens they
+-- cover expire; the session sweeper deletes them after expires_at.
+CREATE TABLE IF NOT EXISTS token_revocations (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    jti CHAR(32) NULL,
+    user_id INT NULL,
+    not_before TIMESTAMP NULL,
+    expires_at TIMESTAMP NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_expires_at (expires_at),
+    INDEX idx_created_at (created_at)
+);
+
+-- =====================================================
+-- Done! Token Revocation Log Created
+-- =====================================================
@@ -0,0 +1,108 @@
+# File: backend/tune_argon2.py
+#
+# Pick Argon2id parameters for this host from a target verify latency.
+#
+#     python tune_argon2.py [--target-ms 250] [--concurrency 2] [--samples 5]
+#
+# For each memory cost (ascending) the time cost is raised until a verify
+# takes longer than --target-ms at the median. --concurrency verifications
+# run at once, like the PASSWORD_HASH_WORKERS hasher processes do during a
+# login burst, so memory bandwidth contention is included. The strongest
+# profile (memory_cost x time_cost) that stays under the target is printed
+# as ARGON2_* settings. Existing hashes are upgraded on the next login of
+# each user once the new settings are deployed.
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from argon2 import PasswordHasher
+
+from app.config import Config
+
+DEFAULT_MEMORY_COSTS = [19456, 32768, 47104, 65536, 131072, 262144]
+PASSWORD = 'Tuning-Password-123!'
+
+
+def measure_verify(params, samples):
+    """Milliseconds per verify for ``samples`` verifications with ``params``"""
+    hasher = PasswordHasher(**params)
+    password_hash = hasher.hash(PASSWORD)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.verify(password_hash, PASSWORD)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def run_profile(executor, params, samples, concurrency):
+    if executor is None:
+        timings = measure_verify(params, samples)
+    else:
+        timings = []
+        for result in executor.map(measure_verify, [params] * concurrency, [samples] * concurrency):
+            timings.extend(result)
+    timings.sort()
+    return statistics.median(timings), timings[min(int(len(timings) * 0.95), len(timings) - 1)]
+
+
+def tune(target_ms, memory_costs, parallelism, max_time_cost, samples, concurrency):
+    executor = ProcessPoolExecutor(max_workers=concurrency) if concurrency > 1 else None
+    best = None
+    print(f"Target: median verify <= {target_ms} ms with {concurrency} concurrent verification(s)")
+    print(f"{'memory_cost':>12} {'time_cost':>10} {'median_ms':>10} {'p95_ms':>8}")
+    try:
+        for memory_cost in memory_costs:
+            fits = False
+            for time_cost in range(1, max_time_cost + 1):
+                params = {
+                    'time_cost': time_cost,
+                    'memory_cost': memory_cost,
+                    'parallelism': parallelism,
+                    'hash_len': Config.ARGON2_HASH_LEN,
+                    'salt_len': Config.ARGON2_SALT_LEN,
+                }
+                median, p95 = run_profile(executor, params, samples, concurrency)
+                print(f"{memory_cost:>12} {time_cost:>10} {median:>10.1f} {p95:>8.1f}")
+                if median > target_ms:
+                    break
+                fits = True
+                if best is None or memory_cost * time_cost > best[0]['memory_cost'] * best[0]['time_cost']:
+                    best = (params, median)
+            if not fits:
+                # Even time_cost=1 is too slow; larger memory costs will be too
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return best
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark Argon2id parameters on this host')
+    parser.add_argument('--target-ms', type=float, default=250)
+    parser.add_argument('--memory', type=int, nargs='+', default=DEFAULT_MEMORY_COSTS,
+                        help='Memory costs to try, in KB')
+    parser.add_argument('--parallelism', type=int, default=Config.ARGON2_PARALLELISM)
+    parser.add_argument('--max-time-cost', type=int, default=10)
+    parser.add_argument('--samples', type=int, default=5)
+    parser.add_argument('--concurrency', type=int, default=max(Config.PASSWORD_HASH_WORKERS, 1))
+    args = parser.parse_args()
+
+    result = tune(args.target_ms, sorted(args.memory), args.parallelism, args.max_time_cost,
+                  args.samples, args.concurrency)
+    if result is None:
+        print("No profile meets the target; raise --target-ms or lower --memory/--parallelism")
+        raise SystemExit(1)
+
+    params, median = result
+    print(f"\nRecommended profile ({median:.1f} ms median verify):")
+    print(f"ARGON2_TIME_COST={params['time_cost']}")
+    print(f"ARGON2_MEMORY_COST={params['memory_cost']}")
+    print(f"ARGON2_PARALLELISM={params['parallelism']}")
+    current = (Config.ARGON2_TIME_COST, Config.ARGON2_MEMORY_COST, Config.ARGON2_PARALLELISM)
+    if current != (params['time_cost'], params['memory_cost'], params['parallelism']):
+        print(f"(currently {current[0]}/{current[1]}/{current[2]}; "
+              f"stored hashes are upgraded on each user's next login)")